@@ -5,6 +5,7 @@ Higher variance indicates more uneven distribution of the signal.
 """
 
 import numpy as np
+from scipy import ndimage
 
 PLUGIN_NAME = "intensity_variance"
 PLUGIN_TYPE = "feature"
@@ -32,3 +33,20 @@ def extract_intensity_variance(ctx) -> np.float32:
     variance = float(np.var(pixel_values))
 
     return np.float32(variance)
+
+
+def extract_intensity_variance_batch(ctx) -> np.ndarray:
+    """Extract intensity variance for all cells of a frame at once.
+
+    Args:
+        ctx: BatchExtractionContext with image, labeled and labels attributes
+             image: 2D fluorescence intensity array
+             labeled: 2D label image of the frame
+             labels: Cell IDs to evaluate
+
+    Returns:
+        Variance of pixel intensities per cell, one value per label
+    """
+    image = ctx.image.astype(np.float32, copy=False)
+    variances = ndimage.variance(image, labels=ctx.labeled, index=ctx.labels)
+    return np.asarray(variances, dtype=np.float32)
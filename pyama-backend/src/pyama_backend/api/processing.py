@@ -4,18 +4,20 @@ import logging
 import os
 import threading
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Query
 from pydantic import BaseModel, Field
 
 from pyama_core.io import MicroscopyMetadata, load_microscopy_file
+from pyama_core.io.processing_csv import TRACE_FORMATS
 from pyama_core.processing.merge import run_merge
 from pyama_core.processing.extraction.features import (
     list_phase_features,
     list_fluorescence_features,
 )
 from pyama_core.processing.workflow import run_complete_workflow
+from pyama_core.processing.workflow.planner import plan_workflow
 from pyama_core.types.processing import (
     ChannelSelection,
     Channels,
@@ -120,8 +122,15 @@ class WorkflowParametersRequest(BaseModel):
 
     fov_start: int = Field(0, description="Starting FOV index")
     fov_end: int = Field(..., description="Ending FOV index")
-    batch_size: int = Field(2, description="Batch size for processing")
-    n_workers: int = Field(2, description="Number of worker threads")
+    batch_size: int | Literal["auto"] = Field(
+        2, description="FOVs in flight, or 'auto' to plan from available memory"
+    )
+    n_workers: int | Literal["auto"] = Field(
+        2, description="Number of workers, or 'auto' to plan from memory and CPUs"
+    )
+    worker_mode: str = Field(
+        "thread", description="Worker pool type: 'thread' or 'process'"
+    )
 
 
 class StartWorkflowRequest(BaseModel):
@@ -135,6 +144,25 @@ class StartWorkflowRequest(BaseModel):
     )
 
 
+class PlanWorkflowRequest(BaseModel):
+    """Request model for planning a workflow."""
+
+    microscopy_path: str = Field(..., description="Path to microscopy file")
+    output_dir: str = Field(..., description="Output directory for results")
+    channels: WorkflowChannelsRequest = Field(..., description="Channel configuration")
+    parameters: WorkflowParametersRequest = Field(
+        ..., description="Workflow parameters"
+    )
+
+
+class PlanWorkflowResponse(BaseModel):
+    """Response model for planning a workflow."""
+
+    success: bool
+    plan: Optional[dict] = None
+    error: Optional[str] = None
+
+
 class StartWorkflowResponse(BaseModel):
     """Response model for starting a workflow."""
 
@@ -367,6 +395,67 @@ async def get_features() -> FeaturesResponse:
 # =============================================================================
 
 
+def _channels_from_request(channels: WorkflowChannelsRequest) -> Channels:
+    """Convert the channel configuration of a request into ``Channels``."""
+    return Channels(
+        pc=(
+            ChannelSelection(
+                channel=channels.phase.channel,
+                features=channels.phase.features,
+            )
+            if channels.phase
+            else None
+        ),
+        fl=[
+            ChannelSelection(
+                channel=fl_channel.channel,
+                features=fl_channel.features,
+            )
+            for fl_channel in channels.fluorescence
+        ],
+    )
+
+
+@router.post("/workflow/plan", response_model=PlanWorkflowResponse)
+async def plan_workflow_endpoint(request: PlanWorkflowRequest) -> PlanWorkflowResponse:
+    """Estimate disk use, memory and runtime of a workflow without running it.
+
+    Args:
+        request: Workflow configuration, as for starting a workflow
+
+    Returns:
+        Response with the plan or error message
+    """
+    try:
+        microscopy_path = Path(request.microscopy_path)
+        if not microscopy_path.exists():
+            logger.error("Microscopy file not found: %s", microscopy_path)
+            return PlanWorkflowResponse(
+                success=False,
+                error=f"File not found: {microscopy_path}",
+            )
+
+        _, metadata = load_microscopy_file(microscopy_path)
+        workflow_plan = plan_workflow(
+            metadata,
+            _channels_from_request(request.channels),
+            fov_start=request.parameters.fov_start,
+            fov_end=request.parameters.fov_end,
+            n_workers=request.parameters.n_workers,
+            batch_size=request.parameters.batch_size,
+            worker_mode=request.parameters.worker_mode,
+            output_dir=Path(request.output_dir),
+        )
+        return PlanWorkflowResponse(success=True, plan=workflow_plan.to_dict())
+
+    except Exception as e:
+        logger.exception("Failed to plan workflow")
+        return PlanWorkflowResponse(
+            success=False,
+            error=f"Failed to plan workflow: {str(e)}",
+        )
+
+
 @router.post("/workflow/start", response_model=StartWorkflowResponse)
 async def start_workflow(request: StartWorkflowRequest) -> StartWorkflowResponse:
     """Start a processing workflow.
@@ -408,25 +497,7 @@ async def start_workflow(request: StartWorkflowRequest) -> StartWorkflowResponse
 
                 _, metadata = load_microscopy_file(microscopy_path)
 
-                pc_selection = (
-                    ChannelSelection(
-                        channel=request.channels.phase.channel,
-                        features=request.channels.phase.features,
-                    )
-                    if request.channels.phase
-                    else None
-                )
-
-                channels = Channels(
-                    pc=pc_selection,
-                    fl=[
-                        ChannelSelection(
-                            channel=fl_channel.channel,
-                            features=fl_channel.features,
-                        )
-                        for fl_channel in request.channels.fluorescence
-                    ],
-                )
+                channels = _channels_from_request(request.channels)
 
                 context = ensure_context(
                     ProcessingContext(
@@ -437,6 +508,7 @@ async def start_workflow(request: StartWorkflowRequest) -> StartWorkflowResponse
                             "fov_end": request.parameters.fov_end,
                             "batch_size": request.parameters.batch_size,
                             "n_workers": request.parameters.n_workers,
+                            "worker_mode": request.parameters.worker_mode,
                         },
                     )
                 )
@@ -463,6 +535,7 @@ async def start_workflow(request: StartWorkflowRequest) -> StartWorkflowResponse
                     batch_size=request.parameters.batch_size,
                     n_workers=request.parameters.n_workers,
                     cancel_event=cancel_event,
+                    worker_mode=request.parameters.worker_mode,
                 )
 
                 if success:
@@ -613,8 +686,9 @@ async def get_workflow_results(job_id: str) -> WorkflowResultsResponse:
     output_dir = Path(job.result["output_dir"])
     traces = []
     if output_dir.exists():
-        for trace_file in output_dir.glob("**/*_traces.csv"):
-            traces.append(str(trace_file))
+        for suffix in TRACE_FORMATS.values():
+            for trace_file in output_dir.glob(f"**/*_traces{suffix}"):
+                traces.append(str(trace_file))
 
     return WorkflowResultsResponse(
         success=True,
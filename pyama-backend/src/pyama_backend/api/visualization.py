@@ -8,6 +8,7 @@ from typing import Literal, Optional
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
+from pyama_core.io.processing_csv import TRACE_FORMATS
 from pyama_core.visualization import VisualizationCache
 
 logger = logging.getLogger(__name__)
@@ -104,9 +105,11 @@ def _locate_fov_artifacts(output_dir: Path, fov_id: int) -> dict[str, Path]:
         artifacts["seg_labeled"] = seg_labeled
 
     # Traces
-    traces_csv = fov_dir / f"fov_{fov_id:03d}_traces.csv"
-    if traces_csv.exists():
-        artifacts["traces_csv"] = traces_csv
+    for suffix in TRACE_FORMATS.values():
+        traces_csv = fov_dir / f"fov_{fov_id:03d}_traces{suffix}"
+        if traces_csv.exists():
+            artifacts["traces_csv"] = traces_csv
+            break
 
     return artifacts
 
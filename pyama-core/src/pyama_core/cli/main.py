@@ -1,5 +1,6 @@
 """Command-line helpers for pyama-core."""
 
+import json
 import logging
 from collections import defaultdict
 from pathlib import Path
@@ -20,7 +21,15 @@ from pyama_core.processing.merge import (
     parse_fov_range,
     run_merge as run_core_merge,
 )
+from pyama_core.processing.workflow.config import load_workflow_config
+from pyama_core.processing.workflow.planner import plan_workflow
 from pyama_core.processing.workflow.run import run_complete_workflow
+from pyama_core.processing.workflow.shards import (
+    combine_shard_results,
+    parse_shard,
+    shard_fov_range,
+    shard_results_dir,
+)
 from pyama_core.types.processing import (
     ChannelSelection,
     Channels,
@@ -188,6 +197,185 @@ def convert(
         typer.echo(f"Saved {len(saved_files)} file(s) to {target_dir}")
 
 
+# =============================================================================
+# BATCH CLI COMMANDS
+# =============================================================================
+
+
+def _configure_batch_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
+    # Suppress verbose debug messages from fsspec (used by bioio)
+    logging.getLogger("fsspec.local").setLevel(logging.WARNING)
+
+
+def _load_config_or_exit(config_path: Path):
+    try:
+        return load_workflow_config(config_path)
+    except (OSError, ValueError) as exc:
+        typer.secho(f"Invalid workflow config: {exc}", err=True, fg=typer.colors.RED)
+        raise typer.Exit(code=2) from exc
+
+
+def _load_metadata_or_exit(microscopy_file: Path):
+    try:
+        image, metadata = load_microscopy_file(microscopy_file)
+        if hasattr(image, "close"):
+            try:
+                image.close()
+            except Exception:  # pragma: no cover - best effort cleanup
+                pass
+    except Exception as exc:  # pragma: no cover - runtime path
+        typer.secho(
+            f"Failed to load microscopy file: {exc}", err=True, fg=typer.colors.RED
+        )
+        raise typer.Exit(code=1) from exc
+    return metadata
+
+
+@app.command()
+def run(
+    config: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Workflow config (YAML or JSON).",
+    ),
+    shard: str | None = typer.Option(
+        None,
+        "--shard",
+        help=(
+            "Process only shard i of n ('i/n', 0-based), e.g. "
+            "$SLURM_ARRAY_TASK_ID/$SLURM_ARRAY_TASK_COUNT. Shard results are "
+            "written to <output_dir>/shards/ and merged with 'combine'."
+        ),
+    ),
+) -> None:
+    """Run the processing workflow non-interactively from a config file."""
+    _configure_batch_logging()
+    workflow_config = _load_config_or_exit(config)
+    shard_spec = None
+    if shard is not None:
+        try:
+            shard_spec = parse_shard(shard)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc), param_hint="--shard") from exc
+
+    metadata = _load_metadata_or_exit(workflow_config.microscopy_file)
+    fov_start = workflow_config.fov_start
+    fov_end = workflow_config.fov_end
+    if fov_start is None or fov_start == -1:
+        fov_start = 0
+    if fov_end is None or fov_end == -1:
+        fov_end = metadata.n_fovs - 1
+
+    results_dir = None
+    if shard_spec is not None:
+        index, count = shard_spec
+        fov_range = shard_fov_range(fov_start, fov_end, index, count)
+        if fov_range is None:
+            typer.echo(f"Shard {index}/{count} has no FOVs; nothing to do.")
+            return
+        fov_start, fov_end = fov_range
+        results_dir = shard_results_dir(workflow_config.output_dir, index, count)
+        typer.echo(f"Shard {index}/{count}: FOVs {fov_start}-{fov_end}")
+
+    workflow_config.output_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        success = run_complete_workflow(
+            metadata=metadata,
+            context=workflow_config.to_context(),
+            fov_start=fov_start,
+            fov_end=fov_end,
+            batch_size=workflow_config.batch_size,
+            n_workers=workflow_config.n_workers,
+            worker_mode=workflow_config.worker_mode,
+            results_dir=results_dir,
+        )
+    except Exception as exc:  # pragma: no cover - defensive
+        typer.secho(f"Workflow failed: {exc}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1) from exc
+
+    status = "SUCCESS" if success else "FAILED"
+    color = typer.colors.GREEN if success else typer.colors.RED
+    typer.secho(f"Workflow finished: {status}", bold=True, fg=color)
+    if not success:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def combine(
+    config: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Workflow config the shards were run with.",
+    ),
+) -> None:
+    """Merge the results of all 'run --shard' jobs into processing_results.yaml."""
+    _configure_batch_logging()
+    workflow_config = _load_config_or_exit(config)
+    base_name = None
+    if workflow_config.params.get("combine_traces", False):
+        base_name = _load_metadata_or_exit(workflow_config.microscopy_file).base_name
+    try:
+        merged = combine_shard_results(workflow_config.output_dir, base_name=base_name)
+    except (OSError, ValueError) as exc:
+        typer.secho(f"Combine failed: {exc}", err=True, fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
+    typer.secho(
+        f"Combined results of {len(merged.results or {})} FOVs into "
+        f"{workflow_config.output_dir / 'processing_results.yaml'}",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+
+
+@app.command()
+def plan(
+    config: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Workflow config (YAML or JSON).",
+    ),
+    as_json: bool = typer.Option(
+        False, "--json", help="Print the plan as JSON instead of a table."
+    ),
+) -> None:
+    """Estimate disk use, memory and runtime of a run without processing."""
+    _configure_batch_logging()
+    workflow_config = _load_config_or_exit(config)
+    metadata = _load_metadata_or_exit(workflow_config.microscopy_file)
+    try:
+        workflow_plan = plan_workflow(
+            metadata,
+            workflow_config.channels,
+            workflow_config.params,
+            fov_start=workflow_config.fov_start,
+            fov_end=workflow_config.fov_end,
+            n_workers=workflow_config.n_workers,
+            batch_size=workflow_config.batch_size,
+            worker_mode=workflow_config.worker_mode,
+            output_dir=workflow_config.output_dir,
+        )
+    except Exception as exc:  # pragma: no cover - defensive
+        typer.secho(f"Planning failed: {exc}", err=True, fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
+    if as_json:
+        typer.echo(json.dumps(workflow_plan.to_dict(), indent=2))
+    else:
+        typer.echo(workflow_plan.describe())
+
+
 # =============================================================================
 # INTERACTIVE CLI COMMANDS
 # =============================================================================
@@ -13,12 +13,21 @@ Fitted Results CSV:
     Output format from fitting with columns: fov, cell, model_type, success, r_squared, {params}
     One row per cell with fitting results and parameter values.
 
+Tidy analysis tables may also be stored as Parquet or Feather (chosen by file
+suffix). Binary files keep full float precision and store the time units in
+the Arrow schema metadata instead of a comment header.
+
 See AGENTS.md for complete CSV format documentation.
 """
 
 import pandas as pd
 from pathlib import Path
 
+from pyama_core.io.processing_csv import TRACE_FORMATS, require_pyarrow
+
+# Arrow schema metadata key holding the time units of binary tables
+_TIME_UNITS_KEY = b"pyama_time_units"
+
 
 def write_analysis_csv(
     df: pd.DataFrame, output_path: Path, time_units: str | None = None
@@ -46,15 +55,81 @@ def write_analysis_csv(
         df_to_write.to_csv(f, index=True, header=True, float_format="%.6f")
 
 
+def write_tidy_table(
+    df: pd.DataFrame, output_path: Path, time_units: str | None = None
+) -> None:
+    """
+    Write a tidy (time, fov, cell, value) table in the format of its suffix.
+
+    CSV files get the time units as a comment header; Parquet and Feather
+    files keep typed columns and store the units in the schema metadata.
+
+    Args:
+        df: Tidy DataFrame with columns time, fov, cell, value
+        output_path: Output path (``.csv``, ``.parquet`` or ``.feather``)
+        time_units: Optional time units of the ``time`` column
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = output_path.suffix.lower()
+
+    if suffix not in (TRACE_FORMATS["parquet"], TRACE_FORMATS["feather"]):
+        if time_units:
+            with output_path.open("w", encoding="utf-8") as handle:
+                handle.write(f"# Time units: {time_units}\n")
+                df.to_csv(handle, index=False, float_format="%.6f")
+        else:
+            df.to_csv(output_path, index=False, float_format="%.6f")
+        return
+
+    require_pyarrow(suffix.lstrip("."))
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    if time_units:
+        metadata = dict(table.schema.metadata or {})
+        metadata[_TIME_UNITS_KEY] = str(time_units).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+
+    if suffix == TRACE_FORMATS["parquet"]:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, output_path)
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, output_path)
+
+
+def _read_binary_table(path: Path) -> tuple[pd.DataFrame, str | None]:
+    """Read a Parquet/Feather tidy table and its time units."""
+    suffix = path.suffix.lower()
+    require_pyarrow(suffix.lstrip("."))
+    if suffix == TRACE_FORMATS["parquet"]:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        import pyarrow.feather as feather
+
+        table = feather.read_table(path)
+
+    time_units = None
+    metadata = table.schema.metadata or {}
+    if _TIME_UNITS_KEY in metadata:
+        time_units = metadata[_TIME_UNITS_KEY].decode("utf-8").strip().lower()
+    return table.to_pandas(), time_units
+
+
 def load_analysis_csv(csv_path: Path) -> pd.DataFrame:
     """
     Load an analysis CSV file in tidy/long format.
 
     Reads CSV with columns (time, fov, cell, value) and returns DataFrame
-    with MultiIndex (fov, cell) for efficient cell-wise access.
+    with MultiIndex (fov, cell) for efficient cell-wise access. Parquet and
+    Feather files with the same columns are read by suffix.
 
     Args:
-        csv_path: Path to the analysis CSV file
+        csv_path: Path to the analysis CSV (or Parquet/Feather) file
 
     Returns:
         DataFrame with MultiIndex (fov, cell) and 'time', 'value' columns
@@ -62,15 +137,18 @@ def load_analysis_csv(csv_path: Path) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"Analysis CSV file not found: {csv_path}")
 
-    # Read time units from comment header
-    time_units = None
-    with open(csv_path, "r") as f:
-        first_line = f.readline().strip()
-        if first_line.startswith("# Time units:"):
-            time_units = first_line.split(":", 1)[1].strip().lower()
+    if csv_path.suffix.lower() in (TRACE_FORMATS["parquet"], TRACE_FORMATS["feather"]):
+        df, time_units = _read_binary_table(csv_path)
+    else:
+        # Read time units from comment header
+        time_units = None
+        with open(csv_path, "r") as f:
+            first_line = f.readline().strip()
+            if first_line.startswith("# Time units:"):
+                time_units = first_line.split(":", 1)[1].strip().lower()
 
-    # Load CSV
-    df = pd.read_csv(csv_path, comment="#")
+        # Load CSV
+        df = pd.read_csv(csv_path, comment="#")
 
     # Validate tidy format columns
     required_cols = {"time", "fov", "cell", "value"}
@@ -165,18 +243,22 @@ def discover_csv_files(data_path: Path | str) -> list[Path]:
     """
     Discover CSV files for analysis.
 
+    Parquet and Feather tables are discovered alongside CSV files.
+
     Args:
         data_path: Path to a CSV file or directory containing CSV files
 
     Returns:
-        List of CSV file paths
+        List of CSV (or Parquet/Feather) file paths
     """
     data_path = Path(data_path)
     csv_files = []
+    suffixes = set(TRACE_FORMATS.values())
 
-    if data_path.is_file() and data_path.suffix.lower() == ".csv":
+    if data_path.is_file() and data_path.suffix.lower() in suffixes:
         csv_files.append(data_path)
     elif data_path.is_dir():
-        csv_files.extend(data_path.glob("*.csv"))
+        for suffix in TRACE_FORMATS.values():
+            csv_files.extend(sorted(data_path.glob(f"*{suffix}")))
 
     return [f for f in csv_files if "_fitted" not in f.name and "_traces" not in f.name]
@@ -0,0 +1,126 @@
+"""
+Atomic output files for the processing workflow.
+
+Outputs are written under a temporary ``<stem>.partial<suffix>`` name next to
+the final path and renamed onto it with ``os.replace`` once complete, so a
+crash or kill never leaves a truncated file under the final name. The
+suffix is kept so format detection by extension still works on the
+temporary file. Partial files left behind by an interrupted run are found
+with ``find_partial_outputs`` and removed with ``cleanup_partial_outputs``.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_TAG = ".partial"
+
+# Partial files next to one of these are kept, since a rerun resumes them
+_RESUME_CHECKPOINT_SUFFIX = "_tracking_ckpt.npz"
+
+
+def partial_path(path: Path) -> Path:
+    """Return the temporary path an output is written to before it is committed."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}{PARTIAL_TAG}{path.suffix}")
+
+
+def is_partial_path(path: Path) -> bool:
+    """Return True if ``path`` is a temporary output name (or a sidecar of one)."""
+    return f"{PARTIAL_TAG}." in Path(path).name
+
+
+def _output_stem(path: Path) -> str:
+    """Stem of the final output a temporary file (or its sidecar) belongs to."""
+    return Path(path).name.split(f"{PARTIAL_TAG}.", 1)[0]
+
+
+def commit_partial(path: Path) -> Path:
+    """Atomically move the completed temporary file of ``path`` onto ``path``.
+
+    Args:
+        path: Final output path.
+
+    Returns:
+        ``path``.
+    """
+    path = Path(path)
+    os.replace(partial_path(path), path)
+    return path
+
+
+def discard_partial(path: Path) -> None:
+    """Remove the temporary file of ``path`` if present."""
+    partial_path(path).unlink(missing_ok=True)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write a small text file (YAML/JSON sidecars) atomically."""
+    path = Path(path)
+    tmp = partial_path(path)
+    with tmp.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp, path)
+
+
+def resume_checkpoint_path(path: Path) -> Path:
+    """Return the tracking checkpoint path that belongs to a final output path."""
+    path = Path(path)
+    return path.with_name(path.stem + _RESUME_CHECKPOINT_SUFFIX)
+
+
+def find_partial_outputs(directory: Path) -> list[Path]:
+    """List orphaned temporary outputs in ``directory`` (non-recursive).
+
+    Temporary files that a tracking checkpoint can resume are not orphaned
+    and are left out; half-written checkpoints (``*.npz.tmp``) are included.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    orphans = []
+    for path in sorted(directory.iterdir()):
+        if not path.is_file():
+            continue
+        if path.name.endswith(_RESUME_CHECKPOINT_SUFFIX + ".tmp"):
+            orphans.append(path)
+            continue
+        if not is_partial_path(path):
+            continue
+        if path.with_name(_output_stem(path) + _RESUME_CHECKPOINT_SUFFIX).exists():
+            continue
+        orphans.append(path)
+    return orphans
+
+
+def cleanup_partial_outputs(directory: Path) -> list[Path]:
+    """Remove orphaned temporary outputs in ``directory``.
+
+    Returns:
+        Paths that were removed.
+    """
+    removed = []
+    for path in find_partial_outputs(directory):
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.warning("Failed to remove partial output %s: %s", path, e)
+            continue
+        logger.info("Removed partial output %s", path)
+        removed.append(path)
+    return removed
+
+
+__all__ = [
+    "PARTIAL_TAG",
+    "partial_path",
+    "is_partial_path",
+    "commit_partial",
+    "discard_partial",
+    "atomic_write_text",
+    "resume_checkpoint_path",
+    "find_partial_outputs",
+    "cleanup_partial_outputs",
+]
@@ -6,36 +6,160 @@ processing module. The format includes FOV information, cell tracking data,
 and extracted features.
 
 Format: fov, cell, frame, time, good, position_x, position_y, and dynamic feature columns
+
+Trace tables can also be stored in columnar binary form (Parquet or Feather,
+chosen by file suffix). Binary files keep typed columns and full float
+precision; a combined Parquet file holds one row group per FOV so a single
+FOV can be read without scanning the others.
+
+Each trace file may have a JSON manifest next to it recording which feature
+columns it holds and the extraction parameters they were computed with, so
+new features can be appended without recomputing existing columns.
+
+Trace tables and manifests are written to a temporary name and renamed onto
+the final path when complete, so readers never see a half-written file.
 """
 
+import importlib.util
+import json
 from pathlib import Path
 
 import pandas as pd
 
+from pyama_core.io.atomic import (
+    atomic_write_text,
+    commit_partial,
+    discard_partial,
+    partial_path,
+)
 # Import Result class for field definitions
 from pyama_core.types.processing import Result
 
+# Supported trace table formats and their file suffixes
+TRACE_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+# Column types of binary trace tables (feature columns are float64)
+_TRACE_DTYPES = {
+    "fov": "int64",
+    "cell": "int64",
+    "frame": "int64",
+    "time": "float64",
+    "good": "bool",
+}
+
+
+def trace_file_suffix(trace_format: str) -> str:
+    """
+    Get the file suffix for a trace table format.
+
+    Args:
+        trace_format: One of ``TRACE_FORMATS`` ("csv", "parquet", "feather")
+
+    Returns:
+        File suffix including the dot
+    """
+    try:
+        return TRACE_FORMATS[str(trace_format).lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown trace format '{trace_format}'. "
+            f"Available formats: {', '.join(TRACE_FORMATS)}"
+        ) from None
+
+
+def _trace_format_from_path(path: Path) -> str:
+    """Infer the trace table format from a file suffix (default: CSV)."""
+    suffix = path.suffix.lower()
+    for trace_format, format_suffix in TRACE_FORMATS.items():
+        if suffix == format_suffix:
+            return trace_format
+    return "csv"
+
+
+def require_pyarrow(trace_format: str) -> None:
+    """
+    Check that pyarrow is installed before reading or writing binary traces.
+
+    Args:
+        trace_format: Format name used in the error message
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(
+            f"pyarrow is required for {trace_format} trace files. "
+            "Install it with: pip install pyarrow"
+        )
+
+
+def typed_trace_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast trace table columns to their stored types.
+
+    Identifier columns become int64, ``good`` becomes bool and all other
+    numeric columns float64.
+
+    Args:
+        df: Trace DataFrame
 
-def get_dataframe(csv_path: Path) -> pd.DataFrame:
+    Returns:
+        DataFrame with typed columns
+    """
+    dtypes = {}
+    for col in df.columns:
+        if col in _TRACE_DTYPES:
+            dtypes[col] = _TRACE_DTYPES[col]
+        elif df.empty or (
+            pd.api.types.is_numeric_dtype(df[col])
+            and not pd.api.types.is_bool_dtype(df[col])
+        ):
+            dtypes[col] = "float64"
+    return df.astype(dtypes)
+
+
+def get_dataframe(csv_path: Path, fov: int | None = None) -> pd.DataFrame:
     """
-    Get the dataframe from a processing CSV file.
+    Get the dataframe from a processing trace file.
+
+    The format is chosen by suffix: ``.csv`` (default), ``.parquet`` or
+    ``.feather``.
 
     Args:
-        csv_path: Path to the processing CSV file
+        csv_path: Path to the processing trace file
+        fov: Optional FOV to select; for Parquet only the matching row
+            groups are read (combined files store one row group per FOV)
 
     Returns:
         DataFrame with the processing data
     """
     if not csv_path.exists():
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        raise FileNotFoundError(f"Trace file not found: {csv_path}")
+
+    trace_format = _trace_format_from_path(csv_path)
+    if trace_format != "csv":
+        require_pyarrow(trace_format)
 
     try:
-        df = pd.read_csv(csv_path)
+        if trace_format == "parquet":
+            filters = [("fov", "==", int(fov))] if fov is not None else None
+            df = pd.read_parquet(csv_path, filters=filters)
+        elif trace_format == "feather":
+            df = pd.read_feather(csv_path)
+        else:
+            df = pd.read_csv(csv_path)
     except Exception as exc:
-        raise ValueError(f"Failed to read CSV file: {exc}") from exc
+        raise ValueError(f"Failed to read {trace_format} file: {exc}") from exc
+
+    if fov is not None and trace_format != "parquet" and "fov" in df.columns:
+        df = df[df["fov"] == fov].reset_index(drop=True)
 
     if df.empty:
-        raise ValueError(f"CSV file is empty: {csv_path}")
+        raise ValueError(f"Trace file is empty: {csv_path}")
 
     return df
 
@@ -97,26 +221,159 @@ def extract_cell_feature_dataframe(df: pd.DataFrame, cell_id: int) -> pd.DataFra
     return result_df
 
 
+def write_trace_table(df: pd.DataFrame, path: Path, **kwargs) -> None:
+    """
+    Write a trace table in the format given by the file suffix.
+
+    Unlike ``write_dataframe`` an empty table is written too (header only
+    for CSV, empty typed columns for binary formats).
+
+    Args:
+        df: Trace DataFrame to write
+        path: Output path (``.csv``, ``.parquet`` or ``.feather``)
+        **kwargs: Additional arguments passed to pandas.to_csv() for CSV
+            files (ignored for binary formats, which keep full precision)
+    """
+    trace_format = _trace_format_from_path(path)
+    if trace_format != "csv":
+        require_pyarrow(trace_format)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = partial_path(path)
+    try:
+        if trace_format == "csv":
+            df.to_csv(tmp_path, index=False, **kwargs)
+        else:
+            df = typed_trace_columns(df).reset_index(drop=True)
+            if trace_format == "parquet":
+                df.to_parquet(tmp_path, index=False)
+            else:
+                df.to_feather(tmp_path)
+    except BaseException:
+        discard_partial(path)
+        raise
+    commit_partial(path)
+
+
 def write_dataframe(df: pd.DataFrame, csv_path: Path, **kwargs) -> None:
     """
-    Write a DataFrame to a CSV file.
+    Write a DataFrame to a trace file (CSV, Parquet or Feather by suffix).
 
     Args:
         df: DataFrame to write
-        csv_path: Path to the output CSV file
+        csv_path: Path to the output file
         **kwargs: Additional arguments passed to pandas.to_csv()
     """
     if df.empty:
         raise ValueError("Cannot write empty DataFrame to CSV")
 
     try:
-        # Ensure parent directory exists
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write to CSV with default settings optimized for processing format
-        df.to_csv(csv_path, index=False, **kwargs)
+        # Write with default settings optimized for processing format
+        write_trace_table(df, csv_path, **kwargs)
+    except ImportError:
+        raise
     except Exception as exc:
-        raise ValueError(f"Failed to write CSV file: {exc}") from exc
+        raise ValueError(f"Failed to write trace file: {exc}") from exc
+
+
+def trace_manifest_path(trace_path: Path) -> Path:
+    """
+    Get the manifest path of a trace file (``<stem>.columns.json``).
+
+    Args:
+        trace_path: Path to the trace file
+
+    Returns:
+        Path of the JSON manifest next to the trace file
+    """
+    return trace_path.with_name(f"{trace_path.stem}.columns.json")
+
+
+def read_trace_manifest(trace_path: Path) -> dict | None:
+    """
+    Read the column manifest of a trace file.
+
+    The manifest has two entries: ``rows`` with the parameters that select
+    the rows (trace filters) and ``columns`` mapping each feature column to
+    its channel, feature name and extraction parameters.
+
+    Args:
+        trace_path: Path to the trace file
+
+    Returns:
+        Manifest dict, or None if missing or unreadable (legacy files)
+    """
+    path = trace_manifest_path(trace_path)
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("columns"), dict):
+        return None
+    return manifest
+
+
+def write_trace_manifest(trace_path: Path, manifest: dict) -> None:
+    """
+    Write the column manifest of a trace file.
+
+    Args:
+        trace_path: Path to the trace file
+        manifest: Manifest dict (see ``read_trace_manifest``)
+    """
+    atomic_write_text(
+        trace_manifest_path(trace_path), json.dumps(manifest, indent=2, sort_keys=True)
+    )
+
+
+def combine_trace_files(
+    trace_paths: dict[int, Path], out_path: Path
+) -> Path | None:
+    """
+    Combine per-FOV trace files into one Parquet file, one row group per FOV.
+
+    Readers select a FOV with ``get_dataframe(out_path, fov=...)``, which
+    only reads that FOV's row group.
+
+    Args:
+        trace_paths: Mapping of FOV to its trace file (any supported format)
+        out_path: Output ``.parquet`` path
+
+    Returns:
+        ``out_path``, or None if no FOV had any traces
+    """
+    require_pyarrow("parquet")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for fov in sorted(trace_paths):
+            try:
+                df = get_dataframe(Path(trace_paths[fov]))
+            except ValueError:
+                # Empty FOV tables have no row group
+                continue
+            if "fov" not in df.columns:
+                df.insert(0, "fov", fov)
+            table = pa.Table.from_pandas(
+                typed_trace_columns(df).reset_index(drop=True), preserve_index=False
+            )
+            if writer is None:
+                out_path.parent.mkdir(parents=True, exist_ok=True)
+                writer = pq.ParquetWriter(partial_path(out_path), table.schema)
+            # One write_table call per FOV produces one row group per FOV
+            writer.write_table(table.cast(writer.schema), row_group_size=len(df))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            discard_partial(out_path)
+        raise
+    if writer is None:
+        return None
+    writer.close()
+    return commit_partial(out_path)
 
 
 def update_cell_quality(df: pd.DataFrame, quality_df: pd.DataFrame) -> pd.DataFrame:
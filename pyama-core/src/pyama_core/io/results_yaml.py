@@ -9,6 +9,7 @@ from typing import Any
 
 import yaml
 
+from pyama_core.io.atomic import atomic_write_text
 from pyama_core.types.io import ProcessingResults
 from pyama_core.types.processing import (
     ChannelSelection,
@@ -272,14 +273,15 @@ def save_processing_results_yaml(
     safe_context = serialize_processing_results(context, time_units)
 
     try:
-        with yaml_path.open("w", encoding="utf-8") as f:
+        atomic_write_text(
+            yaml_path,
             yaml.safe_dump(
                 safe_context,
-                f,
                 sort_keys=False,
                 default_flow_style=False,
                 allow_unicode=True,
-            )
+            ),
+        )
         logger.info("Wrote processing results to %s", yaml_path)
     except Exception as e:
         logger.warning("Failed to write processing_results.yaml: %s", e)
@@ -0,0 +1,257 @@
+"""
+Deterministic synthetic microscopy data for tests and benchmarks.
+
+Generates a phase contrast and a fluorescence stack of round cells that
+drift, grow and divide:
+
+- Phase contrast: textured bright disks on a flat, slightly noisy field
+- Fluorescence: each cell expresses a reporter following the maturation
+  model (``analysis.models.maturation``) with its own onset, translation
+  and decay rate, spread evenly over the cell's pixels; daughters inherit
+  half of the mother's reporter
+- A smooth illumination background (slowly varying over time) and
+  Gaussian camera noise are added to the fluorescence
+
+The same ``SyntheticConfig`` (including ``seed``) always yields identical
+stacks and ground truth.
+"""
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pyama_core.analysis.models import maturation
+from pyama_core.io.microscopy import MicroscopyMetadata
+from pyama_core.types.analysis import FitParam
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """Geometry and dynamics of a synthetic time-lapse.
+
+    Times are in minutes (``frame_interval``); reporter kinetics use hours
+    like the maturation model.
+    """
+
+    n_frames: int = 60
+    height: int = 1024
+    width: int = 1024
+    n_cells: int = 40
+    radius: float = 14.0
+    frame_interval: float = 10.0
+    drift: float = 0.5
+    growth: float = 0.002
+    division_probability: float = 0.3
+    max_cells: int = 200
+    pc_background: float = 100.0
+    pc_contrast: float = 60.0
+    fl_background: float = 200.0
+    fl_noise: float = 5.0
+    onset_range: tuple[float, float] = (-0.5, 0.5)
+    ktl_range: tuple[float, float] = (5e2, 2e3)
+    delta_range: tuple[float, float] = (0.05, 0.2)
+    seed: int = 0
+
+
+@dataclass
+class SyntheticDataset:
+    """Synthetic stacks with ground truth.
+
+    ``cells`` has one row per cell and frame (``frame``, ``cell``,
+    ``parent``, ``y``, ``x``, ``radius``, ``fluorescence``); ``fluorescence``
+    is the cell's total reporter signal above background. Daughters get new
+    cell IDs and ``parent`` points to the mother (0 for founders).
+    """
+
+    config: SyntheticConfig
+    pc: np.ndarray
+    fl: np.ndarray
+    times: np.ndarray
+    cells: pd.DataFrame = field(repr=False)
+
+    def metadata(self, file_path: Path | None = None) -> MicroscopyMetadata:
+        """Describe the dataset as a one-FOV, two-channel microscopy file."""
+        config = self.config
+        return MicroscopyMetadata(
+            file_path=Path(file_path or "synthetic.nd2"),
+            base_name="synthetic",
+            file_type="synthetic",
+            height=config.height,
+            width=config.width,
+            n_frames=config.n_frames,
+            n_fovs=1,
+            n_channels=2,
+            timepoints=self.times.tolist(),
+            channel_names=["PC", "FL"],
+            dtype="uint16",
+        )
+
+
+def reporter_signal(
+    t_hours: np.ndarray, onset: float, ktl: float, delta: float
+) -> np.ndarray:
+    """Total reporter fluorescence of one cell (maturation model, no offset)."""
+    fixed = maturation.DEFAULT_FIXED
+    fit = {
+        "t0": FitParam(name="Time Zero", value=onset, lb=onset, ub=onset),
+        "ktl": FitParam(name="Translation Rate", value=ktl, lb=ktl, ub=ktl),
+        "delta": FitParam(name="Decay Rate", value=delta, lb=delta, ub=delta),
+        "offset": FitParam(name="Baseline Offset", value=0.0, lb=0.0, ub=0.0),
+    }
+    return maturation.eval(np.asarray(t_hours, dtype=float), fixed, fit)
+
+
+def _illumination(config: SyntheticConfig) -> np.ndarray:
+    """Smooth vignetting-like illumination profile in ``[0.7, 1.0]``."""
+    yy = np.linspace(-1.0, 1.0, config.height)[:, None]
+    xx = np.linspace(-1.0, 1.0, config.width)[None, :]
+    return (1.0 - 0.3 * (0.6 * yy**2 + 0.4 * xx**2 + 0.1 * xx * yy) / 1.1).astype(
+        np.float32
+    )
+
+
+def generate_synthetic_dataset(
+    config: SyntheticConfig | None = None,
+) -> SyntheticDataset:
+    """Render a synthetic phase contrast / fluorescence time-lapse.
+
+    Args:
+        config: Geometry, dynamics and seed (defaults to ``SyntheticConfig()``).
+
+    Returns:
+        ``SyntheticDataset`` with ``uint16`` stacks of shape ``(T, H, W)``,
+        frame times in minutes and per-frame ground truth.
+    """
+    config = config or SyntheticConfig()
+    rng = np.random.default_rng(config.seed)
+    n_frames, height, width = config.n_frames, config.height, config.width
+    times = np.arange(n_frames, dtype=float) * config.frame_interval
+    t_hours = times / 60.0
+
+    pc = np.empty((n_frames, height, width), dtype=np.uint16)
+    fl = np.empty((n_frames, height, width), dtype=np.uint16)
+    illumination = _illumination(config)
+    margin = config.radius * 2
+
+    # Founder cells on a jittered grid so they start apart
+    side = int(np.ceil(np.sqrt(config.n_cells)))
+    step_y = (height - 2 * margin) / side
+    step_x = (width - 2 * margin) / side
+    cells = []
+    for i in range(config.n_cells):
+        gy, gx = divmod(i, side)
+        cells.append(
+            {
+                "cell": i + 1,
+                "parent": 0,
+                "y": margin + (gy + 0.5) * step_y + rng.uniform(-0.2, 0.2) * step_y,
+                "x": margin + (gx + 0.5) * step_x + rng.uniform(-0.2, 0.2) * step_x,
+                "radius": config.radius * rng.uniform(0.85, 1.0),
+                "onset": rng.uniform(*config.onset_range),
+                "ktl": rng.uniform(*config.ktl_range),
+                "delta": rng.uniform(*config.delta_range),
+                "share": 1.0,
+                "divide_at": (
+                    int(rng.integers(n_frames // 4, n_frames))
+                    if rng.random() < config.division_probability
+                    else None
+                ),
+            }
+        )
+    next_id = config.n_cells + 1
+
+    rows = []
+    for t in range(n_frames):
+        # Divisions: the mother is replaced by two daughters side by side
+        dividing = [c for c in cells if c["divide_at"] == t]
+        for mother in dividing:
+            if len(cells) + 1 > config.max_cells:
+                break
+            cells.remove(mother)
+            angle = rng.uniform(0, np.pi)
+            radius = mother["radius"] / np.sqrt(2)
+            for sign in (-1, 1):
+                cells.append(
+                    {
+                        **mother,
+                        "cell": next_id,
+                        "parent": mother["cell"],
+                        "y": mother["y"] + sign * radius * np.sin(angle),
+                        "x": mother["x"] + sign * radius * np.cos(angle),
+                        "radius": radius,
+                        "share": mother["share"] / 2,
+                        "divide_at": None,
+                    }
+                )
+                next_id += 1
+
+        pc_frame = rng.normal(config.pc_background, 1.0, (height, width))
+        fl_frame = np.zeros((height, width), dtype=np.float64)
+        for cell in cells:
+            dy, dx = rng.normal(0, config.drift, 2)
+            cell["y"] = float(np.clip(cell["y"] + dy, margin, height - margin))
+            cell["x"] = float(np.clip(cell["x"] + dx, margin, width - margin))
+            cell["radius"] = min(cell["radius"] * (1 + config.growth), config.radius)
+            r = cell["radius"]
+            y0, y1 = int(max(cell["y"] - r - 1, 0)), int(min(cell["y"] + r + 2, height))
+            x0, x1 = int(max(cell["x"] - r - 1, 0)), int(min(cell["x"] + r + 2, width))
+            yy, xx = np.mgrid[y0:y1, x0:x1]
+            disk = (yy - cell["y"]) ** 2 + (xx - cell["x"]) ** 2 <= r**2
+            n_pixels = int(disk.sum())
+            if n_pixels == 0:
+                continue
+            pc_frame[y0:y1, x0:x1][disk] += rng.normal(
+                config.pc_contrast, config.pc_contrast / 2, n_pixels
+            )
+            signal = cell["share"] * float(
+                reporter_signal(t_hours[t], cell["onset"], cell["ktl"], cell["delta"])
+            )
+            fl_frame[y0:y1, x0:x1][disk] += signal / n_pixels
+            rows.append(
+                {
+                    "frame": t,
+                    "cell": cell["cell"],
+                    "parent": cell["parent"],
+                    "y": cell["y"],
+                    "x": cell["x"],
+                    "radius": r,
+                    "fluorescence": signal,
+                }
+            )
+
+        # Illumination drifts by a few percent over the movie
+        level = config.fl_background * (1.0 + 0.05 * np.sin(2 * np.pi * t / n_frames))
+        fl_frame += level * illumination
+        fl_frame += rng.normal(0, config.fl_noise, (height, width))
+        pc[t] = np.clip(pc_frame, 0, np.iinfo(np.uint16).max)
+        fl[t] = np.clip(fl_frame, 0, np.iinfo(np.uint16).max)
+
+    return SyntheticDataset(
+        config=config,
+        pc=pc,
+        fl=fl,
+        times=times,
+        cells=pd.DataFrame(
+            rows,
+            columns=["frame", "cell", "parent", "y", "x", "radius", "fluorescence"],
+        ),
+    )
+
+
+def config_dict(config: SyntheticConfig) -> dict:
+    """Return ``config`` as a JSON-serializable dict."""
+    return {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in asdict(config).items()
+    }
+
+
+__all__ = [
+    "SyntheticConfig",
+    "SyntheticDataset",
+    "generate_synthetic_dataset",
+    "reporter_signal",
+    "config_dict",
+]
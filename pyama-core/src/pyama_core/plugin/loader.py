@@ -50,12 +50,19 @@ def load_plugins(plugin_dir: Path | None = None) -> PluginScanner:
         feature_type = plugin_data["feature_type"]
 
         try:
-            extractor = getattr(module, f"extract_{plugin_name}")
-            register_plugin_feature(plugin_name, extractor, feature_type)
+            extractor = getattr(module, f"extract_{plugin_name}", None)
+            batch_extractor = getattr(module, f"extract_{plugin_name}_batch", None)
+            register_plugin_feature(
+                plugin_name,
+                extractor,
+                feature_type,
+                batch_extractor=batch_extractor,
+            )
             logger.debug(
-                "Registered feature plugin '%s' (%s) from %s",
+                "Registered feature plugin '%s' (%s%s) from %s",
                 plugin_name,
                 feature_type,
+                ", batch" if batch_extractor is not None else "",
                 plugin_data.get("path", plugin_dir),
             )
         except Exception as e:
@@ -133,7 +133,7 @@ class PluginScanner:
         for attr in required_attrs:
             if not hasattr(module, attr):
                 logger.debug("%s: Missing %s", name, attr)
-            return None
+                return None
 
         plugin_type = getattr(module, "PLUGIN_TYPE")
 
@@ -150,6 +150,12 @@ class PluginScanner:
     ) -> dict[str, object] | None:
         """Validate feature plugin structure.
 
+        Feature plugins require:
+        - PLUGIN_FEATURE_TYPE ("phase" or "fluorescence")
+        - extract_<name>(ctx) taking an ExtractionContext (one cell), and/or
+          extract_<name>_batch(ctx) taking a BatchExtractionContext and
+          returning one value per label
+
         Args:
             name: Plugin name
             module: Loaded module
@@ -167,16 +173,25 @@ class PluginScanner:
             logger.debug("%s: Invalid PLUGIN_FEATURE_TYPE: %s", name, feature_type)
             return None
 
-        # Check for extract_* function
+        # Check for extract_* and/or extract_*_batch functions
         extract_func = getattr(module, f"extract_{name}", None)
-        if not extract_func or not callable(extract_func):
-            logger.debug("%s: Missing extract_%s() function", name, name)
+        batch_func = getattr(module, f"extract_{name}_batch", None)
+        has_extract = callable(extract_func)
+        has_batch = callable(batch_func)
+        if not has_extract and not has_batch:
+            logger.debug(
+                "%s: Missing extract_%s() or extract_%s_batch() function",
+                name,
+                name,
+                name,
+            )
             return None
 
         return {
             "name": getattr(module, "PLUGIN_NAME", name),
             "type": "feature",
             "feature_type": feature_type,
+            "batch": has_batch,
             "version": getattr(module, "PLUGIN_VERSION", "0.0.1"),
             "module": module,
             "path": getattr(module, "__file__", "unknown"),
@@ -1,3 +1,3 @@
-from pyama_core.processing.extraction.run import extract_trace
+from pyama_core.processing.extraction.run import extract_trace, extract_traces
 
-__all__ = ["extract_trace"]
+__all__ = ["extract_trace", "extract_traces"]
@@ -1,14 +1,21 @@
 """Cell feature extraction algorithms and registry.
 
 Features are explicitly registered from modules in this package.
-Each feature module must define an extract_* function.
+Each feature module must define an extract_* function taking an
+ExtractionContext (one cell) and may define an extract_*_batch function
+taking a BatchExtractionContext (all cells of a frame) that returns one
+value per label. The batch form is used when available.
 """
 
 from collections.abc import Callable
+import inspect
+from pathlib import Path
+
+import numpy as np
 
 from pyama_core.processing.extraction.features.fluorescence import intensity_total
 from pyama_core.processing.extraction.features.phase_contrast import area
-from pyama_core.types.processing import ExtractionContext
+from pyama_core.types.processing import BatchExtractionContext, ExtractionContext
 
 # =============================================================================
 # FEATURE REGISTRATION (EXPLICIT)
@@ -31,6 +38,35 @@ FEATURE_EXTRACTORS: dict[str, Callable] = {
     **PHASE_FEATURES,
 }
 
+# Optional batch forms (all cells of a frame at once), keyed like FEATURE_EXTRACTORS.
+BATCH_FEATURE_EXTRACTORS: dict[str, Callable] = {
+    "area": area.extract_area_batch,
+    "intensity_total": intensity_total.extract_intensity_total_batch,
+}
+
+# Source file of each plugin feature, so spawned worker processes can load it
+PLUGIN_FEATURE_FILES: dict[str, Path] = {}
+
+
+def _per_cell_from_batch(batch_extractor: Callable) -> Callable:
+    """Adapt a batch extractor to the per-cell ``ExtractionContext`` form."""
+
+    def extractor(ctx: ExtractionContext) -> float:
+        labeled = ctx.mask.astype(np.uint8)
+        values = batch_extractor(
+            BatchExtractionContext(
+                image=ctx.image,
+                background=ctx.background,
+                labeled=labeled,
+                labels=np.array([1]),
+                background_weight=ctx.background_weight,
+                erosion_size=ctx.erosion_size,
+            )
+        )
+        return np.asarray(values)[0]
+
+    return extractor
+
 
 def list_features() -> list[str]:
     """Return all registered feature names."""
@@ -52,47 +88,85 @@ def get_feature_extractor(feature_name: str):
     return FEATURE_EXTRACTORS[feature_name]
 
 
+def get_batch_feature_extractor(feature_name: str) -> Callable | None:
+    """Get the batch extractor for a feature, or None if it only has the per-cell form."""
+    return BATCH_FEATURE_EXTRACTORS.get(feature_name)
+
+
+def plugin_feature_dirs() -> list[Path]:
+    """Return the folders holding the source files of registered plugin features."""
+    return sorted({path.parent for path in PLUGIN_FEATURE_FILES.values()})
+
+
 def register_plugin_feature(
     feature_name: str,
-    extractor: Callable,
-    feature_type: str
+    extractor: Callable | None,
+    feature_type: str,
+    batch_extractor: Callable | None = None,
 ) -> None:
     """Register a plugin feature at runtime.
 
     Args:
         feature_name: Name of the feature (e.g., "my_feature")
-        extractor: Callable that takes ExtractionContext and returns float
+        extractor: Callable that takes ExtractionContext and returns float.
+            May be None if ``batch_extractor`` is given; a per-cell form is
+            then derived from the batch form.
         feature_type: "phase" or "fluorescence"
+        batch_extractor: Optional callable that takes BatchExtractionContext
+            and returns an array with one value per label
 
     Raises:
-        ValueError: If feature_type is invalid or feature_name already registered
+        ValueError: If feature_type is invalid, feature_name already registered,
+            or neither extractor is given
     """
     if feature_type not in ("phase", "fluorescence"):
         raise ValueError(f"Invalid feature_type: {feature_type}")
 
+    if extractor is None and batch_extractor is None:
+        raise ValueError(
+            f"Feature '{feature_name}' needs an extractor or a batch extractor"
+        )
+
     if feature_name in FEATURE_EXTRACTORS:
         raise ValueError(
             f"Feature '{feature_name}' is already registered. "
             f"Plugin features must have unique names."
         )
 
+    try:
+        source = inspect.getsourcefile(extractor or batch_extractor)
+    except TypeError:
+        source = None
+    if source is not None:
+        PLUGIN_FEATURE_FILES[feature_name] = Path(source).resolve()
+
+    if extractor is None:
+        extractor = _per_cell_from_batch(batch_extractor)
+
     if feature_type == "phase":
         PHASE_FEATURES[feature_name] = extractor
     else:  # fluorescence
         FLUORESCENCE_FEATURES[feature_name] = extractor
 
-    # Update the unified lookup
+    # Update the unified lookups
     FEATURE_EXTRACTORS[feature_name] = extractor
+    if batch_extractor is not None:
+        BATCH_FEATURE_EXTRACTORS[feature_name] = batch_extractor
 
 
 __all__ = [
     "ExtractionContext",
+    "BatchExtractionContext",
     "FLUORESCENCE_FEATURES",
     "PHASE_FEATURES",
     "FEATURE_EXTRACTORS",
+    "BATCH_FEATURE_EXTRACTORS",
+    "PLUGIN_FEATURE_FILES",
     "list_features",
     "list_fluorescence_features",
     "list_phase_features",
     "get_feature_extractor",
+    "get_batch_feature_extractor",
+    "plugin_feature_dirs",
     "register_plugin_feature",
 ]
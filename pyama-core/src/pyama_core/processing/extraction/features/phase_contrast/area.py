@@ -2,7 +2,8 @@
 
 import numpy as np
 
-from pyama_core.types.processing import ExtractionContext
+from pyama_core.processing.extraction.label_index import build_label_index
+from pyama_core.types.processing import BatchExtractionContext, ExtractionContext
 
 
 def extract_area(ctx: ExtractionContext) -> np.int32:
@@ -17,3 +18,17 @@ def extract_area(ctx: ExtractionContext) -> np.int32:
     """
     mask = ctx.mask.astype(bool, copy=False)
     return np.sum(mask)
+
+
+def extract_area_batch(ctx: BatchExtractionContext) -> np.ndarray:
+    """
+    Extract area for all cells of a frame.
+
+    Args:
+        ctx: Batch extraction context containing the labeled frame
+
+    Returns:
+        Cell areas in pixels, one per entry of ``ctx.labels``
+    """
+    index = ctx.index if ctx.index is not None else build_label_index(ctx.labeled)
+    return index.areas[index.lookup(ctx.labels)]
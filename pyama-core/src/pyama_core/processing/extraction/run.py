@@ -2,272 +2,417 @@
 
 Pipeline:
 - Track cells across time using IoU-based tracking
-- Extract features for each cell in each frame
-- Filter traces by length and quality criteria
+- Select cells by trace length and border distance in a cheap pre-pass
+- Extract features for each selected cell in each frame
 
 This implementation follows the functional style used in other processing modules
 and is designed for performance with time-series datasets:
-- Processes stacks frame-by-frame to manage memory usage
-- Uses vectorized operations for feature extraction
+- Processes stacks frame-by-frame to manage memory usage, optionally with a
+  bounded thread pool over frames
+- Indexes each labeled frame once and reduces per label (no per-cell masks)
 - Provides progress callbacks for long-running operations
-- Filters traces to remove short-lived or low-quality cells
+- Skips short-lived and border cells before any feature is computed
 """
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import fields as dataclass_fields
-from typing import Callable, Any
+from typing import Callable
 
 import numpy as np
 import pandas as pd
 
 from pyama_core.processing.extraction.features import (
+    BatchExtractionContext,
     ExtractionContext,
+    get_batch_feature_extractor,
     get_feature_extractor,
     list_features,
 )
-from pyama_core.types.processing import (
-    FeatureResult,
-    Result,
-    ResultWithFeatures,
+from pyama_core.processing.extraction.label_index import (
+    LabelIndex,
+    build_label_index,
 )
+from pyama_core.types.processing import ExtractionChannel, Result
 
 
-def _extract_position_and_bbox(
-    ctx: ExtractionContext,
-) -> tuple[float, float, float, float, float, float]:
-    """Extract centroid position and bounding box for a single cell mask.
+def _base_columns(index: LabelIndex, frame: int, time: float) -> dict[str, np.ndarray]:
+    """Build the Result base columns for all cells of a frame.
 
     Parameters:
-    - ctx: Extraction context containing cell mask
+    - index: Label index of the frame
+    - frame: frame index
+    - time: time of the frame
 
     Returns:
-    - (position_x, position_y, bbox_x0, bbox_y0, bbox_x1, bbox_y1) coordinates, or (nan, nan, nan, nan, nan, nan) if empty mask
+    - Mapping of base column name to per-cell values
     """
-    # Fast bounding-box-based centroid approximation.
-    # Find rows and columns that contain mask pixels and compute the
-    # center of the bounding box. This avoids scanning all masked
-    # coordinates and is much faster for large masks.
-    mask = ctx.mask
-    row_inds = np.where(mask.any(axis=1))[0]
-    col_inds = np.where(mask.any(axis=0))[0]
-    if row_inds.size == 0 or col_inds.size == 0:
-        return (np.nan, np.nan, np.nan, np.nan, np.nan, np.nan)
+    n_cells = len(index)
     # Use bounding box center as position (x: columns, y: rows)
-    x0, x1 = col_inds[0], col_inds[-1]
-    y0, y1 = row_inds[0], row_inds[-1]
-    position_x = float((x0 + x1) / 2.0)
-    position_y = float((y0 + y1) / 2.0)
-    return (position_x, position_y, float(x0), float(y0), float(x1), float(y1))
+    y0, x0, y1, x1 = (index.bboxes[:, k].astype(float) for k in range(4))
+    return {
+        "cell": index.labels,
+        "frame": np.full(n_cells, frame, dtype=np.int64),
+        "time": np.full(n_cells, time, dtype=float),
+        "good": np.ones(n_cells, dtype=bool),
+        "position_x": (x0 + x1) / 2.0,
+        "position_y": (y0 + y1) / 2.0,
+        "bbox_x0": x0,
+        "bbox_y0": y0,
+        "bbox_x1": x1,
+        "bbox_y1": y1,
+    }
 
 
-def _extract_single_frame(
-    image: np.ndarray,
+def _feature_columns(
+    ctx: BatchExtractionContext, feature_names: list[str]
+) -> dict[str, np.ndarray]:
+    """Evaluate features for all cells of a frame.
+
+    Features with a batch extractor receive ``ctx`` and return one value per
+    label. Other features fall back to the per-cell extractor with a
+    full-frame mask.
+
+    Parameters:
+    - ctx: Batch context of the frame with ``index`` set
+    - feature_names: Feature names to extract
+
+    Returns:
+    - Mapping of feature name to per-cell values
+    """
+    index = ctx.index
+    n_cells = len(index)
+    columns: dict[str, np.ndarray] = {}
+    fallback: dict[str, Callable[[ExtractionContext], float]] = {}
+    for name in feature_names:
+        batch_extractor = get_batch_feature_extractor(name)
+        if batch_extractor is None:
+            fallback[name] = get_feature_extractor(name)
+            continue
+        values = np.asarray(batch_extractor(ctx), dtype=float)
+        if values.shape != (n_cells,):
+            raise ValueError(
+                f"Batch feature '{name}' returned shape {values.shape}, "
+                f"expected ({n_cells},)"
+            )
+        columns[name] = values
+
+    if fallback:
+        # Per-cell extractors expect a background array
+        background = ctx.background
+        if np.ndim(background) == 0:
+            background = np.full(ctx.image.shape, background, dtype=np.float32)
+        values = {name: np.empty(n_cells, dtype=float) for name in fallback}
+        for i in range(n_cells):
+            cell_ctx = ExtractionContext(
+                image=ctx.image,
+                mask=index.mask(i),
+                background=background,
+                background_weight=ctx.background_weight,
+                erosion_size=ctx.erosion_size,
+            )
+            for name, extractor in fallback.items():
+                values[name][i] = float(extractor(cell_ctx))
+        columns.update(values)
+
+    return columns
+
+
+def _extract_channels(
     seg_labeled: np.ndarray,
-    frame: int,
-    time: float,
-    background: np.ndarray,
-    feature_names: list[str] | None = None,
+    times: np.ndarray,
+    channels: list[ExtractionChannel],
+    progress_callback: Callable | None = None,
+    cancel_event=None,
     background_weight: float = 1.0,
     erosion_size: int = 0,
-) -> list[ResultWithFeatures]:
-    """Extract features for all cells in a single frame.
+    suffix_channels: bool = True,
+    labels: np.ndarray | None = None,
+    n_threads: int = 1,
+) -> pd.DataFrame:
+    """Walk the label stack once and evaluate every channel's features.
+
+    For each frame the labeled image is indexed once; base columns come from
+    that index and each channel's features are evaluated against it (the
+    eroded index is shared too). Per-frame column arrays are concatenated
+    once at the end into a single wide table.
 
     Parameters:
-    - image: 2D fluorescence image
-    - seg_labeled: 2D labeled image with cell IDs
-    - frame: frame index
-    - time: time of the frame
-    - background: 2D background image for correction (always provided)
-    - feature_names: Optional list of feature names to extract
+    - seg_labeled: 3D (T, H, W) labeled stack with tracked cell IDs
+    - times: 1D (T) time array
+    - channels: Image stacks and features to extract
+    - progress_callback: Optional callback for progress updates
+    - cancel_event: Optional threading.Event for cancellation support
     - background_weight: Weight for background subtraction (default: 1.0)
     - erosion_size: Number of pixels to erode the mask (default: 0, no erosion)
+    - suffix_channels: Name feature columns ``{feature}_ch_{channel}``
+      (default) instead of the bare feature name
+    - labels: Optional sorted labels to extract; other labels are skipped
+      and frames without any of them are not read from the channel stacks
+    - n_threads: Number of threads extracting frames in parallel (default: 1,
+      serial); output and progress order are the same either way
+
     Returns:
-    - List of ResultWithFeatures for all cells in the frame
+    - DataFrame with base columns followed by each channel's feature columns
     """
-    cells = np.unique(seg_labeled)
-    cells = cells[cells > 0]
-
-    # Prefetch extractors once per frame for efficiency
-    if feature_names is None:
-        feature_names = list_features()  # Use all features if not specified
-    extractors: dict[str, Callable[[ExtractionContext], float]] = {
-        name: get_feature_extractor(name) for name in feature_names
-    }
+    base_fields = [f.name for f in dataclass_fields(Result)]
 
-    results: list[ResultWithFeatures] = []
-    # Background is always provided as an array
-    
-    for c in cells:
-        mask = seg_labeled == c
-        
-        # Skip empty masks
-        if not mask.any():
-            continue
-        
-        ctx = ExtractionContext(
-            image=image, mask=mask, background=background, background_weight=background_weight, erosion_size=erosion_size
+    # (channel, feature names, column names) in output order
+    plan: list[tuple[ExtractionChannel, list[str], list[str]]] = []
+    col_names = list(base_fields)
+    for channel in channels:
+        names = (
+            list(channel.features)
+            if channel.features is not None
+            else list_features()  # Use all features if not specified
         )
-
-        features: FeatureResult = {}
-        for name, extractor in extractors.items():
-            features[name] = float(extractor(ctx))
-
-        position_x, position_y, bbox_x0, bbox_y0, bbox_x1, bbox_y1 = (
-            _extract_position_and_bbox(ctx)
+        cols = (
+            [f"{name}_ch_{channel.channel}" for name in names]
+            if suffix_channels
+            else names
         )
-        results.append(
-            ResultWithFeatures(
-                cell=int(c),
-                frame=int(frame),
-                time=float(time),
-                good=True,
-                position_x=position_x,
-                position_y=position_y,
-                bbox_x0=bbox_x0,
-                bbox_y0=bbox_y0,
-                bbox_x1=bbox_x1,
-                bbox_y1=bbox_y1,
-                features=features,
+        duplicates = set(cols) & set(col_names)
+        if duplicates:
+            raise ValueError(f"Duplicate feature columns: {sorted(duplicates)}")
+        col_names.extend(cols)
+        plan.append((channel, names, cols))
+
+    def _frame_columns(t: int) -> dict[str, np.ndarray]:
+        # Read and convert one frame at a time (stacks may be memmaps)
+        seg_frame = np.asarray(seg_labeled[t])
+        index = build_label_index(seg_frame)
+        if labels is not None:
+            index = index.select(np.isin(index.labels, labels, assume_unique=True))
+        frame_columns = _base_columns(index, t, float(times[t]))
+
+        eroded_index = None
+        for channel, names, cols in plan:
+            if not len(index):
+                for col in cols:
+                    frame_columns[col] = np.empty(0, dtype=float)
+                continue
+            background = channel.background
+            if background is None or np.ndim(background) == 0:
+                bg_frame = 0.0 if background is None else float(background)
+            else:
+                bg_frame = np.asarray(background[t], dtype=np.float32)
+            ctx = BatchExtractionContext(
+                image=np.asarray(channel.image[t], dtype=np.float32),
+                background=bg_frame,
+                labeled=seg_frame,
+                labels=index.labels,
+                background_weight=background_weight,
+                erosion_size=erosion_size,
+                index=index,
+                eroded_index=eroded_index,
             )
-        )
+            values = _feature_columns(ctx, names)
+            eroded_index = ctx.eroded_index
+            for name, col in zip(names, cols):
+                frame_columns[col] = values[name]
+        return frame_columns
+
+    T = seg_labeled.shape[0]
+    # Per-frame column arrays in frame order, concatenated once at the end
+    frames: list[dict[str, np.ndarray]] = []
+
+    def _cancelled(t: int) -> bool:
+        if cancel_event and cancel_event.is_set():
+            import logging
 
-    return results
+            logger = logging.getLogger(__name__)
+            logger.info("Feature extraction cancelled at frame %d", t)
+            return True
+        return False
+
+    if n_threads <= 1:
+        for t in range(T):
+            # Check for cancellation before processing each frame
+            if _cancelled(t):
+                return pd.DataFrame(columns=col_names)
+            frames.append(_frame_columns(t))
+            if progress_callback is not None:
+                progress_callback(t, T, "Extracting features")
+    else:
+        # Frames are independent and the NumPy/SciPy reductions release the
+        # GIL. At most 2 * n_threads frames are in flight to bound memory;
+        # results are collected (and progress reported) in frame order.
+        window = 2 * n_threads
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            pending: deque[Future] = deque()
+            next_frame = 0
+            while next_frame < T or pending:
+                # Check for cancellation before collecting each frame
+                t = len(frames)
+                if _cancelled(t):
+                    for future in pending:
+                        future.cancel()
+                    return pd.DataFrame(columns=col_names)
+                while next_frame < T and len(pending) < window:
+                    pending.append(executor.submit(_frame_columns, next_frame))
+                    next_frame += 1
+                frames.append(pending.popleft().result())
+                if progress_callback is not None:
+                    progress_callback(t, T, "Extracting features")
+
+    if T == 0:
+        return pd.DataFrame(columns=col_names)
+    df = pd.DataFrame(
+        {
+            name: np.concatenate([frame[name] for frame in frames])
+            for name in col_names
+        },
+        columns=col_names,
+    )
+    return df
 
 
 def _extract_all(
     image: np.ndarray,
     seg_labeled: np.ndarray,
     times: np.ndarray,
-    background: np.ndarray,
+    background: np.ndarray | float,
     progress_callback: Callable | None = None,
     feature_names: list[str] | None = None,
     cancel_event=None,
     background_weight: float = 1.0,
     erosion_size: int = 0,
+    labels: np.ndarray | None = None,
+    n_threads: int = 1,
 ) -> pd.DataFrame:
     """Build trace DataFrame from fluorescence and label stacks.
 
     Creates a flat DataFrame where each row corresponds to a
     (cell, time) observation, with columns derived from the
-    ResultWithFeatures dataclass plus feature columns.
+    Result dataclass plus feature columns.
 
     Parameters:
     - image: 3D (T, H, W) fluorescence stack
     - seg_labeled: 3D (T, H, W) labeled stack with tracked cell IDs
     - times: 1D (T) time array in seconds
-    - background: 3D (T, H, W) background stack for correction (always provided)
+    - background: 3D (T, H, W) background stack for correction, or a scalar
     - progress_callback: Optional callback for progress updates
     - feature_names: Optional list of feature names to extract
     - cancel_event: Optional threading.Event for cancellation support
     - background_weight: Weight for background subtraction (default: 1.0)
     - erosion_size: Number of pixels to erode the mask (default: 0, no erosion)
+    - labels: Optional sorted labels to extract (default: all labels)
+    - n_threads: Number of threads extracting frames in parallel (default: 1)
 
     Returns:
     - DataFrame with columns [cell, frame, time, exist, good, position_x,
       position_y, <feature columns>]
     """
-    # Build rows directly from the dataclass without a MultiIndex.
-    # Strategy: determine index fields first, then base fields, then features.
-    # This ensures the resulting DataFrame columns are ordered as the user requested.
-    base_fields = [f.name for f in dataclass_fields(Result)]
-    if feature_names is None:
-        feature_names = list_features()  # Use all features if not specified
-
-    T, H, W = image.shape
-    # Precompute column names in the requested ordering: index, base, features
-    col_names = base_fields + feature_names
-    cols: dict[str, list[Any]] = {name: [] for name in col_names}
-
-    for t in range(T):
-        # Check for cancellation before processing each frame
-        if cancel_event and cancel_event.is_set():
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.info("Feature extraction cancelled at frame %d", t)
-            return pd.DataFrame(columns=col_names)
-        # Background is always an array
-        bg_frame = background[t]
-        frame_result = _extract_single_frame(
-            image[t], seg_labeled[t], t, float(times[t]), bg_frame, feature_names, background_weight, erosion_size
-        )
-        if progress_callback is not None:
-            progress_callback(t, T, "Extracting features")
-
-        # Extend in the requested order to minimize peak memory
-        for name in base_fields:
-            cols[name].extend([getattr(res, name) for res in frame_result])
-        for fname in feature_names:
-            cols[fname].extend(
-                [res.features.get(fname, np.nan) for res in frame_result]
-            )
+    channel = ExtractionChannel(
+        channel=0, image=image, features=feature_names, background=background
+    )
+    return _extract_channels(
+        seg_labeled,
+        times,
+        [channel],
+        progress_callback=progress_callback,
+        cancel_event=cancel_event,
+        background_weight=background_weight,
+        erosion_size=erosion_size,
+        suffix_channels=False,
+        labels=labels,
+        n_threads=n_threads,
+    )
 
-    df = pd.DataFrame(cols, columns=col_names)
-    return df
 
+def _surviving_labels(
+    seg_labeled: np.ndarray,
+    min_length: int = 30,
+    border_width: int = 50,
+    cancel_event=None,
+) -> np.ndarray | None:
+    """Find the labels that pass the length and border filters.
 
-def _filter_by_length(df: pd.DataFrame, min_length: int = 30) -> pd.DataFrame:
-    """Filter traces by minimum number of existing frames.
+    A cheap pre-pass over the label stack: one ``bincount`` per frame gives
+    each label's lifetime (number of frames it exists in), and the labels
+    found in the border bands are the cells whose bounding box comes within
+    ``border_width`` pixels of an edge in some frame. No features are
+    computed, so extraction can then skip every label that would be dropped.
 
     Parameters:
-    - df: Trace DataFrame with cell column
+    - seg_labeled: 3D (T, H, W) labeled stack with tracked cell IDs
     - min_length: Minimum number of frames a cell must exist
+    - border_width: Cells with a bounding box edge closer than this many
+      pixels to the image border in any frame are removed
+    - cancel_event: Optional threading.Event for cancellation support
 
     Returns:
-    - Filtered DataFrame containing only cells with sufficient length
+    - Sorted array of surviving labels, or None if cancelled
     """
-    # Use groupby to count frames per cell, then filter
-    cell_counts = df.groupby("cell").size()
-    valid_cells = cell_counts.index[cell_counts >= min_length]
-    return df[df["cell"].isin(valid_cells)]
-
+    T, H, W = seg_labeled.shape
+    lifetimes = np.zeros(1, dtype=np.int64)
+    border = np.zeros(1, dtype=bool)
 
-def _filter_by_border(
-    df: pd.DataFrame, width: int, height: int, border_width: int = 50
-) -> pd.DataFrame:
-    """Filter out cells that are too close to the border.
-
-    A cell is removed if any part of its mask is within ``border_width`` pixels of the
-    image border in any frame. This uses the bounding box of the mask rather than
-    just the centroid position.
-    """
-    # Get all cells that are ever too close to the border
-    # Check if the bounding box extends within border_width of any edge
-    border_cells = df[
-        (df["bbox_x0"] < border_width)  # Left edge too close
-        | (df["bbox_x1"] > width - border_width)  # Right edge too close
-        | (df["bbox_y0"] < border_width)  # Top edge too close
-        | (df["bbox_y1"] > height - border_width)  # Bottom edge too close
-    ]["cell"].unique()
+    # Inclusive bbox edges: x0 < border_width or x1 > W - border_width
+    low = max(border_width, 0)
+    high_x = max(W - border_width + 1, 0)
+    high_y = max(H - border_width + 1, 0)
 
-    # Return a dataframe where these cells are removed
-    return df[~df["cell"].isin(border_cells)]
+    for t in range(T):
+        if cancel_event and cancel_event.is_set():
+            return None
+        frame = np.asarray(seg_labeled[t])
+        counts = np.bincount(frame.reshape(-1))
+        if counts.size > lifetimes.size:
+            lifetimes = np.pad(lifetimes, (0, counts.size - lifetimes.size))
+            border = np.pad(border, (0, counts.size - border.size))
+        lifetimes[: counts.size] += counts > 0
+        if border_width > 0:
+            for band in (
+                frame[:, :low],
+                frame[:, high_x:],
+                frame[:low, :],
+                frame[high_y:, :],
+            ):
+                border[band.reshape(-1)] = True
+
+    keep = (lifetimes >= min_length) & ~border
+    keep[0] = False
+    return np.flatnonzero(keep)
 
 
 def extract_trace(
     image: np.ndarray,
     seg_labeled: np.ndarray,
     times: np.ndarray,
-    background: np.ndarray,
+    background: np.ndarray | float | None = None,
     progress_callback: Callable | None = None,
     features: list[str] | None = None,
     cancel_event=None,
     background_weight: float = 1.0,
     erosion_size: int = 0,
+    min_length: int = 30,
+    border_width: int = 50,
+    n_threads: int = 1,
 ) -> pd.DataFrame:
     """Extract and filter cell traces from microscopy time-series.
 
     This is the main public function that orchestrates the complete
     trace extraction pipeline:
     - Perform IoU-based cell tracking on binary masks
-    - Extract features for each cell in each frame
-    - Filter traces by length and quality criteria
+    - Select cells by trace length and distance to the border
+    - Extract features for each selected cell in each frame
     - Return cleaned DataFrame with only high-quality traces
 
+    The length and border filters run as a cheap pre-pass over the label
+    stack (``_surviving_labels``), so features are never computed for
+    short-lived or border cells.
+
+    Stacks are read and converted to float32 one frame at a time, so
+    memory-mapped inputs are never copied as a whole.
+
     Parameters:
     - image: 3D (T, H, W) fluorescence image stack
     - seg_labeled: 3D (T, H, W) labeled segmentation stack
     - times: 1D (T) time array in seconds
-    - background: 3D (T, H, W) background stack for correction (always required)
+    - background: 3D (T, H, W) background stack for correction, or None / a
+      scalar when no background is available (treated as a constant, no
+      full-stack zeros are needed)
     - progress_callback: Optional function(frame, total, message) for progress
     - features: Optional list of feature names to extract
     - cancel_event: Optional threading.Event for cancellation support
@@ -275,6 +420,12 @@ def extract_trace(
     - erosion_size: Number of pixels to erode the segmentation mask before
       feature extraction (default: 0, no erosion). This helps exclude edge
       pixels that may not belong to the cell when computing intensity sums.
+    - min_length: Minimum number of frames a cell must exist (default: 30)
+    - border_width: Cells coming closer than this many pixels to the image
+      border in any frame are removed (default: 50)
+    - n_threads: Number of threads extracting frames in parallel (default: 1,
+      serial). Cancellation and progress callbacks work the same in both
+      modes; progress is reported in frame order
 
     Returns:
     - Filtered flat DataFrame containing frame, position coordinates and
@@ -292,26 +443,107 @@ def extract_trace(
     if image.shape[0] != times.shape[0]:
         raise ValueError("image and time must have the same length")
 
-    if background.ndim != 3:
-        raise ValueError("background must be 3D array")
-    
-    if background.shape != image.shape:
-        raise ValueError("background must have the same shape as image")
+    if background is None:
+        background = 0.0
+    elif np.ndim(background) == 0:
+        background = float(background)
+    else:
+        if background.ndim != 3:
+            raise ValueError("background must be 3D array or a scalar")
 
-    image = image.astype(np.float32, copy=False)
-    background = background.astype(np.float32, copy=False)
-    seg_labeled = seg_labeled.astype(np.uint16, copy=False)
-    times = times.astype(float, copy=False)
+        if background.shape != image.shape:
+            raise ValueError("background must have the same shape as image")
 
-    T, H, W = image.shape
+    times = times.astype(float, copy=False)
 
-    # Perform tracking then build raw traces
+    # Select surviving cells, then build their traces
+    labels = _surviving_labels(seg_labeled, min_length, border_width, cancel_event)
     df = _extract_all(
-        image, seg_labeled, times, background, progress_callback, features, cancel_event, background_weight, erosion_size
+        image, seg_labeled, times, background, progress_callback, features, cancel_event, background_weight, erosion_size, labels, n_threads
     )
 
-    # Apply filtering and cleanup
-    df = _filter_by_length(df)
-    df = _filter_by_border(df, W, H)
+    return df
+
+
+def extract_traces(
+    seg_labeled: np.ndarray,
+    times: np.ndarray,
+    channels: list[ExtractionChannel],
+    progress_callback: Callable | None = None,
+    cancel_event=None,
+    background_weight: float = 1.0,
+    erosion_size: int = 0,
+    min_length: int = 30,
+    border_width: int = 50,
+    n_threads: int = 1,
+) -> pd.DataFrame:
+    """Extract and filter cell traces for several channels in one pass.
+
+    Equivalent to calling ``extract_trace`` per channel, renaming feature
+    columns to ``{feature}_ch_{channel}`` and joining on the base columns,
+    but the label stack is walked once: each frame is indexed once and all
+    channels' features are evaluated against the shared index. The wide
+    table is assembled directly from per-frame column arrays.
+
+    Parameters:
+    - seg_labeled: 3D (T, H, W) labeled segmentation stack
+    - times: 1D (T) time array
+    - channels: Image stacks (and optional backgrounds) with the features to
+      extract from each; stacks may be memory-mapped
+    - progress_callback: Optional function(frame, total, message) for progress
+    - cancel_event: Optional threading.Event for cancellation support
+    - background_weight: Weight for background subtraction (default: 1.0)
+    - erosion_size: Number of pixels to erode the segmentation mask before
+      intensity features (default: 0, no erosion)
+    - min_length: Minimum number of frames a cell must exist (default: 30)
+    - border_width: Cells coming closer than this many pixels to the image
+      border in any frame are removed (default: 50)
+    - n_threads: Number of threads extracting frames in parallel (default: 1,
+      serial). Cancellation and progress callbacks work the same in both
+      modes; progress is reported in frame order
+
+    Returns:
+    - Filtered wide DataFrame with base columns and ``{feature}_ch_{channel}``
+      columns for every channel
+
+    Raises:
+    - ValueError: If stack shapes do not match or feature columns collide
+    """
+    if seg_labeled.ndim != 3:
+        raise ValueError("seg_labeled must be a 3D array")
+
+    if times.ndim != 1:
+        raise ValueError("time must be 1D array")
+
+    if seg_labeled.shape[0] != times.shape[0]:
+        raise ValueError("seg_labeled and time must have the same length")
+
+    for channel in channels:
+        if channel.image.shape != seg_labeled.shape:
+            raise ValueError(
+                f"Channel {channel.channel} image must have the same shape as seg_labeled"
+            )
+        background = channel.background
+        if background is not None and np.ndim(background) != 0:
+            if background.shape != seg_labeled.shape:
+                raise ValueError(
+                    f"Channel {channel.channel} background must have the same shape as seg_labeled"
+                )
+
+    times = times.astype(float, copy=False)
+
+    # Only cells that pass the length and border filters are extracted
+    labels = _surviving_labels(seg_labeled, min_length, border_width, cancel_event)
+    df = _extract_channels(
+        seg_labeled,
+        times,
+        channels,
+        progress_callback=progress_callback,
+        cancel_event=cancel_event,
+        background_weight=background_weight,
+        erosion_size=erosion_size,
+        labels=labels,
+        n_threads=n_threads,
+    )
 
     return df
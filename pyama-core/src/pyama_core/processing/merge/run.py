@@ -10,7 +10,8 @@ from typing import Any, Callable, Iterable
 import pandas as pd
 import yaml
 
-from pyama_core.io.processing_csv import get_dataframe
+from pyama_core.io.analysis_csv import write_tidy_table
+from pyama_core.io.processing_csv import get_dataframe, trace_file_suffix
 from pyama_core.io.results_yaml import (
     get_time_units_from_yaml,
     get_trace_csv_path_from_yaml,
@@ -241,7 +242,8 @@ def write_feature_csv(
     """Write a feature CSV in tidy/long format.
 
     Output format: time, fov, cell, value
-    Only includes FOVs and cells that have data available.
+    Only includes FOVs and cells that have data available. A ``.parquet`` or
+    ``.feather`` ``out_path`` writes the same table in binary form.
     """
     fov_list = list(fovs)
 
@@ -271,14 +273,7 @@ def write_feature_csv(
                     })
 
     df = pd.DataFrame(rows)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if time_units:
-        with out_path.open("w", encoding="utf-8") as handle:
-            handle.write(f"# Time units: {time_units}\n")
-            df.to_csv(handle, index=False, float_format="%.6f")
-    else:
-        df.to_csv(out_path, index=False, float_format="%.6f")
+    write_tidy_table(df, out_path, time_units)
 
 
 # =============================================================================
@@ -291,6 +286,7 @@ def run_merge(
     processing_results: Path,
     output_dir: Path,
     progress_callback: Callable[[int, int, str], None] | None = None,
+    output_format: str = "csv",
 ) -> str:
     """Execute merge logic - return success message or raise error.
     
@@ -299,7 +295,11 @@ def run_merge(
         processing_results: Path to processing_results.yaml
         output_dir: Directory to write merged CSV files
         progress_callback: Optional callback(current, total, message) for progress updates
+        output_format: Format of the merged files: "csv" (default), "parquet"
+            or "feather". Trace inputs are read in whatever format they were
+            written in.
     """
+    output_suffix = trace_file_suffix(output_format)
     config = read_samples_yaml(sample_yaml)
     samples = config["samples"]
 
@@ -316,7 +316,7 @@ def run_merge(
         all_fovs.update(fovs)
 
     feature_maps_by_fov_channel: dict[tuple[int, int], FeatureMaps] = {}
-    traces_cache: dict[Path, pd.DataFrame] = {}
+    traces_cache: dict[tuple[Path, int], pd.DataFrame] = {}
 
     # Load trace CSVs per FOV (unified schema: one CSV per FOV, not per channel)
     sorted_fovs = sorted(all_fovs)
@@ -340,10 +340,12 @@ def run_merge(
             logger.warning("Trace CSV file does not exist: %s", csv_path)
             continue
 
-        # Load the unified CSV once per FOV
-        if csv_path not in traces_cache:
+        # Load the unified CSV once per FOV (combined Parquet files hold one
+        # row group per FOV, only that one is read)
+        cache_key = (csv_path, fov)
+        if cache_key not in traces_cache:
             try:
-                traces_cache[csv_path] = get_dataframe(csv_path)
+                traces_cache[cache_key] = get_dataframe(csv_path, fov=fov)
                 loaded_fovs += 1
                 if progress_callback is not None:
                     progress_callback(loaded_fovs, total_fovs, "Loading FOV CSVs")
@@ -354,7 +356,7 @@ def run_merge(
         # Extract channel-specific data from the unified CSV using configured features
         for channel, features in channel_feature_config:
             channel_df = extract_channel_dataframe(
-                traces_cache[csv_path], channel, features
+                traces_cache[cache_key], channel, features
             )
             if channel_df.empty:
                 logger.debug(
@@ -407,7 +409,9 @@ def run_merge(
                     )
                     continue
 
-                output_filename = f"{sample_name}_{feature_name}_ch_{channel}.csv"
+                output_filename = (
+                    f"{sample_name}_{feature_name}_ch_{channel}{output_suffix}"
+                )
                 output_path = output_dir / output_filename
                 write_feature_csv(
                     output_path,
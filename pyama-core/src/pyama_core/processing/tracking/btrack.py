@@ -19,17 +19,73 @@ logger = logging.getLogger(__name__)
 try:
     from btrack import BayesianTracker
     from btrack.io import segmentation_to_objects
-    from btrack.utils import update_segmentation
     from btrack import constants
     BTRACK_AVAILABLE = True
 except ImportError:
     BTRACK_AVAILABLE = False
     BayesianTracker = None
     segmentation_to_objects = None
-    update_segmentation = None
     constants = None
 
 
+def _filter_labels_by_size(
+    frame_labeled: np.ndarray, min_size: int | None, max_size: int | None
+) -> np.ndarray:
+    """Drop regions outside the size range and relabel survivors ``1..n``.
+
+    Areas come from a single ``bincount``; the relabel is one lookup-table
+    gather instead of a boolean mask per region.
+    """
+    areas = np.bincount(frame_labeled.ravel())
+    keep = areas > 0
+    keep[0] = False
+    if min_size is not None:
+        keep &= areas >= min_size
+    if max_size is not None:
+        keep &= areas <= max_size
+    lut = np.zeros(len(areas), dtype=np.int64)
+    lut[keep] = np.arange(1, int(keep.sum()) + 1)
+    return lut[frame_labeled]
+
+
+def _write_tracks(labeled_segmentation: np.ndarray, tracks, out: np.ndarray) -> None:
+    """Relabel segmentation objects with their track IDs directly into ``out``.
+
+    Equivalent to ``btrack.utils.update_segmentation(..., color_by="ID")``:
+    each non-dummy track observation maps the label under its (truncated)
+    centroid to the track ID. Observations are grouped by frame once, and
+    each frame is written with a single ``lut[labels]`` gather instead of
+    building a second full stack.
+    """
+    t_list, y_list, x_list, id_list = [], [], [], []
+    for track in tracks:
+        real = ~np.asarray(track.dummy, dtype=bool)
+        t_list.append(np.asarray(track.t, dtype=np.int64)[real])
+        y_list.append(np.asarray(track.y, dtype=np.float32)[real].astype(np.int64))
+        x_list.append(np.asarray(track.x, dtype=np.float32)[real].astype(np.int64))
+        id_list.append(np.full(int(real.sum()), track.ID, dtype=np.int64))
+
+    out[...] = 0
+    if not t_list:
+        return
+    ts = np.concatenate(t_list)
+    ys = np.concatenate(y_list)
+    xs = np.concatenate(x_list)
+    ids = np.concatenate(id_list)
+
+    order = np.argsort(ts, kind="stable")
+    ts, ys, xs, ids = ts[order], ys[order], xs[order], ids[order]
+    frames, starts = np.unique(ts, return_index=True)
+    stops = np.append(starts[1:], len(ts))
+    for t, start, stop in zip(frames.tolist(), starts.tolist(), stops.tolist()):
+        seg_t = labeled_segmentation[t]
+        old_ids = seg_t[ys[start:stop], xs[start:stop]]
+        lut = np.zeros(int(seg_t.max()) + 1, dtype=out.dtype)
+        lut[old_ids] = ids[start:stop]
+        lut[0] = 0
+        out[t] = lut[seg_t]
+
+
 def track_cell(
     image: np.ndarray,
     out: np.ndarray,
@@ -109,25 +165,9 @@ def track_cell(
 
         # Filter by size if specified
         if min_size is not None or max_size is not None:
-            from skimage.measure import regionprops
-
-            props = regionprops(frame_labeled)
-            filtered_frame = np.zeros_like(frame_labeled)
-            current_label = 1
-
-            for prop in props:
-                area = prop.area
-                if min_size is not None and area < min_size:
-                    continue
-                if max_size is not None and area > max_size:
-                    continue
-
-                # Keep this region, relabel it
-                mask = frame_labeled == prop.label
-                filtered_frame[mask] = current_label
-                current_label += 1
-
-            labeled_segmentation[t] = filtered_frame
+            labeled_segmentation[t] = _filter_labels_by_size(
+                frame_labeled, min_size, max_size
+            )
         else:
             labeled_segmentation[t] = frame_labeled
 
@@ -195,15 +235,7 @@ def track_cell(
     tracks = tracker.tracks
     logger.info("Found %d tracks", len(tracks))
 
-    # Map tracks back to segmentation
-    # update_segmentation expects T(Z)YX format and returns relabeled segmentation
-    tracked_segmentation = update_segmentation(
-        labeled_segmentation,
-        tracks,
-        color_by="ID",
-    )
-
-    # Copy results to output array
-    out[...] = tracked_segmentation
+    # Map tracks back to segmentation, writing each frame into ``out``
+    _write_tracks(labeled_segmentation, tracks, out)
 
     logger.info("Bayesian tracking completed")
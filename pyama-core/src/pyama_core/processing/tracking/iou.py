@@ -4,16 +4,27 @@ This module extracts connected components per frame, builds a cost matrix
 from bounding-box IoU between consecutive frames, solves an optimal one-to-one
 assignment, and writes consistent cell IDs into a labeled ``(T, H, W)`` stack.
 
+Candidate pairs are gated with a uniform spatial grid so that IoU is only
+evaluated (vectorized) for boxes that can overlap; regions whose boxes do
+not overlap are never matched, so ``min_iou`` must be positive.
+
 The public entrypoint is ``track_cell`` which operates in-place on the
-preallocated output array.
+preallocated output array. In streaming mode the tracker state can be
+checkpointed periodically so that an interrupted run resumes from the last
+completed frame.
 """
 
+import os
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Callable
 
 import numpy as np
-from skimage.measure import label, regionprops
+from skimage.measure import label
+from scipy.ndimage import find_objects
 from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 from pyama_core.types.processing import Region
 
@@ -28,69 +39,268 @@ class IterationState:
     """State carried across frame-to-frame assignment iterations.
 
     Attributes:
-        traces: List of per-cell traces storing ``frame -> label`` mappings.
+        traces: List of per-cell traces storing ``frame -> label`` mappings,
+            or ``None`` when traces are not recorded (streaming mode).
         prev_map: Mapping from region label in previous frame to trace index.
         prev_regions: Regions from the previous frame indexed by label.
+        prev_labeled: Label image of the previous frame; only kept for
+            mask IoU.
     """
 
-    traces: list[Trace]
+    traces: list[Trace] | None
     prev_map: TraceMap
     prev_regions: LabeledRegions
+    prev_labeled: np.ndarray | None = None
+
 
+def _regions_from_labeled(labeled: np.ndarray) -> LabeledRegions:
+    """Summarize a labeled frame into bbox and area regions.
 
-def _extract_regions(frame: np.ndarray) -> LabeledRegions:
-    """Extract connected components from a 2D binary frame.
+    No pixel coordinates are kept, so the result stays small regardless
+    of region sizes.
 
     Args:
-        frame: 2D boolean array ``(H, W)``; nonzero values indicate foreground.
+        labeled: 2D integer label image ``(H, W)``; ``0`` is background.
 
     Returns:
-        Mapping ``label -> Region`` with area, bbox and pixel coordinates.
+        Mapping ``label -> Region`` with area and bbox; ``coords`` is ``None``.
     """
-    labeled = label(frame, connectivity=1)
+    areas = np.bincount(labeled.ravel())
     regions = {}
-    for p in regionprops(labeled):
-        regions[p.label] = Region(
-            area=int(p.area),
-            bbox=(int(p.bbox[0]), int(p.bbox[1]), int(p.bbox[2]), int(p.bbox[3])),
-            coords=p.coords,
+    for idx, sl in enumerate(find_objects(labeled)):
+        if sl is None:
+            continue
+        lbl = idx + 1
+        regions[lbl] = Region(
+            area=int(areas[lbl]),
+            bbox=(int(sl[0].start), int(sl[1].start), int(sl[0].stop), int(sl[1].stop)),
+            coords=None,
         )
     return regions
 
 
-def _iou_from_bboxes(
-    a: tuple[int, int, int, int], b: tuple[int, int, int, int]
-) -> float:
-    """Compute IoU for two bounding boxes.
+def _bbox_array(regions: list[Region]) -> np.ndarray:
+    """Stack region bounding boxes into an ``(n, 4)`` integer array.
+
+    Args:
+        regions: Regions in matching order.
+
+    Returns:
+        Array of ``(y0, x0, y1, x1)`` rows with exclusive end indices.
+    """
+    if not regions:
+        return np.empty((0, 4), dtype=np.int64)
+    return np.array([r.bbox for r in regions], dtype=np.int64)
+
+
+def _grid_cells(
+    boxes: np.ndarray, cell_size: int, n_cols: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Enumerate the uniform-grid cells covered by each bounding box.
+
+    Args:
+        boxes: ``(n, 4)`` bbox array ``(y0, x0, y1, x1)``.
+        cell_size: Edge length of a square grid cell in pixels.
+        n_cols: Number of grid columns used to build flat cell keys.
+
+    Returns:
+        Tuple ``(owner, key)`` of equal-length arrays where ``owner`` is the
+        row index into ``boxes`` and ``key`` is the flat grid-cell id.
+    """
+    cy0 = boxes[:, 0] // cell_size
+    cx0 = boxes[:, 1] // cell_size
+    cy1 = (boxes[:, 2] - 1) // cell_size
+    cx1 = (boxes[:, 3] - 1) // cell_size
+    ny = cy1 - cy0 + 1
+    nx = cx1 - cx0 + 1
+    counts = ny * nx
+
+    owner = np.repeat(np.arange(len(boxes)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cy = cy0[owner] + local // nx[owner]
+    cx = cx0[owner] + local % nx[owner]
+    return owner, cy * n_cols + cx
+
+
+def _candidate_pairs(
+    prev_boxes: np.ndarray, curr_boxes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find all previous/current bbox pairs that overlap.
+
+    Boxes are binned into a uniform grid whose cell size follows the median
+    box extent; only boxes sharing a grid cell are compared. Each overlapping
+    pair is reported once, from the cell holding the top-left corner of the
+    intersection.
+
+    Args:
+        prev_boxes: ``(n_prev, 4)`` bbox array for the previous frame.
+        curr_boxes: ``(n_curr, 4)`` bbox array for the current frame.
+
+    Returns:
+        Tuple ``(rows, cols)`` of index arrays into ``prev_boxes`` and
+        ``curr_boxes`` for pairs with a non-empty intersection.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(prev_boxes) == 0 or len(curr_boxes) == 0:
+        return empty, empty
+
+    both = np.concatenate([prev_boxes, curr_boxes])
+    extents = np.maximum(both[:, 2] - both[:, 0], both[:, 3] - both[:, 1])
+    cell_size = max(int(np.median(extents)), 1)
+    n_cols = int(both[:, 3].max()) // cell_size + 1
+
+    p_owner, p_key = _grid_cells(prev_boxes, cell_size, n_cols)
+    c_owner, c_key = _grid_cells(curr_boxes, cell_size, n_cols)
+
+    # Sort-merge join of grid cells
+    order = np.argsort(c_key, kind="stable")
+    c_key = c_key[order]
+    c_owner = c_owner[order]
+    lo = np.searchsorted(c_key, p_key, side="left")
+    hi = np.searchsorted(c_key, p_key, side="right")
+    counts = hi - lo
+    if counts.sum() == 0:
+        return empty, empty
+
+    rows = np.repeat(p_owner, counts)
+    keys = np.repeat(p_key, counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cols = c_owner[np.repeat(lo, counts) + offsets]
+
+    a = prev_boxes[rows]
+    b = curr_boxes[cols]
+    iy0 = np.maximum(a[:, 0], b[:, 0])
+    ix0 = np.maximum(a[:, 1], b[:, 1])
+    overlap = (iy0 < np.minimum(a[:, 2], b[:, 2])) & (
+        ix0 < np.minimum(a[:, 3], b[:, 3])
+    )
+    # Keep each pair only in the cell that owns its intersection corner
+    owner_cell = (iy0 // cell_size) * n_cols + ix0 // cell_size
+    keep = overlap & (owner_cell == keys)
+    return rows[keep], cols[keep]
+
+
+def _iou_from_bboxes(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Compute row-wise IoU for paired bounding boxes.
 
     Args:
-        a: Bounding box ``(y0, x0, y1, x1)`` with exclusive end indices.
-        b: Bounding box ``(y0, x0, y1, x1)`` with exclusive end indices.
+        a: ``(k, 4)`` bbox array ``(y0, x0, y1, x1)`` with exclusive ends.
+        b: ``(k, 4)`` bbox array paired row-by-row with ``a``.
+
+    Returns:
+        Float array of shape ``(k,)`` with IoU values in ``[0.0, 1.0]``.
+        Pairs without overlap or with zero union yield ``0.0``.
+    """
+    inter_h = np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0])
+    inter_w = np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1])
+    inter = np.clip(inter_h, 0, None) * np.clip(inter_w, 0, None)
+
+    a_area = np.clip((a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1]), 0, None)
+    b_area = np.clip((b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]), 0, None)
+    union = a_area + b_area - inter
+
+    iou = np.zeros(len(inter), dtype=float)
+    nonzero = union > 0
+    iou[nonzero] = inter[nonzero] / union[nonzero]
+    return iou
+
+
+def _candidate_costs(
+    prev_regions: list[Region],
+    curr_regions: list[Region],
+    min_iou: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute IoU for gated candidate pairs that meet ``min_iou``.
+
+    Only pairs whose boxes overlap are candidates, so zero-IoU pairs are
+    never returned, even for ``min_iou <= 0``.
+
+    Args:
+        prev_regions: Regions from the previous frame in matching order.
+        curr_regions: Regions from the current frame in matching order.
+        min_iou: Minimum IoU to consider a pair as a valid candidate.
 
     Returns:
-        Intersection-over-Union value in ``[0.0, 1.0]``. Returns ``0.0`` when
-        boxes do not overlap or union is zero.
+        Tuple ``(rows, cols, iou)`` listing valid pairs as indices into
+        ``prev_regions`` and ``curr_regions`` with their IoU values.
     """
-    ay0, ax0, ay1, ax1 = a
-    by0, bx0, by1, bx1 = b
+    prev_boxes = _bbox_array(prev_regions)
+    curr_boxes = _bbox_array(curr_regions)
+    rows, cols = _candidate_pairs(prev_boxes, curr_boxes)
+    iou = _iou_from_bboxes(prev_boxes[rows], curr_boxes[cols])
 
-    inter_y0 = max(ay0, by0)
-    inter_x0 = max(ax0, bx0)
-    inter_y1 = min(ay1, by1)
-    inter_x1 = min(ax1, bx1)
+    keep = iou >= min_iou
+    return rows[keep], cols[keep], iou[keep]
 
-    inter_h = inter_y1 - inter_y0
-    inter_w = inter_x1 - inter_x0
-    if inter_h <= 0 or inter_w <= 0:
-        return 0.0
-    inter_area = int(inter_h) * int(inter_w)
 
-    a_area = max(0, (ay1 - ay0) * (ax1 - ax0))
-    b_area = max(0, (by1 - by0) * (bx1 - bx0))
-    union = a_area + b_area - inter_area
-    if union <= 0:
-        return 0.0
-    return float(inter_area) / float(union)
+def _mask_candidate_costs(
+    prev_labeled: np.ndarray,
+    curr_labeled: np.ndarray,
+    prev_labels: list[int],
+    curr_labels: list[int],
+    prev_regions: list[Region],
+    curr_regions: list[Region],
+    min_iou: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute exact mask IoU for all overlapping label pairs in one pass.
+
+    Pixel intersections come from a histogram of ``prev * n_curr + curr``
+    region indices over pixels that are foreground in both frames
+    (``np.bincount`` when the pair table is small, ``np.unique`` otherwise).
+
+    Args:
+        prev_labeled: 2D label image of the previous frame.
+        curr_labeled: 2D label image of the current frame.
+        prev_labels: Ordered labels corresponding to ``prev_regions``.
+        curr_labels: Ordered labels corresponding to ``curr_regions``.
+        prev_regions: Regions from the previous frame in matching order.
+        curr_regions: Regions from the current frame in matching order.
+        min_iou: Minimum IoU to consider a pair as a valid candidate.
+
+    Returns:
+        Tuple ``(rows, cols, iou)`` listing valid pairs as indices into
+        ``prev_regions`` and ``curr_regions`` with their mask IoU values.
+    """
+    n_prev = len(prev_labels)
+    n_curr = len(curr_labels)
+
+    # Map frame labels to matching-order indices; untracked labels -> -1
+    prev_index = np.full(int(prev_labeled.max()) + 1, -1, dtype=np.int64)
+    prev_index[np.asarray(prev_labels, dtype=np.int64)] = np.arange(n_prev)
+    curr_index = np.full(int(curr_labeled.max()) + 1, -1, dtype=np.int64)
+    curr_index[np.asarray(curr_labels, dtype=np.int64)] = np.arange(n_curr)
+
+    overlap = (prev_labeled > 0) & (curr_labeled > 0)
+    p = prev_index[prev_labeled[overlap]]
+    c = curr_index[curr_labeled[overlap]]
+    both = (p >= 0) & (c >= 0)
+    pair = p[both] * n_curr + c[both]
+
+    if n_prev * n_curr <= 4 * pair.size:
+        counts = np.bincount(pair, minlength=n_prev * n_curr)
+        pair_ids = np.flatnonzero(counts)
+        inter = counts[pair_ids]
+    else:
+        pair_ids, inter = np.unique(pair, return_counts=True)
+    rows, cols = np.divmod(pair_ids, n_curr)
+
+    prev_area = np.array([r.area for r in prev_regions], dtype=np.int64)
+    curr_area = np.array([r.area for r in curr_regions], dtype=np.int64)
+    iou = inter / (prev_area[rows] + curr_area[cols] - inter)
+
+    keep = iou >= min_iou
+    return rows[keep], cols[keep], iou[keep]
+
+
+def _dense_cost(
+    rows: np.ndarray, cols: np.ndarray, iou: np.ndarray, n_prev: int, n_curr: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Scatter candidate pairs into dense ``(cost, valid)`` matrices."""
+    cost = np.ones((n_prev, n_curr), dtype=float)  # default high cost
+    valid = np.zeros((n_prev, n_curr), dtype=bool)
+    cost[rows, cols] = 1.0 - iou
+    valid[rows, cols] = True
+    return cost, valid
 
 
 def _build_cost_matrix(
@@ -100,6 +310,9 @@ def _build_cost_matrix(
 ) -> tuple[np.ndarray, np.ndarray]:
     """Create cost and validity masks for previous vs. current regions.
 
+    Only pairs with overlapping bounding boxes are evaluated; all other pairs
+    keep the default cost.
+
     Args:
         prev_regions: Regions from the previous frame in matching order.
         curr_regions: Regions from the current frame in matching order.
@@ -110,7 +323,7 @@ def _build_cost_matrix(
         - ``cost`` is a float array shaped ``(len(prev), len(curr))`` with
           values ``1 - IoU`` for valid pairs and ``1.0`` otherwise.
         - ``valid`` is a boolean mask of the same shape indicating candidate
-          pairs that meet ``min_iou``.
+          pairs that overlap and meet ``min_iou``.
     """
     n_prev = len(prev_regions)
     n_curr = len(curr_regions)
@@ -119,19 +332,69 @@ def _build_cost_matrix(
             (n_prev, n_curr), dtype=bool
         )
 
-    cost = np.ones((n_prev, n_curr), dtype=float)  # default high cost
-    valid = np.zeros((n_prev, n_curr), dtype=bool)
+    # Gate by spatial grid first, then compute bbox-only IoU for nearby pairs
+    rows, cols, iou = _candidate_costs(prev_regions, curr_regions, min_iou)
+    return _dense_cost(rows, cols, iou, n_prev, n_curr)
 
-    # Gate by bbox overlap first to prune pairs, then compute bbox-only IoU
-    for i, pr in enumerate(prev_regions):
-        for j, cr in enumerate(curr_regions):
-            # Use bbox-only IoU instead of expensive index intersection
-            iou = _iou_from_bboxes(pr.bbox, cr.bbox)
-            if iou >= min_iou:
-                cost[i, j] = 1.0 - iou
-                valid[i, j] = True
 
-    return cost, valid
+def _solve_sparse_assignment(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    cost: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Solve the assignment over candidate pairs only.
+
+    The dense problem (invalid pairs at cost ``1.0``) maximizes the summed IoU
+    of valid matches, which decomposes over connected components of the
+    bipartite candidate graph. Components with a single edge are accepted
+    directly; larger components are solved with ``linear_sum_assignment`` on
+    their small dense sub-matrix.
+
+    Args:
+        rows: Previous-frame indices of candidate pairs.
+        cols: Current-frame indices of candidate pairs.
+        cost: Cost ``1 - IoU`` per candidate pair.
+
+    Returns:
+        Tuple ``(row_ind, col_ind)`` of matched valid pairs.
+    """
+    if rows.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    # Compact node ids to the regions that take part in any candidate pair
+    prev_nodes, prev_local = np.unique(rows, return_inverse=True)
+    curr_nodes, curr_local = np.unique(cols, return_inverse=True)
+    n_nodes = len(prev_nodes) + len(curr_nodes)
+    graph = coo_matrix(
+        (np.ones(rows.size), (prev_local, curr_local + len(prev_nodes))),
+        shape=(n_nodes, n_nodes),
+    )
+    _, labels = connected_components(graph, directed=False)
+    edge_comp = labels[prev_local]
+
+    edges_per_comp = np.bincount(edge_comp)
+    single = edges_per_comp[edge_comp] == 1
+    row_parts = [rows[single]]
+    col_parts = [cols[single]]
+
+    multi = np.flatnonzero(~single)
+    if multi.size:
+        order = multi[np.argsort(edge_comp[multi], kind="stable")]
+        bounds = np.flatnonzero(np.diff(edge_comp[order])) + 1
+        for edges in np.split(order, bounds):
+            sub_rows, r_local = np.unique(rows[edges], return_inverse=True)
+            sub_cols, c_local = np.unique(cols[edges], return_inverse=True)
+            sub_cost = np.ones((len(sub_rows), len(sub_cols)), dtype=float)
+            sub_valid = np.zeros_like(sub_cost, dtype=bool)
+            sub_cost[r_local, c_local] = cost[edges]
+            sub_valid[r_local, c_local] = True
+            r, c = linear_sum_assignment(sub_cost)
+            keep = sub_valid[r, c]
+            row_parts.append(sub_rows[r[keep]])
+            col_parts.append(sub_cols[c[keep]])
+
+    return np.concatenate(row_parts), np.concatenate(col_parts)
 
 
 def _filter_regions_by_size(
@@ -161,7 +424,6 @@ def _assign_prev_to_curr(
     *,
     row_ind: np.ndarray,
     col_ind: np.ndarray,
-    valid: np.ndarray,
     prev_labels: list[int],
     curr_labels: list[int],
     curr_regions: list[Region],
@@ -171,9 +433,8 @@ def _assign_prev_to_curr(
     """Apply assignment to update traces and build next-iteration state.
 
     Args:
-        row_ind: Row indices from the assignment solution.
-        col_ind: Column indices from the assignment solution.
-        valid: Boolean mask indicating which pairs are valid.
+        row_ind: Row indices of valid pairs in the assignment solution.
+        col_ind: Column indices of valid pairs in the assignment solution.
         prev_labels: Ordered labels corresponding to ``prev_regions`` rows.
         curr_labels: Ordered labels corresponding to ``curr_regions`` cols.
         curr_regions: Regions for the current frame.
@@ -187,8 +448,6 @@ def _assign_prev_to_curr(
     new_prev_regions: LabeledRegions = {}
 
     for r, c in zip(row_ind, col_ind):
-        if not valid[r, c]:
-            continue
         # Guard against mismatched indexing between prev_labels and prev_regions
         if r >= len(prev_labels):
             # skip any spurious assignment rows that don't map to a previous label
@@ -202,7 +461,8 @@ def _assign_prev_to_curr(
             continue
 
         # record mapping for this trace at current frame
-        state.traces[trace][frame] = curr_lbl
+        if state.traces is not None:
+            state.traces[trace][frame] = curr_lbl
 
         # prepare next-iteration prev mapping
         new_prev_map[curr_lbl] = trace
@@ -213,17 +473,25 @@ def _assign_prev_to_curr(
 
 def _process_frame(
     state: IterationState,
-    regions_all: list[LabeledRegions],
+    curr_frame_props: LabeledRegions,
     min_iou: float,
     frame: int,
+    solver: str = "sparse",
+    iou_mode: str = "bbox",
+    curr_labeled: np.ndarray | None = None,
 ) -> None:
     """Update state with matches between previous and current frame.
 
     Args:
         state: Iteration state that holds traces and previous frame mapping.
-        regions_all: List of labeled regions for all frames.
+        curr_frame_props: Labeled regions of the current frame.
         min_iou: Minimum IoU to consider a pair as a valid candidate.
-        frame: Index of the current frame within ``regions_all``.
+        frame: Index of the current frame.
+        solver: ``"sparse"`` solves per connected component of the candidate
+            graph; ``"dense"`` solves the full ``n_prev x n_curr`` matrix.
+        iou_mode: ``"bbox"`` for bounding-box IoU or ``"mask"`` for exact
+            pixel IoU (requires ``curr_labeled`` and ``state.prev_labeled``).
+        curr_labeled: Label image of the current frame for mask IoU.
 
     Returns:
         None. ``state`` is updated in-place.
@@ -232,26 +500,48 @@ def _process_frame(
     prev_labels = list(state.prev_map.keys())
     prev_regions_list = [state.prev_regions[lbl] for lbl in prev_labels]
 
-    curr_frame_props = regions_all[frame]
     curr_labels = list(curr_frame_props.keys())
     curr_regions = list(curr_frame_props.values())
 
-    # Build cost matrix and solve assignment
-    cost, valid = _build_cost_matrix(prev_regions_list, curr_regions, min_iou=min_iou)
+    prev_labeled = state.prev_labeled
+    state.prev_labeled = curr_labeled
 
-    if cost.size == 0:
-        # no valid candidate pairs — clear previous state
+    if not prev_regions_list or not curr_regions:
+        # no candidate pairs possible — clear previous state
         state.prev_map = {}
         state.prev_regions = {}
         return
 
-    row_ind, col_ind = linear_sum_assignment(cost)
+    if iou_mode == "mask":
+        rows, cols, iou = _mask_candidate_costs(
+            prev_labeled,
+            curr_labeled,
+            prev_labels,
+            curr_labels,
+            prev_regions_list,
+            curr_regions,
+            min_iou=min_iou,
+        )
+    else:
+        rows, cols, iou = _candidate_costs(
+            prev_regions_list, curr_regions, min_iou=min_iou
+        )
+
+    if solver == "sparse":
+        row_ind, col_ind = _solve_sparse_assignment(rows, cols, 1.0 - iou)
+    else:
+        # Build cost matrix and solve assignment
+        cost, valid = _dense_cost(
+            rows, cols, iou, len(prev_regions_list), len(curr_regions)
+        )
+        row_ind, col_ind = linear_sum_assignment(cost)
+        keep = valid[row_ind, col_ind]
+        row_ind, col_ind = row_ind[keep], col_ind[keep]
 
     # apply assignment results and prepare next-iteration mapping
     new_prev_map, new_prev_regions = _assign_prev_to_curr(
         row_ind=row_ind,
         col_ind=col_ind,
-        valid=valid,
         prev_labels=prev_labels,
         curr_labels=curr_labels,
         curr_regions=curr_regions,
@@ -263,6 +553,278 @@ def _process_frame(
     state.prev_regions = new_prev_regions
 
 
+def _label_frame(
+    frame: np.ndarray, min_size: int | None, max_size: int | None
+) -> tuple[np.ndarray, LabeledRegions]:
+    """Label a binary frame and summarize its size-filtered regions.
+
+    Args:
+        frame: 2D boolean array ``(H, W)``; nonzero values indicate foreground.
+        min_size: Minimum area in pixels (inclusive). ``None`` disables lower bound.
+        max_size: Maximum area in pixels (inclusive). ``None`` disables upper bound.
+
+    Returns:
+        Tuple ``(labeled, regions)`` of the connected-component label image
+        and its bbox/area regions. Filtered regions stay in ``labeled`` but
+        are absent from ``regions``.
+    """
+    labeled = label(frame, connectivity=1)
+    regions = _regions_from_labeled(labeled)
+    return labeled, _filter_regions_by_size(regions, min_size, max_size)
+
+
+def _trace_lut(trace_map: TraceMap, n_labels: int, dtype) -> np.ndarray:
+    """Build a ``label -> cell ID`` lookup table for one frame.
+
+    Args:
+        trace_map: Mapping from frame label to trace index.
+        n_labels: Largest label present in the frame.
+        dtype: Output dtype of the lookup table.
+
+    Returns:
+        1D array of length ``n_labels + 1``; untracked labels map to ``0``.
+    """
+    lut = np.zeros(n_labels + 1, dtype=dtype)
+    if trace_map:
+        labels = np.fromiter(trace_map.keys(), dtype=np.int64, count=len(trace_map))
+        traces = np.fromiter(trace_map.values(), dtype=np.int64, count=len(trace_map))
+        lut[labels] = traces + 1
+    return lut
+
+
+def _write_traces(
+    out: np.ndarray,
+    traces: list[Trace],
+    wide_labels: dict[int, np.ndarray],
+    progress_callback: Callable | None,
+    cancel_event,
+) -> None:
+    """Write traces into ``out`` with one lookup-table gather per frame.
+
+    ``out`` holds the label image of each frame (frames with more labels
+    than its dtype fits are in ``wide_labels``). Traces are inverted into
+    per-frame ``label -> trace`` mappings and each frame is overwritten
+    with ``lut[labeled]`` instead of scattering region coordinates cell by
+    cell. On cancellation ``out`` is zeroed rather than left partly written.
+    """
+    n_frames = out.shape[0]
+    frame_maps: list[TraceMap] = [{} for _ in range(n_frames)]
+    for cell, trace in enumerate(traces):
+        for frame, lbl in trace.items():
+            frame_maps[frame][lbl] = cell
+
+    for t in range(n_frames):
+        # Check for cancellation before writing each frame
+        if cancel_event and cancel_event.is_set():
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.info("Tracking cancelled while writing frame %d", t)
+            out[:] = 0
+            return
+
+        if not frame_maps[t]:
+            out[t] = 0
+            continue
+        labeled = wide_labels[t] if t in wide_labels else out[t]
+        lut = _trace_lut(frame_maps[t], int(labeled.max()), out.dtype)
+        out[t] = lut[labeled]
+        if progress_callback is not None:
+            progress_callback(t, n_frames, "Writing")
+
+
+def _checkpoint_params(
+    shape: tuple[int, ...],
+    min_size: int | None,
+    max_size: int | None,
+    min_iou: float,
+    solver: str,
+    iou_mode: str,
+) -> dict[str, np.ndarray]:
+    """Tracking parameters stored with a checkpoint to detect stale state."""
+    return {
+        "shape": np.asarray(shape, dtype=np.int64),
+        "min_size": np.asarray(-1 if min_size is None else min_size, dtype=np.int64),
+        "max_size": np.asarray(-1 if max_size is None else max_size, dtype=np.int64),
+        "min_iou": np.asarray(min_iou, dtype=np.float64),
+        "solver": np.asarray(solver),
+        "iou_mode": np.asarray(iou_mode),
+    }
+
+
+def _save_checkpoint(
+    path: Path,
+    frame: int,
+    state: IterationState,
+    n_traces: int,
+    params: dict[str, np.ndarray],
+) -> None:
+    """Atomically write the streaming tracker state after ``frame``.
+
+    Stores the frame watermark, the open ``label -> trace`` mapping, the
+    previous frame's region bboxes and areas, and the number of traces
+    (cell IDs ``1..n_traces`` are taken). The file is written under a
+    temporary name and renamed so a crash never leaves a torn checkpoint.
+    """
+    labels = np.fromiter(state.prev_map.keys(), dtype=np.int64)
+    traces = np.fromiter(state.prev_map.values(), dtype=np.int64)
+    regions = [state.prev_regions[lbl] for lbl in labels.tolist()]
+    bboxes = _bbox_array(regions)
+    areas = np.array([r.area for r in regions], dtype=np.int64)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as fh:
+        np.savez(
+            fh,
+            frame=np.asarray(frame, dtype=np.int64),
+            n_traces=np.asarray(n_traces, dtype=np.int64),
+            labels=labels,
+            traces=traces,
+            bboxes=bboxes,
+            areas=areas,
+            **params,
+        )
+    os.replace(tmp_path, path)
+
+
+def _load_checkpoint(
+    path: Path, params: dict[str, np.ndarray]
+) -> tuple[int, IterationState, int] | None:
+    """Load a checkpoint written by ``_save_checkpoint``.
+
+    Returns:
+        Tuple ``(frame, state, n_traces)``, or ``None`` if the file is
+        missing, unreadable, empty (frame ``-1``) or was written with
+        different tracking parameters. ``state.prev_labeled`` is not
+        restored.
+    """
+    try:
+        with np.load(path) as data:
+            for key, value in params.items():
+                if not np.array_equal(data[key], value):
+                    return None
+            frame = int(data["frame"])
+            n_traces = int(data["n_traces"])
+            labels = data["labels"].tolist()
+            traces = data["traces"].tolist()
+            bboxes = data["bboxes"].tolist()
+            areas = data["areas"].tolist()
+    except (OSError, ValueError, KeyError, EOFError):
+        return None
+    if frame < 0:
+        return None
+
+    state = IterationState(
+        traces=None,
+        prev_map=dict(zip(labels, traces)),
+        prev_regions={
+            lbl: Region(area=area, bbox=tuple(bbox), coords=None)
+            for lbl, area, bbox in zip(labels, areas, bboxes)
+        },
+    )
+    return frame, state, n_traces
+
+
+def _track_streaming(
+    image: np.ndarray,
+    out: np.ndarray,
+    min_size: int | None,
+    max_size: int | None,
+    min_iou: float,
+    progress_callback: Callable | None,
+    cancel_event,
+    solver: str,
+    iou_mode: str,
+    checkpoint_path: Path | None = None,
+    checkpoint_every: int = 100,
+) -> None:
+    """Label, link and write frames one at a time.
+
+    Only the previous frame's bbox/area regions and the ``label -> trace``
+    mapping are kept between frames; each output frame is written as
+    ``lut[labeled]``. Produces the same labels as the batch path.
+
+    With ``checkpoint_path``, ``out`` is flushed and the state saved every
+    ``checkpoint_every`` frames and on cancellation. A valid checkpoint
+    found at start resumes after its frame watermark; the checkpoint is
+    removed once the last frame has been written.
+    """
+    n_frames = image.shape[0]
+    state: IterationState | None = None
+    n_traces = 0
+    start = 0
+    params = None
+    if checkpoint_path is not None:
+        params = _checkpoint_params(
+            image.shape, min_size, max_size, min_iou, solver, iou_mode
+        )
+        resumed = _load_checkpoint(checkpoint_path, params)
+        if resumed is not None:
+            last_frame, state, n_traces = resumed
+            start = last_frame + 1
+            if iou_mode == "mask":
+                state.prev_labeled, _ = _label_frame(
+                    image[last_frame], min_size, max_size
+                )
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.info("Resuming tracking after frame %d", last_frame)
+
+    def _checkpoint(frame: int) -> None:
+        if hasattr(out, "flush"):
+            out.flush()
+        _save_checkpoint(checkpoint_path, frame, state, n_traces, params)
+
+    for t in range(start, n_frames):
+        # Check for cancellation before processing each frame
+        if cancel_event and cancel_event.is_set():
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.info("Tracking cancelled at frame %d", t)
+            if checkpoint_path is not None and state is not None:
+                _checkpoint(t - 1)
+            return
+
+        labeled, regions = _label_frame(image[t], min_size, max_size)
+        if state is None:
+            # Seed traces from frame 0 (see NOTE in ``track_cell``)
+            state = IterationState(
+                traces=None,
+                prev_map={lbl: i for i, lbl in enumerate(regions)},
+                prev_regions=regions,
+                prev_labeled=labeled if iou_mode == "mask" else None,
+            )
+            n_traces = len(regions)
+        else:
+            _process_frame(
+                state=state,
+                curr_frame_props=regions,
+                min_iou=min_iou,
+                frame=t,
+                solver=solver,
+                iou_mode=iou_mode,
+                curr_labeled=labeled if iou_mode == "mask" else None,
+            )
+
+        lut = _trace_lut(state.prev_map, int(labeled.max()), out.dtype)
+        out[t] = lut[labeled]
+        if progress_callback is not None:
+            progress_callback(t, n_frames, "Tracking")
+        if (
+            checkpoint_path is not None
+            and (t + 1) % checkpoint_every == 0
+            and t + 1 < n_frames
+        ):
+            _checkpoint(t)
+
+    if checkpoint_path is not None:
+        if hasattr(out, "flush"):
+            out.flush()
+        Path(checkpoint_path).unlink(missing_ok=True)
+
+
 def track_cell(
     image: np.ndarray,
     out: np.ndarray,
@@ -271,6 +833,11 @@ def track_cell(
     min_iou: float = 0.1,
     progress_callback: Callable | None = None,
     cancel_event=None,
+    solver: str = "sparse",
+    streaming: bool = False,
+    iou_mode: str = "bbox",
+    checkpoint_path: str | Path | None = None,
+    checkpoint_every: int = 100,
 ) -> None:
     """Track cells across frames using IoU-based Hungarian assignment.
 
@@ -283,16 +850,59 @@ def track_cell(
         out: Preallocated integer array ``(T, H, W)`` to receive labeled IDs.
         min_size: Minimum region size to track in pixels (inclusive).
         max_size: Maximum region size to track in pixels (inclusive).
-        min_iou: Minimum IoU threshold for candidate matches.
+        min_iou: Minimum IoU threshold for candidate matches; must be
+            positive, since only regions whose bounding boxes overlap are
+            considered candidates.
         progress_callback: Optional callable ``(t, total, msg)`` for progress.
         cancel_event: Optional threading.Event for cancellation support.
+        solver: Assignment solver. ``"sparse"`` (default) only considers
+            gated candidate pairs and solves each connected component of the
+            candidate graph separately, keeping linking near-linear in the
+            number of cells. ``"dense"`` solves the full cost matrix.
+        streaming: If True, label, link and write one frame at a time,
+            keeping only the previous frame's bboxes and areas in memory
+            instead of region coordinates for the whole movie.
+        iou_mode: ``"bbox"`` (default) matches on bounding-box IoU.
+            ``"mask"`` matches on exact pixel IoU, computed for all pairs at
+            once from a label-pair histogram of consecutive frames; more
+            accurate in dense clusters at a comparable cost.
+        checkpoint_path: Optional ``.npz`` path for resumable streaming runs.
+            The tracker state (open traces, previous-frame regions, number
+            of cell IDs) and the last completed frame are saved there every
+            ``checkpoint_every`` frames and on cancellation. If a checkpoint
+            written with the same parameters exists, tracking resumes after
+            its frame and ``out`` must hold the frames written so far. The
+            file is deleted when tracking completes. Requires ``streaming``.
+        checkpoint_every: Number of frames between checkpoints.
 
     Returns:
-        None. Results are written to ``out``.
+        None. Results are written to ``out``. A cancelled run leaves ``out``
+        zeroed in batch mode; in streaming mode it holds the frames tracked
+        so far.
 
     Raises:
-        ValueError: If ``image`` and ``out`` are not 3D or shapes differ.
+        ValueError: If ``image`` and ``out`` are not 3D, shapes differ,
+            ``solver`` or ``iou_mode`` is unknown, ``min_iou`` is not
+            positive, or ``checkpoint_path`` is given without ``streaming``.
     """
+    if solver not in ("sparse", "dense"):
+        raise ValueError(f"Unknown solver: {solver}")
+
+    if iou_mode not in ("bbox", "mask"):
+        raise ValueError(f"Unknown iou_mode: {iou_mode}")
+
+    if min_iou <= 0:
+        raise ValueError(
+            f"min_iou must be positive (got {min_iou}); "
+            "only overlapping regions are matched"
+        )
+
+    if checkpoint_path is not None and not streaming:
+        raise ValueError("checkpoint_path requires streaming=True")
+
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be at least 1")
+
     if image.ndim != 3 or out.ndim != 3:
         raise ValueError("image and out must be 3D arrays")
 
@@ -302,8 +912,30 @@ def track_cell(
     image = image.astype(bool, copy=False)
     out = out.astype(np.uint16, copy=False)
 
-    # Extract and prefilter regions for all frames
+    if streaming:
+        _track_streaming(
+            image,
+            out,
+            min_size=min_size,
+            max_size=max_size,
+            min_iou=min_iou,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            solver=solver,
+            iou_mode=iou_mode,
+            checkpoint_path=(
+                Path(checkpoint_path) if checkpoint_path is not None else None
+            ),
+            checkpoint_every=checkpoint_every,
+        )
+        return
+
+    # Extract and prefilter regions for all frames. Each frame is labeled
+    # once: the label images are kept in ``out`` (frames with more labels
+    # than ``out`` fits are kept aside) for mask IoU and ``_write_traces``.
     regions_all: list[LabeledRegions] = []
+    max_label = np.iinfo(out.dtype).max
+    wide_labels: dict[int, np.ndarray] = {}
     for t in range(image.shape[0]):
         # Check for cancellation before processing each frame
         if cancel_event and cancel_event.is_set():
@@ -311,10 +943,15 @@ def track_cell(
 
             logger = logging.getLogger(__name__)
             logger.info("Tracking cancelled at frame %d", t)
+            # ``out`` holds raw label images until the traces are written
+            out[:] = 0
             return
 
-        regions = _extract_regions(image[t])
-        regions = _filter_regions_by_size(regions, min_size, max_size)
+        labeled, regions = _label_frame(image[t], min_size, max_size)
+        if labeled.max(initial=0) <= max_label:
+            out[t] = labeled
+        else:
+            wide_labels[t] = labeled
         regions_all.append(regions)
         if progress_callback is not None:
             progress_callback(t, image.shape[0], "Labeling")
@@ -332,10 +969,16 @@ def track_cell(
     # Build initial mapping from prev frame label -> trace index
     init_prev_map: dict[int, int] = {lbl: i for i, lbl in enumerate(init_prev_labels)}
 
+    def _labeled(t: int) -> np.ndarray | None:
+        if iou_mode != "mask":
+            return None
+        return wide_labels[t] if t in wide_labels else out[t]
+
     state = IterationState(
         traces=init_traces,
         prev_map=init_prev_map,
         prev_regions=init_prev_regions,
+        prev_labeled=_labeled(0),
     )
 
     # Process subsequent frames
@@ -346,20 +989,21 @@ def track_cell(
 
             logger = logging.getLogger(__name__)
             logger.info("Tracking cancelled at frame %d", t)
+            # ``out`` holds raw label images until the traces are written
+            out[:] = 0
             return
 
-        _process_frame(state=state, regions_all=regions_all, min_iou=min_iou, frame=t)
+        _process_frame(
+            state=state,
+            curr_frame_props=regions_all[t],
+            min_iou=min_iou,
+            frame=t,
+            solver=solver,
+            iou_mode=iou_mode,
+            curr_labeled=_labeled(t),
+        )
         # progress reporting is the caller's responsibility; always report generic tracking
         if progress_callback is not None:
             progress_callback(t, image.shape[0], "Tracking")
 
-    out[...] = 0
-    for cell, trace in enumerate(state.traces, start=1):
-        for frame, lbl in trace.items():
-            frame_props = regions_all[frame]
-            region = frame_props.get(lbl)
-            if region is None:
-                continue
-            coords = region.coords
-            ys, xs = coords[:, 0], coords[:, 1]
-            out[frame, ys, xs] = cell
+    _write_traces(out, state.traces, wide_labels, progress_callback, cancel_event)
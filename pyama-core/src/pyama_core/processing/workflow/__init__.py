@@ -3,10 +3,28 @@ Workflow pipeline for microscopy image analysis.
 Consolidates types, helpers, and the orchestration function.
 """
 
+from pyama_core.processing.workflow.config import load_workflow_config
+from pyama_core.processing.workflow.planner import plan_workflow
 from pyama_core.processing.workflow.run import run_complete_workflow
+from pyama_core.processing.workflow.shards import combine_shard_results
+from pyama_core.processing.workflow.work_queue import (
+    create_work_queue,
+    finalize_work_queue,
+    run_queue_worker,
+)
 from pyama_core.types.processing import (
     ProcessingContext,
     ensure_context,
 )
 
-__all__ = ["run_complete_workflow", "ProcessingContext", "ensure_context"]
+__all__ = [
+    "run_complete_workflow",
+    "create_work_queue",
+    "run_queue_worker",
+    "finalize_work_queue",
+    "load_workflow_config",
+    "combine_shard_results",
+    "plan_workflow",
+    "ProcessingContext",
+    "ensure_context",
+]
@@ -0,0 +1,166 @@
+"""
+Workflow configuration files for non-interactive runs.
+
+A workflow config is a YAML or JSON mapping with everything
+``run_complete_workflow`` needs::
+
+    microscopy_file: plate.nd2        # relative paths are resolved against
+    output_dir: results               # the config file's folder
+    channels:
+      pc: {channel: 0, features: [area]}
+      fl:
+        - {channel: 1, features: [intensity_total]}
+    fov_start: 0                      # optional, default: first FOV
+    fov_end: -1                       # optional, default: last FOV
+    n_workers: auto                   # optional, default: 2
+    batch_size: auto                  # optional, default: 2
+    worker_mode: thread               # optional, "thread" or "process"
+    params: {}                        # optional workflow parameters
+
+Channels may also be given in the ``processing_results.yaml`` form
+(``pc: [0, [area]]``, ``fl: [[1, [intensity_total]]]``).
+"""
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from pyama_core.processing.workflow.run import WORKER_MODES
+from pyama_core.processing.workflow.tuning import AUTO
+from pyama_core.types.processing import Channels, ProcessingContext
+
+_KNOWN_KEYS = {
+    "microscopy_file",
+    "output_dir",
+    "channels",
+    "fov_start",
+    "fov_end",
+    "n_workers",
+    "batch_size",
+    "worker_mode",
+    "params",
+}
+
+
+@dataclass
+class WorkflowConfig:
+    """Inputs and settings of one workflow run."""
+
+    microscopy_file: Path
+    output_dir: Path
+    channels: Channels
+    fov_start: int | None = None
+    fov_end: int | None = None
+    n_workers: int | str = 2
+    batch_size: int | str = 2
+    worker_mode: str = "thread"
+    params: dict[str, Any] = field(default_factory=dict)
+
+    def to_context(self) -> ProcessingContext:
+        """Return a fresh processing context for this configuration."""
+        return ProcessingContext(
+            output_dir=self.output_dir,
+            channels=self.channels,
+            results={},
+            params=dict(self.params),
+        )
+
+
+def _resolve(path: Any, base_dir: Path) -> Path:
+    path = Path(str(path)).expanduser()
+    return path if path.is_absolute() else base_dir / path
+
+
+def _optional_int(data: dict, key: str) -> int | None:
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"'{key}' must be an integer, got {value!r}")
+    return value
+
+
+def _worker_count(data: dict, key: str) -> int | str:
+    value = data.get(key, 2)
+    if value == AUTO:
+        return AUTO
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"'{key}' must be a positive integer or '{AUTO}'")
+    return value
+
+
+def parse_workflow_config(data: Any, base_dir: Path) -> WorkflowConfig:
+    """Validate a config mapping and build a ``WorkflowConfig``.
+
+    Args:
+        data: Parsed YAML/JSON content.
+        base_dir: Folder relative paths are resolved against.
+
+    Raises:
+        ValueError: If a required key is missing or a value is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Workflow config must be a mapping")
+    unknown = sorted(set(data) - _KNOWN_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown workflow config keys: {', '.join(unknown)}")
+    for key in ("microscopy_file", "output_dir", "channels"):
+        if not data.get(key):
+            raise ValueError(f"Workflow config is missing '{key}'")
+
+    channels = Channels.from_serialized(data["channels"])
+    if channels.pc is None and not channels.fl:
+        raise ValueError("Workflow config selects no channels")
+
+    worker_mode = data.get("worker_mode", "thread")
+    if worker_mode not in WORKER_MODES:
+        raise ValueError(
+            f"'worker_mode' must be one of {', '.join(WORKER_MODES)}, "
+            f"got {worker_mode!r}"
+        )
+    params = data.get("params") or {}
+    if not isinstance(params, dict):
+        raise ValueError("'params' must be a mapping")
+
+    return WorkflowConfig(
+        microscopy_file=_resolve(data["microscopy_file"], base_dir),
+        output_dir=_resolve(data["output_dir"], base_dir),
+        channels=channels,
+        fov_start=_optional_int(data, "fov_start"),
+        fov_end=_optional_int(data, "fov_end"),
+        n_workers=_worker_count(data, "n_workers"),
+        batch_size=_worker_count(data, "batch_size"),
+        worker_mode=worker_mode,
+        params=params,
+    )
+
+
+def load_workflow_config(path: Path) -> WorkflowConfig:
+    """Load a workflow config from a YAML or JSON file (by suffix).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file cannot be parsed or is invalid.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Workflow config not found: {path}")
+    text = path.read_text(encoding="utf-8")
+    try:
+        if path.suffix.lower() == ".json":
+            data = json.loads(text)
+        else:
+            data = yaml.safe_load(text)
+    except (json.JSONDecodeError, yaml.YAMLError) as e:
+        raise ValueError(f"Failed to parse workflow config {path}: {e}") from e
+    return parse_workflow_config(data, path.resolve().parent)
+
+
+__all__ = [
+    "WorkflowConfig",
+    "parse_workflow_config",
+    "load_workflow_config",
+]
@@ -0,0 +1,373 @@
+"""
+Per-step performance metrics of workflow runs.
+
+Each (FOV, step) task is measured by a ``StepMeter``: wall time, CPU time,
+frames processed (distinct frame indices of the step's progress events),
+bytes of input stacks read and of output files written, and the peak
+resident set size while the step ran. Written files are attributed to a
+step by the output paths it recorded (background estimation and tracking
+of a FOV write to the same folder concurrently); a step that wrote nothing
+was skipped by its cache check and reports no bytes read.
+
+Metrics are emitted as ``{"event": "metrics", ...}`` dicts through the
+progress reporter and collected by ``RunMetrics`` into ``run_metrics.json``
+next to ``processing_results.yaml``.
+"""
+
+from dataclasses import asdict, dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Iterable
+
+import numpy as np
+
+from pyama_core.io import MicroscopyMetadata
+from pyama_core.io.atomic import atomic_write_text, is_partial_path
+from pyama_core.types.processing import ResultsPerFOV
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILENAME = "run_metrics.json"
+
+# Seconds between resident set size samples while a step runs
+RSS_SAMPLE_INTERVAL = 0.05
+
+# Result fields holding the input stacks of each step (copy reads the raw file)
+_STEP_INPUT_FIELDS = {
+    "segmentation": ("pc",),
+    "background": ("fl", "seg"),
+    "tracking": ("seg",),
+    "extraction": ("seg_labeled", "pc", "fl", "fl_background"),
+}
+
+# Result fields holding the outputs of each step (sidecars share their stem)
+_STEP_OUTPUT_FIELDS = {
+    "copy": ("pc", "fl"),
+    "segmentation": ("seg",),
+    "background": ("fl_background",),
+    "tracking": ("seg_labeled",),
+    "extraction": ("traces",),
+}
+
+
+@dataclass
+class StepMetrics:
+    """Measurements of one (FOV, step) task.
+
+    ``status`` is ``"completed"``, ``"skipped"`` (outputs up to date),
+    ``"cancelled"`` or ``"failed"``. ``peak_rss_bytes`` is None where the
+    resident set size cannot be read. ``cpu_time_partial`` is True when the
+    step ran helper threads whose CPU time ``cpu_time_s`` does not include
+    (thread-scoped measurement of a multi-threaded step).
+    """
+
+    fov: int
+    step: str
+    status: str
+    wall_time_s: float
+    cpu_time_s: float
+    frames: int
+    frames_per_s: float | None
+    bytes_read: int
+    bytes_written: int
+    peak_rss_bytes: int | None
+    cpu_time_partial: bool = False
+
+    def to_event(self) -> dict[str, Any]:
+        """Return the metrics as a reporter event."""
+        return {"event": "metrics", **asdict(self)}
+
+
+def current_rss_bytes() -> int | None:
+    """Return the resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _snapshot(directory: Path) -> dict[Path, tuple[int, int]]:
+    """Size and modification time of the committed files in ``directory``."""
+    files = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return files
+    for entry in entries:
+        if not entry.is_file() or is_partial_path(entry.name):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        files[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+class StepMeter:
+    """Context manager measuring one (FOV, step) task in the current thread.
+
+    Args:
+        fov: FOV index.
+        step: Workflow step name (e.g. ``"segmentation"``).
+        output_dir: Workflow output directory; files written to the FOV
+            folder while the step runs count as its output.
+        cancel_event: Event checked on exit; steps return quietly when
+            cancelled, so this is how a cancelled step is told apart.
+        cpu_scope: ``"thread"`` measures the CPU time of the calling thread
+            (concurrent steps share the process), ``"process"`` that of the
+            whole process (one step per worker process, helper threads
+            included).
+        cpu_partial: The step runs helper threads that a ``"thread"`` scope
+            does not measure; the metrics flag their CPU time as partial.
+        sample_interval: Seconds between resident set size samples.
+    """
+
+    def __init__(
+        self,
+        fov: int,
+        step: str,
+        output_dir: Path,
+        cancel_event=None,
+        cpu_scope: str = "thread",
+        cpu_partial: bool = False,
+        sample_interval: float = RSS_SAMPLE_INTERVAL,
+    ) -> None:
+        self.fov = fov
+        self.step = step
+        self.fov_dir = Path(output_dir) / f"fov_{fov:03d}"
+        self.cancel_event = cancel_event
+        self._cpu_clock = (
+            time.process_time if cpu_scope == "process" else time.thread_time
+        )
+        self._cpu_partial = cpu_partial and cpu_scope != "process"
+        self._sample_interval = sample_interval
+        self._frames: set[int] = set()
+        self._before: dict[Path, tuple[int, int]] = {}
+        self._peak_rss: int | None = None
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self.status = "completed"
+        self.wall_time_s = 0.0
+        self.cpu_time_s = 0.0
+        self._changed: dict[Path, int] = {}
+
+    def on_progress(self, event: dict[str, Any]) -> None:
+        """Progress reporter hook; counts the frame indices the step reports."""
+        t = event.get("t")
+        if t is not None:
+            self._frames.add(int(t))
+
+    def _sample_rss(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and (self._peak_rss is None or rss > self._peak_rss):
+            self._peak_rss = rss
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self._sample_interval):
+            self._sample_rss()
+
+    def __enter__(self) -> "StepMeter":
+        self._before = _snapshot(self.fov_dir)
+        self._sample_rss()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = self._cpu_clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.cpu_time_s = self._cpu_clock() - self._cpu_start
+        self.wall_time_s = time.perf_counter() - self._wall_start
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._sample_rss()
+
+        after = _snapshot(self.fov_dir)
+        self._changed = {
+            path: size
+            for path, (size, mtime_ns) in after.items()
+            if self._before.get(path) != (size, mtime_ns)
+        }
+        if exc_type is not None:
+            cancelled = issubclass(exc_type, InterruptedError)
+            self.status = "cancelled" if cancelled else "failed"
+        elif self.cancel_event is not None and self.cancel_event.is_set():
+            self.status = "cancelled"
+        return False
+
+    def metrics(
+        self, entry: ResultsPerFOV | None, metadata: MicroscopyMetadata
+    ) -> StepMetrics:
+        """Return the measurements of the finished step.
+
+        Args:
+            entry: The FOV's results after the step ran (locates the step's
+                inputs and outputs).
+            metadata: Microscopy metadata (raw stack size for copying).
+        """
+        stems = [path.stem for path in _entry_paths(entry, self._output_fields())]
+        written = {
+            path: size
+            for path, size in self._changed.items()
+            if any(
+                path.name.startswith((f"{stem}.", f"{stem}_")) for stem in stems
+            )
+        }
+        status = self.status
+        if status == "completed" and not written:
+            status = "skipped"
+        bytes_read = _input_bytes(self.step, entry, metadata, written) if written else 0
+        frames = len(self._frames)
+        return StepMetrics(
+            fov=self.fov,
+            step=self.step,
+            status=status,
+            wall_time_s=round(self.wall_time_s, 6),
+            cpu_time_s=round(self.cpu_time_s, 6),
+            frames=frames,
+            frames_per_s=(
+                round(frames / self.wall_time_s, 3)
+                if frames and self.wall_time_s > 0
+                else None
+            ),
+            bytes_read=bytes_read,
+            bytes_written=sum(written.values()),
+            peak_rss_bytes=self._peak_rss,
+            cpu_time_partial=self._cpu_partial,
+        )
+
+    def _output_fields(self) -> tuple[str, ...]:
+        return _STEP_OUTPUT_FIELDS.get(self.step, ())
+
+
+def _entry_paths(entry: ResultsPerFOV | None, fields: Iterable[str]) -> list[Path]:
+    paths = []
+    if entry is None:
+        return paths
+    for name in fields:
+        value = getattr(entry, name, None)
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if isinstance(item, tuple) and len(item) == 2:
+                item = item[1]
+            if item is not None:
+                paths.append(Path(item))
+    return paths
+
+
+def _input_bytes(
+    step: str,
+    entry: ResultsPerFOV | None,
+    metadata: MicroscopyMetadata,
+    written: Iterable[Path],
+) -> int:
+    """Total size of the input stacks a step read for one FOV.
+
+    Copying reads one raw stack per channel stack it wrote.
+    """
+    if step == "copy":
+        try:
+            itemsize = np.dtype(metadata.dtype).itemsize
+        except TypeError:
+            itemsize = 2
+        stack = int(metadata.n_frames) * int(metadata.height) * int(metadata.width)
+        n_stacks = sum(1 for path in written if Path(path).suffix == ".npy")
+        return n_stacks * stack * itemsize
+    total = 0
+    for path in _entry_paths(entry, _STEP_INPUT_FIELDS.get(step, ())):
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+class RunMetrics:
+    """Thread-safe collection of the step metrics of one workflow run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._steps: list[StepMetrics] = []
+        self._started = time.time()
+        self._wall_start = time.perf_counter()
+
+    def add(self, metrics: StepMetrics) -> None:
+        with self._lock:
+            self._steps.append(metrics)
+
+    @property
+    def steps(self) -> list[StepMetrics]:
+        with self._lock:
+            return list(self._steps)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Totals per step over all FOVs (peak RSS is the maximum)."""
+        summary: dict[str, dict[str, Any]] = {}
+        for m in self.steps:
+            totals = summary.setdefault(
+                m.step,
+                {
+                    "tasks": 0,
+                    "skipped": 0,
+                    "failed": 0,
+                    "wall_time_s": 0.0,
+                    "cpu_time_s": 0.0,
+                    "frames": 0,
+                    "bytes_read": 0,
+                    "bytes_written": 0,
+                    "peak_rss_bytes": None,
+                    "cpu_time_partial": False,
+                },
+            )
+            totals["tasks"] += 1
+            totals["skipped"] += m.status == "skipped"
+            totals["failed"] += m.status == "failed"
+            totals["wall_time_s"] = round(totals["wall_time_s"] + m.wall_time_s, 6)
+            totals["cpu_time_s"] = round(totals["cpu_time_s"] + m.cpu_time_s, 6)
+            totals["cpu_time_partial"] |= m.cpu_time_partial
+            totals["frames"] += m.frames
+            totals["bytes_read"] += m.bytes_read
+            totals["bytes_written"] += m.bytes_written
+            if m.peak_rss_bytes is not None:
+                totals["peak_rss_bytes"] = max(
+                    totals["peak_rss_bytes"] or 0, m.peak_rss_bytes
+                )
+        return summary
+
+    def to_dict(self, **run_info: Any) -> dict[str, Any]:
+        """Return the run report (``run_info`` is stored under ``"run"``)."""
+        steps = sorted(self.steps, key=lambda m: (m.fov, m.step))
+        return {
+            "run": {
+                "started": time.strftime(
+                    "%Y-%m-%dT%H:%M:%S%z", time.localtime(self._started)
+                ),
+                "wall_time_s": round(time.perf_counter() - self._wall_start, 6),
+                **run_info,
+            },
+            "summary": self.summary(),
+            "steps": [asdict(m) for m in steps],
+        }
+
+    def write(self, output_dir: Path, **run_info: Any) -> Path:
+        """Write ``run_metrics.json`` into ``output_dir`` and return its path."""
+        path = Path(output_dir) / METRICS_FILENAME
+        atomic_write_text(path, json.dumps(self.to_dict(**run_info), indent=2))
+        return path
+
+
+__all__ = [
+    "METRICS_FILENAME",
+    "StepMetrics",
+    "StepMeter",
+    "RunMetrics",
+    "current_rss_bytes",
+]
@@ -0,0 +1,525 @@
+"""
+Dry-run planning of workflow runs: disk, memory and runtime estimates.
+
+``plan_workflow`` predicts, before anything is written:
+
+- Bytes written per step and FOV, from the stack geometry and the dtypes
+  the services write (``uint16`` copies and labels, ``bool`` masks,
+  ``float32`` backgrounds); the trace table is sized from the cells found
+  in the sampled frame and its bytes per row in the configured
+  ``trace_format`` (Parquet and Feather uncompressed, an upper bound)
+- Peak memory per step and worker (see ``tuning.estimate_step_memory``)
+- Runtime, calibrated by running each step's algorithm on one sampled
+  frame (read from the microscopy file, or a synthetic frame of the same
+  size if the file cannot be read) and scaling by frames, channels, FOVs
+  and workers
+
+The runtime model assumes steps scale across workers (true in process
+mode; GIL-bound steps scale less in thread mode), a single copy slot (see
+``scheduler.DEFAULT_STEP_LIMITS``) and no outputs that are already up to
+date. One frame is a small sample; expect the estimate to be within a
+factor of about two.
+"""
+
+from dataclasses import asdict, dataclass, field, replace
+import logging
+from pathlib import Path
+import shutil
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from pyama_core.io import (
+    MicroscopyMetadata,
+    get_microscopy_frame,
+    load_microscopy_file,
+)
+from pyama_core.io.processing_csv import TRACE_FORMATS, typed_trace_columns
+from pyama_core.io.synthetic import SyntheticConfig, generate_synthetic_dataset
+from pyama_core.processing.background import estimate_background
+from pyama_core.processing.extraction import extract_traces
+from pyama_core.processing.segmentation import segment_cell
+from pyama_core.processing.tracking import track_cell
+from pyama_core.processing.workflow.tuning import (
+    AUTO,
+    ResourcePlan,
+    _format_bytes,
+    estimate_step_memory,
+    plan_resources,
+)
+from pyama_core.types.processing import Channels, ExtractionChannel
+
+logger = logging.getLogger(__name__)
+
+# Size of the ``.npy`` header in front of each stack
+_NPY_HEADER_BYTES = 128
+
+# Cells per 1024 x 1024 pixels of synthetic calibration frames
+_SYNTHETIC_CELL_DENSITY = 40
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """Step timings measured on one sampled frame."""
+
+    # Seconds per frame and channel (copy, background) or per frame
+    seconds_per_frame: dict[str, float | None]
+    cells_per_frame: int
+    trace_row_bytes: int
+    source: str  # "file" or "synthetic"
+    trace_format: str = "csv"
+
+
+@dataclass(frozen=True)
+class StepPlan:
+    """Estimates for one step of one FOV."""
+
+    step: str
+    bytes_written: int
+    peak_memory: int
+    seconds: float | None  # None if the step could not be timed
+
+
+@dataclass(frozen=True)
+class WorkflowPlan:
+    """Estimated disk use, memory and runtime of a workflow run."""
+
+    n_fovs: int
+    n_frames: int
+    steps: list[StepPlan]
+    resources: ResourcePlan
+    calibration: Calibration
+    free_disk_bytes: int | None = None
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def bytes_per_fov(self) -> int:
+        return sum(step.bytes_written for step in self.steps)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.bytes_per_fov * self.n_fovs
+
+    @property
+    def fits_on_disk(self) -> bool | None:
+        if self.free_disk_bytes is None:
+            return None
+        return self.total_bytes <= self.free_disk_bytes
+
+    @property
+    def peak_memory_bytes(self) -> int:
+        """Peak memory of all workers together."""
+        return self.resources.worker_bytes * self.resources.n_workers
+
+    @property
+    def runtime_seconds(self) -> float:
+        """Expected wall time of the run (untimed steps count as zero).
+
+        The run takes at least as long as the single copy slot needs for
+        all FOVs, as the work of all steps shared by the busy workers, and
+        as one FOV's steps run back to back.
+        """
+        seconds = {step.step: step.seconds or 0.0 for step in self.steps}
+        per_fov = sum(seconds.values())
+        parallel = max(min(self.resources.n_workers, self.resources.cpu_count), 1)
+        return max(
+            seconds.get("copy", 0.0) * self.n_fovs,
+            per_fov * self.n_fovs / parallel,
+            per_fov,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "n_fovs": self.n_fovs,
+            "n_frames": self.n_frames,
+            "steps": [asdict(step) for step in self.steps],
+            "bytes_per_fov": self.bytes_per_fov,
+            "total_bytes": self.total_bytes,
+            "free_disk_bytes": self.free_disk_bytes,
+            "n_workers": self.resources.n_workers,
+            "batch_size": self.resources.batch_size,
+            "worker_bytes": self.resources.worker_bytes,
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "runtime_seconds": self.runtime_seconds,
+            "calibration": asdict(self.calibration),
+            "warnings": list(self.warnings),
+        }
+
+    def describe(self) -> str:
+        """Multi-line summary for the terminal."""
+        lines = [
+            f"{self.n_fovs} FOVs x {self.n_frames} frames, "
+            f"calibrated on one {self.calibration.source} frame "
+            f"({self.calibration.cells_per_frame} cells)",
+            f"{'step':<13} {'written/FOV':>12} {'peak memory':>12} {'time/FOV':>10}",
+        ]
+        for step in self.steps:
+            seconds = "-" if step.seconds is None else _format_seconds(step.seconds)
+            lines.append(
+                f"{step.step:<13} {_format_bytes(step.bytes_written):>12} "
+                f"{_format_bytes(step.peak_memory):>12} {seconds:>10}"
+            )
+        free = (
+            ""
+            if self.free_disk_bytes is None
+            else f" ({_format_bytes(self.free_disk_bytes)} free)"
+        )
+        lines += [
+            f"Disk: {_format_bytes(self.bytes_per_fov)} per FOV, "
+            f"{_format_bytes(self.total_bytes)} in total{free}",
+            f"Memory: {_format_bytes(self.resources.worker_bytes)} per worker, "
+            f"{_format_bytes(self.peak_memory_bytes)} in total "
+            f"(workers={self.resources.n_workers}, "
+            f"FOVs in flight={self.resources.batch_size})",
+            f"Runtime: about {_format_seconds(self.runtime_seconds)}",
+        ]
+        lines += [f"Warning: {warning}" for warning in self.warnings]
+        return "\n".join(lines)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def _best_time(func: Callable[[], Any], repeats: int = 2) -> tuple[float, Any]:
+    """Fastest of ``repeats`` calls (the first may include warm-up)."""
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _sample_frames(
+    metadata: MicroscopyMetadata, channels: Channels, fov: int, frame: int
+) -> tuple[dict[int, np.ndarray], float | None, str]:
+    """Read one frame per selected channel, or render synthetic ones.
+
+    Returns:
+        Frames by channel id, seconds to read one channel's frame (None
+        for synthetic frames) and the source (``"file"`` or ``"synthetic"``).
+    """
+    channel_ids = [s.channel for s in ([channels.pc] if channels.pc else [])]
+    channel_ids += [s.channel for s in channels.fl]
+    try:
+        img, _ = load_microscopy_file(metadata.file_path)
+    except Exception as exc:
+        img = None
+        logger.info("Sampling a synthetic frame (cannot read input: %s)", exc)
+    if img is not None:
+        try:
+            frames, read_seconds = {}, []
+            for ch in channel_ids:
+                seconds, frames[ch] = _best_time(
+                    lambda ch=ch: np.asarray(
+                        get_microscopy_frame(img, fov, ch, frame), dtype=np.uint16
+                    )
+                )
+                read_seconds.append(seconds)
+            return frames, max(read_seconds), "file"
+        except Exception as exc:
+            # The estimate no longer reflects the real data
+            logger.warning(
+                "Sampling a synthetic frame (reading FOV %d, frame %d failed: %s)",
+                fov,
+                frame,
+                exc,
+            )
+        finally:
+            if hasattr(img, "close"):
+                img.close()
+
+    height, width = int(metadata.height), int(metadata.width)
+    n_cells = max(round(_SYNTHETIC_CELL_DENSITY * height * width / 1024**2), 1)
+    data = generate_synthetic_dataset(
+        SyntheticConfig(n_frames=1, height=height, width=width, n_cells=n_cells)
+    )
+    frames = {}
+    if channels.pc is not None:
+        frames[channels.pc.channel] = data.pc[0]
+    for selection in channels.fl:
+        frames[selection.channel] = data.fl[0]
+    return frames, None, "synthetic"
+
+
+def calibrate_steps(
+    metadata: MicroscopyMetadata,
+    channels: Channels,
+    params: dict[str, Any] | None = None,
+    fov: int = 0,
+    frame: int | None = None,
+) -> Calibration:
+    """Time each step's algorithm on one sampled frame.
+
+    Copying is timed as reading one channel's frame from the microscopy
+    file; background estimation on the first fluorescence channel.
+    Tracking runs on the sampled mask twice (so one frame is linked) and
+    is halved. Steps that fail on the sample (e.g. background estimation
+    on frames smaller than its tiles) are reported as None.
+
+    Args:
+        metadata: Microscopy metadata of the input file.
+        channels: Selected channels and features.
+        params: Workflow parameters (extraction settings).
+        fov: FOV to sample.
+        frame: Frame to sample (default: the middle frame).
+    """
+    params = params or {}
+    if frame is None:
+        frame = int(metadata.n_frames) // 2
+    frames, read_seconds, source = _sample_frames(metadata, channels, fov, frame)
+    seconds: dict[str, float | None] = {"copy": read_seconds}
+
+    pc = channels.pc.channel if channels.pc is not None else channels.fl[0].channel
+    image = frames[pc][np.newaxis]
+    seg = np.empty(image.shape, dtype=bool)
+    seconds["segmentation"], _ = _best_time(lambda: segment_cell(image, seg))
+
+    backgrounds: dict[int, np.ndarray | float] = {}
+    if channels.fl:
+        fl = frames[channels.fl[0].channel][np.newaxis].astype(np.float32)
+        background = np.empty(fl.shape, dtype=np.float32)
+        try:
+            seconds["background"], _ = _best_time(
+                lambda: estimate_background(fl, seg, background)
+            )
+            backgrounds = {s.channel: background for s in channels.fl}
+        except Exception as exc:
+            logger.info("Background estimation could not be timed: %s", exc)
+            seconds["background"] = None
+
+    pair = np.concatenate([seg, seg])
+    labeled = np.empty(pair.shape, dtype=np.uint16)
+    elapsed, _ = _best_time(lambda: track_cell(pair, labeled))
+    seconds["tracking"] = elapsed / 2
+
+    extraction_channels = []
+    if channels.pc is not None and channels.pc.features:
+        extraction_channels.append(
+            ExtractionChannel(
+                channel=pc, image=image, features=list(channels.pc.features)
+            )
+        )
+    for selection in channels.fl:
+        extraction_channels.append(
+            ExtractionChannel(
+                channel=selection.channel,
+                image=frames[selection.channel][np.newaxis],
+                features=list(selection.features) or None,
+                background=backgrounds.get(selection.channel, 0.0),
+            )
+        )
+    seconds["extraction"], traces = _best_time(
+        lambda: extract_traces(
+            labeled[:1],
+            np.zeros(1),
+            extraction_channels,
+            min_length=0,
+            border_width=params.get("border_width", 50),
+        )
+    )
+    trace_format = str(params.get("trace_format", "csv")).lower()
+    if trace_format not in TRACE_FORMATS:
+        trace_format = "csv"
+    row_bytes = 0
+    if len(traces) and trace_format == "csv":
+        row_bytes = len(
+            traces.to_csv(index=False, header=False, float_format="%.6f").encode()
+        ) // len(traces)
+    elif len(traces):
+        # Binary formats store typed columns; compression only makes them smaller
+        typed = typed_trace_columns(traces)
+        row_bytes = int(typed.memory_usage(index=False).sum()) // len(traces)
+    return Calibration(
+        seconds_per_frame=seconds,
+        cells_per_frame=len(traces),
+        trace_row_bytes=row_bytes,
+        source=source,
+        trace_format=trace_format,
+    )
+
+
+def estimate_step_bytes(
+    metadata: MicroscopyMetadata,
+    channels: Channels,
+    calibration: Calibration | None = None,
+) -> dict[str, int]:
+    """Estimate the bytes each step writes for one FOV.
+
+    The trace table is only estimated with a ``calibration`` (cells per
+    frame and bytes per row); without one extraction counts as zero.
+    """
+    frame = int(metadata.height) * int(metadata.width)
+    stack = int(metadata.n_frames) * frame
+    n_channels = len(channels.fl) + (1 if channels.pc is not None else 0)
+    n_fl = len(channels.fl)
+    estimate = {
+        "copy": n_channels * (stack * 2 + _NPY_HEADER_BYTES),
+        "segmentation": stack + _NPY_HEADER_BYTES,
+    }
+    if n_fl:
+        estimate["background"] = n_fl * (stack * 4 + _NPY_HEADER_BYTES)
+    estimate["tracking"] = stack * 2 + _NPY_HEADER_BYTES
+    estimate["extraction"] = 0
+    if calibration is not None:
+        estimate["extraction"] = (
+            calibration.cells_per_frame
+            * int(metadata.n_frames)
+            * calibration.trace_row_bytes
+        )
+    return estimate
+
+
+def _free_disk_bytes(path: Path) -> int | None:
+    path = Path(path).resolve()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return None
+
+
+def plan_workflow(
+    metadata: MicroscopyMetadata,
+    channels: Channels,
+    params: dict[str, Any] | None = None,
+    fov_start: int | None = None,
+    fov_end: int | None = None,
+    n_workers: int | str = AUTO,
+    batch_size: int | str = AUTO,
+    worker_mode: str = "thread",
+    output_dir: Path | None = None,
+    calibration: Calibration | None = None,
+) -> WorkflowPlan:
+    """Estimate disk use, memory and runtime of a run without processing.
+
+    Args:
+        metadata: Microscopy metadata of the input file.
+        channels: Selected channels and features.
+        params: Workflow parameters.
+        fov_start: First FOV (None or -1: the first FOV of the file).
+        fov_end: Last FOV (None or -1: the last FOV of the file).
+        n_workers: Worker count, or ``"auto"`` as in ``run_complete_workflow``.
+        batch_size: FOVs in flight, or ``"auto"``.
+        worker_mode: ``"thread"`` or ``"process"``.
+        output_dir: Output directory, to compare the estimate with its free
+            disk space.
+        calibration: Step timings to reuse (measured with
+            ``calibrate_steps`` on the first FOV of the range if None).
+
+    Returns:
+        The plan; ``plan.describe()`` formats it for the terminal.
+
+    Raises:
+        ValueError: If the FOV range is not within the file.
+    """
+    params = params or {}
+    if fov_start is None or fov_start == -1:
+        fov_start = 0
+    if fov_end is None or fov_end == -1:
+        fov_end = int(metadata.n_fovs) - 1
+    n_fov = int(metadata.n_fovs)
+    if fov_start < 0 or fov_end >= n_fov or fov_start > fov_end:
+        raise ValueError(
+            f"Invalid FOV range: {fov_start}-{fov_end} (file has {n_fov} FOVs)"
+        )
+    n_fovs = fov_end - fov_start + 1
+    n_frames = int(metadata.n_frames)
+
+    resources = plan_resources(
+        metadata, channels, n_fovs, params, worker_mode=worker_mode
+    )
+    if n_workers != AUTO or batch_size != AUTO:
+        chosen_workers = resources.n_workers if n_workers == AUTO else int(n_workers)
+        chosen_batch = (
+            min(chosen_workers + 1, n_fovs)
+            if batch_size == AUTO
+            else int(batch_size)
+        )
+        resources = replace(
+            resources,
+            n_workers=chosen_workers,
+            batch_size=chosen_batch,
+            limited_by="configuration",
+        )
+
+    if calibration is None:
+        calibration = calibrate_steps(metadata, channels, params, fov=fov_start)
+    memory = estimate_step_memory(metadata, channels, params)
+    written = estimate_step_bytes(metadata, channels, calibration)
+    # Per frame for one channel; copying and background run once per channel
+    repeats = {
+        "copy": len(channels.fl) + (1 if channels.pc is not None else 0),
+        "background": len(channels.fl),
+    }
+    steps = []
+    for step, peak in memory.items():
+        per_frame = calibration.seconds_per_frame.get(step)
+        steps.append(
+            StepPlan(
+                step=step,
+                bytes_written=written.get(step, 0),
+                peak_memory=peak,
+                seconds=(
+                    None
+                    if per_frame is None
+                    else per_frame * n_frames * repeats.get(step, 1)
+                ),
+            )
+        )
+
+    free_disk = _free_disk_bytes(output_dir) if output_dir is not None else None
+    plan = WorkflowPlan(
+        n_fovs=n_fovs,
+        n_frames=n_frames,
+        steps=steps,
+        resources=resources,
+        calibration=calibration,
+        free_disk_bytes=free_disk,
+    )
+    warnings = []
+    if plan.fits_on_disk is False:
+        warnings.append(
+            f"Outputs ({_format_bytes(plan.total_bytes)}) exceed the free disk "
+            f"space ({_format_bytes(free_disk)})"
+        )
+    if (
+        resources.available_bytes is not None
+        and plan.peak_memory_bytes > resources.available_bytes
+    ):
+        warnings.append(
+            f"Workers may need {_format_bytes(plan.peak_memory_bytes)}, more "
+            f"than the {_format_bytes(resources.available_bytes)} available"
+        )
+    if resources.n_workers > resources.cpu_count:
+        warnings.append(
+            f"{resources.n_workers} workers share {resources.cpu_count} CPUs"
+        )
+    if calibration.trace_format != "csv":
+        warnings.append(
+            f"Trace tables ({calibration.trace_format}) are sized uncompressed; "
+            "the files will be smaller"
+        )
+    untimed = [step.step for step in steps if step.seconds is None]
+    if untimed:
+        warnings.append(
+            f"Not timed on the sample (left out of the runtime): {', '.join(untimed)}"
+        )
+    return replace(plan, warnings=warnings)
+
+
+__all__ = [
+    "Calibration",
+    "StepPlan",
+    "WorkflowPlan",
+    "calibrate_steps",
+    "estimate_step_bytes",
+    "plan_workflow",
+]
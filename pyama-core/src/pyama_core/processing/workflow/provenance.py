@@ -0,0 +1,199 @@
+"""
+Provenance records for workflow step outputs.
+
+Each output file gets a ``<stem>.provenance.json`` sidecar holding a hash of
+the identities of the files it was computed from (name, size, modification
+time), the step parameters and the code version. The code version of a step
+includes a digest of the source of the package implementing it, so editing
+an algorithm invalidates its outputs even within a release. A step reuses an
+existing output only if the recorded hash matches the hash it would record
+now.
+
+Recomputing an output changes its modification time, so exactly the steps
+that read it see a different input identity and are recomputed in turn;
+independent steps keep their outputs.
+"""
+
+from functools import lru_cache
+import hashlib
+from importlib import metadata as importlib_metadata
+import json
+import logging
+from pathlib import Path
+import sys
+from typing import Any, Callable, Iterable
+
+from pyama_core.io.atomic import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Return the installed pyama-core version (``"unknown"`` if not installed)."""
+    try:
+        return importlib_metadata.version("pyama-core")
+    except importlib_metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def algorithm_name(func: Callable) -> str:
+    """Return the qualified name of the function implementing a step."""
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+@lru_cache(maxsize=None)
+def _source_digest(package_dir: Path) -> str | None:
+    digest = hashlib.sha256()
+    sources = sorted(package_dir.rglob("*.py"))
+    try:
+        for path in sources:
+            digest.update(path.relative_to(package_dir).as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+    except OSError:
+        return None
+    return digest.hexdigest() if sources else None
+
+
+def algorithm_version(func: Callable) -> str:
+    """Return the code version of the function implementing a step.
+
+    The pyama-core version plus a digest of the Python sources of the
+    package that defines ``func`` (helpers in the same package included),
+    so the version changes with every edit of the algorithm, not only with
+    releases. Falls back to ``code_version()`` when the sources cannot be
+    read.
+    """
+    module = sys.modules.get(func.__module__)
+    module_file = getattr(module, "__file__", None)
+    if module_file is None:
+        return code_version()
+    source = _source_digest(Path(module_file).resolve().parent)
+    return code_version() if source is None else f"{code_version()}+{source[:16]}"
+
+
+def file_identity(path: Path) -> dict[str, Any]:
+    """Identify an input file by name, size and modification time.
+
+    The directory is left out so that moved output folders stay valid.
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return {"name": path.name, "size": None, "mtime_ns": None}
+    return {"name": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def input_digest(paths: Iterable[Path | None]) -> str:
+    """Hash the identities of ``paths`` (``None`` entries are kept as such)."""
+    return _digest([file_identity(p) if p is not None else None for p in paths])
+
+
+def step_provenance(
+    step: str,
+    inputs: Iterable[Path],
+    params: dict[str, Any] | None = None,
+    algorithm: Callable | None = None,
+) -> dict[str, Any]:
+    """Build the provenance record of one step output.
+
+    Args:
+        step: Step name (e.g. ``"segmentation"``).
+        inputs: Files the output is computed from.
+        params: Parameters that affect the output (JSON-serializable).
+        algorithm: Function implementing the step; its name is recorded
+            under ``params["algorithm"]`` and its source digest in the code
+            version (see ``algorithm_version``).
+
+    Returns:
+        Record with ``step``, ``code_version``, ``inputs``, ``params`` and
+        ``hash`` (SHA-256 over everything else).
+    """
+    params = dict(params or {})
+    if algorithm is not None:
+        params = {"algorithm": algorithm_name(algorithm), **params}
+    record = {
+        "step": step,
+        "code_version": (
+            algorithm_version(algorithm) if algorithm is not None else code_version()
+        ),
+        "inputs": [file_identity(p) for p in inputs],
+        "params": params,
+    }
+    record["hash"] = _digest(record)
+    return record
+
+
+def provenance_path(output_path: Path) -> Path:
+    """Return the provenance sidecar path of an output (``<stem>.provenance.json``)."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.provenance.json")
+
+
+def read_provenance(output_path: Path) -> dict[str, Any] | None:
+    """Read the provenance record of an output, or None if missing or unreadable."""
+    try:
+        with provenance_path(output_path).open("r", encoding="utf-8") as handle:
+            record = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def write_provenance(output_path: Path, record: dict[str, Any]) -> None:
+    """Write the provenance record of an output.
+
+    The record doubles as the output's completion marker, so it is written
+    atomically and only after the output itself was committed.
+    """
+    atomic_write_text(
+        provenance_path(output_path), json.dumps(record, indent=2, default=str)
+    )
+
+
+def clear_provenance(output_path: Path) -> None:
+    """Remove the provenance record of an output (before recomputing it)."""
+    provenance_path(output_path).unlink(missing_ok=True)
+
+
+def is_current(output_path: Path, record: dict[str, Any]) -> bool:
+    """Return True if ``output_path`` exists and was produced as ``record`` describes."""
+    if not Path(output_path).exists():
+        return False
+    stored = read_provenance(output_path)
+    return stored is not None and stored.get("hash") == record["hash"]
+
+
+def describe_mismatch(output_path: Path, record: dict[str, Any]) -> str:
+    """Explain why an existing output is not current (for log messages)."""
+    stored = read_provenance(output_path)
+    if stored is None:
+        return "no provenance record"
+    changed = [
+        key
+        for key in ("code_version", "inputs", "params")
+        if stored.get(key) != record.get(key)
+    ]
+    return f"{', '.join(changed) or 'hash'} changed"
+
+
+__all__ = [
+    "code_version",
+    "algorithm_name",
+    "algorithm_version",
+    "file_identity",
+    "input_digest",
+    "step_provenance",
+    "provenance_path",
+    "read_provenance",
+    "write_provenance",
+    "clear_provenance",
+    "is_current",
+    "describe_mismatch",
+]
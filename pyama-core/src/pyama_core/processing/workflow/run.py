@@ -3,17 +3,34 @@ Workflow pipeline for microscopy image analysis.
 Consolidates types, helpers, and the orchestration function.
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+import multiprocessing
 import threading
 import logging
+import traceback
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 import yaml
 
 from pyama_core.io import MicroscopyMetadata
+from pyama_core.io.atomic import cleanup_partial_outputs
+from pyama_core.io.processing_csv import combine_trace_files
 from pyama_core.io.results_yaml import (
     deserialize_from_dict,
     save_processing_results_yaml,
+    serialize_processing_results,
 )
+from pyama_core.plugin.loader import load_plugins
+from pyama_core.processing.extraction.features import plugin_feature_dirs
+from pyama_core.processing.workflow.metrics import (
+    RunMetrics,
+    StepMeter,
+    StepMetrics,
+)
+from pyama_core.processing.workflow.scheduler import ScheduleResult, run_task_graph
+from pyama_core.processing.workflow.tuning import AUTO, plan_resources
 from pyama_core.processing.workflow.services import (
     CopyingService,
     SegmentationService,
@@ -24,50 +41,107 @@ from pyama_core.processing.workflow.services import (
     ensure_context,
     ensure_results_entry,
 )
-from pyama_core.types.processing import Channels
+from pyama_core.types.processing import Channels, ResultsPerFOV
 
 logger = logging.getLogger(__name__)
 
+WORKER_MODES = ("thread", "process")
+
+_STEP_SERVICES = {
+    "copy": CopyingService,
+    "segmentation": SegmentationService,
+    "background": BackgroundEstimationService,
+    "tracking": TrackingService,
+    "extraction": ExtractionService,
+}
+
+# Cancel event shared with the parent, set in each worker process by the initializer
+_worker_cancel_event = None
 
-def _compute_batches(fovs: list[int], batch_size: int) -> list[list[int]]:
-    """Split FOV indices into contiguous batches of size ``batch_size``.
 
-    Example:
-    fovs = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
-    batch_size = 3
-    Returns [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+@dataclass(frozen=True)
+class _FovDescriptor:
+    """Everything a worker process needs to run one step of one FOV.
+
+    Only metadata and file paths are shipped; image data is read from and
+    written to the memmap files in ``output_dir`` by the worker itself.
     """
-    batches: list[list[int]] = []
-    total_fovs = len(fovs)
-    for batch_start in range(0, total_fovs, batch_size):
-        batch_end = min(batch_start + batch_size, total_fovs)
-        batches.append(fovs[batch_start:batch_end])
-    return batches
+
+    metadata: MicroscopyMetadata
+    output_dir: Path
+    channels: Channels
+    params: dict
+    fov: int
+    results: ResultsPerFOV
 
 
-def _split_worker_ranges(fovs: list[int], n_workers: int) -> list[list[int]]:
-    """Split FOV indices into up to ``n_workers`` contiguous, evenly sized ranges.
+def _init_process_worker(cancel_event, plugin_dirs: Iterable[Path] = ()) -> None:
+    global _worker_cancel_event
+    _worker_cancel_event = cancel_event
+    # Spawned workers start with the built-in features only
+    for plugin_dir in plugin_dirs:
+        load_plugins(plugin_dir)
 
-    If ``n_workers`` <= 0, returns ``[fovs]`` if ``fovs`` is non-empty, otherwise ``[]``.
 
-    Example:
-    fovs = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
-    n_workers = 3
-    Returns [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+def _run_step_in_process(descriptor: _FovDescriptor, step: str) -> dict:
+    """Run one step for one FOV in a worker process.
+
+    Returns a dict with the step's ``metrics`` (``StepMetrics`` fields) and
+    either the FOV's results as a serialized ``ProcessingContext`` fragment
+    (``results``, to be folded into the parent context with
+    ``_merge_contexts``) or the ``error`` message, with ``cancelled`` telling
+    a cancellation apart from a failure.
     """
-    if n_workers <= 0:
-        return [fovs] if fovs else []
-    fovs_per_worker = len(fovs) // n_workers
-    remainder = len(fovs) % n_workers
-    worker_ranges: list[list[int]] = []
-    start_id = 0
-    for i in range(n_workers):
-        count = fovs_per_worker + (1 if i < remainder else 0)
-        if count > 0:
-            end_id = start_id + count
-            worker_ranges.append(fovs[start_id:end_id])
-            start_id = end_id
-    return worker_ranges
+    cancel_event = _worker_cancel_event
+    fov = descriptor.fov
+    if cancel_event is not None and cancel_event.is_set():
+        raise InterruptedError(f"FOV {fov}: cancelled before {step}")
+
+    context = ensure_context(
+        ProcessingContext(
+            output_dir=descriptor.output_dir,
+            channels=descriptor.channels,
+            results={fov: descriptor.results},
+            params=dict(descriptor.params),
+        )
+    )
+    service = _STEP_SERVICES[step]()
+    meter = StepMeter(
+        fov, step, descriptor.output_dir, cancel_event=cancel_event, cpu_scope="process"
+    )
+    service.set_progress_reporter(meter.on_progress)
+    # Errors travel back as strings: a (possibly unpicklable) reader exception
+    # would break the pool on the way back
+    error = None
+    cancelled = False
+    try:
+        with meter:
+            service.process_fov(
+                descriptor.metadata, context, descriptor.output_dir, fov, cancel_event
+            )
+    except InterruptedError as e:
+        error, cancelled = str(e), True
+    except Exception as e:
+        error = f"FOV {fov}: {step} failed: {e!r}\n{traceback.format_exc()}"
+    metrics = meter.metrics(context.results.get(fov), descriptor.metadata)
+    payload = {"metrics": asdict(metrics), "error": error, "cancelled": cancelled}
+    if error is None:
+        fragment = serialize_processing_results(
+            ProcessingContext(results=context.results)
+        )
+        # Only results travel back; time units and params stay with the parent
+        fragment.pop("time_units", None)
+        fragment.pop("params", None)
+        payload["results"] = fragment
+    return payload
+
+
+def _watch_cancel(source: threading.Event, target, stop: threading.Event) -> None:
+    """Mirror ``source`` into the cross-process ``target`` event until ``stop``."""
+    while not stop.is_set():
+        if source.wait(0.1):
+            target.set()
+            return
 
 
 def _merge_contexts(parent: ProcessingContext, child: ProcessingContext) -> None:
@@ -129,157 +203,290 @@ def _merge_contexts(parent: ProcessingContext, child: ProcessingContext) -> None
                 parent_entry.traces = child_entry.traces
 
 
-def run_single_worker(
-    fovs: list[int],
-    metadata: MicroscopyMetadata,
-    context: ProcessingContext,
-    cancel_event: threading.Event | None = None,
-) -> tuple[list[int], int, int, str, ProcessingContext]:
-    """Process a contiguous range of FOV indices through all pipeline steps.
+def _cleanup_fov_folders(output_dir: Path, fov_start: int, fov_end: int) -> None:
+    """Clean up FOV folders created during processing when cancelled.
 
-    Returns a tuple of (fovs, successful_count, failed_count, message).
+    Args:
+        output_dir: Output directory containing FOV folders
+        fov_start: Starting FOV index
+        fov_end: Ending FOV index
     """
-    logger = logging.getLogger(__name__)
-    successful_count = 0
-
     try:
-        context = ensure_context(context)
-        segmentation = SegmentationService()
-        background_estimation = BackgroundEstimationService()
-        tracking = TrackingService()
-        trace_extraction = ExtractionService()
+        if not output_dir or not output_dir.exists():
+            return
 
-        output_dir = context.output_dir
-        if output_dir is None:
-            raise ValueError("Processing context missing output_dir")
+        logger.info("Cleaning up FOV folders after cancellation")
 
-        logger.info("Processing FOVs %d-%d", fovs[0], fovs[-1])
+        # Remove only FOV directories for the range that was being processed
+        for fov_idx in range(fov_start, fov_end + 1):
+            fov_dir = output_dir / f"fov_{fov_idx:03d}"
+            if fov_dir.exists() and fov_dir.is_dir():
+                try:
+                    import shutil
 
-        # Check for cancellation before starting processing
-        if cancel_event and cancel_event.is_set():
-            logger.info(
-                f"Worker for FOVs {fovs[0]}-{fovs[-1]} cancelled before processing"
-            )
-            # Commented out cleanup to preserve partial results for debugging
-            # _cleanup_fov_folders(output_dir, fovs[0], fovs[-1])
-            return (fovs, 0, len(fovs), "Cancelled before processing", context)
+                    shutil.rmtree(fov_dir)
+                    logger.debug("Removed FOV directory: %s", fov_dir)
+                except Exception as e:
+                    logger.warning("Failed to remove FOV directory %s: %s", fov_dir, e)
 
-        logger.info("Starting Segmentation for FOVs %d-%d", fovs[0], fovs[-1])
-        segmentation.process_all_fovs(
-            metadata=metadata,
-            context=context,
-            output_dir=output_dir,
-            fov_start=fovs[0],
-            fov_end=fovs[-1],
-            cancel_event=cancel_event,
-        )
-        # Context merge happens automatically since we're using threads
-        # No need to send context through queue
+    except Exception as e:
+        logger.warning("Error during FOV folder cleanup: %s", e)
 
-        # Check for cancellation after segmentation
-        if cancel_event and cancel_event.is_set():
-            logger.info(
-                f"Worker for FOVs {fovs[0]}-{fovs[-1]} cancelled after segmentation"
-            )
-            # Commented out cleanup to preserve partial results for debugging
-            # _cleanup_fov_folders(output_dir, fovs[0], fovs[-1])
-            return (fovs, 1, len(fovs) - 1, "Cancelled after segmentation", context)
 
+def _write_combined_traces(
+    context: ProcessingContext, output_dir: Path, base_name: str
+) -> Path | None:
+    """Combine all per-FOV trace files into one Parquet file (row group per FOV)."""
+    trace_paths = {
+        fov: Path(entry.traces)
+        for fov, entry in (context.results or {}).items()
+        if entry.traces is not None and Path(entry.traces).exists()
+    }
+    if not trace_paths:
+        return None
+    out_path = output_dir / f"{base_name}_traces.parquet"
+    combined = combine_trace_files(trace_paths, out_path)
+    if combined is not None:
         logger.info(
-            "Starting Background Estimation for FOVs %d-%d", fovs[0], fovs[-1]
-        )
-        background_estimation.process_all_fovs(
-            metadata=metadata,
-            context=context,
-            output_dir=output_dir,
-            fov_start=fovs[0],
-            fov_end=fovs[-1],
-            cancel_event=cancel_event,
+            "Combined traces of %d FOVs written to %s", len(trace_paths), combined
         )
-        # Context merge happens automatically since we're using threads
-        # No need to send context through queue
+    return combined
 
-        # Check for cancellation after background estimation
-        if cancel_event and cancel_event.is_set():
-            logger.info(
-                f"Worker for FOVs {fovs[0]}-{fovs[-1]} cancelled after background estimation"
+
+def _validate_run_options(
+    worker_mode: str, n_workers: int | str, batch_size: int | str
+) -> bool:
+    """Log and return False if the worker options are invalid."""
+    if worker_mode not in WORKER_MODES:
+        logger.error(
+            "Invalid worker mode %r (expected one of %s)",
+            worker_mode,
+            ", ".join(WORKER_MODES),
+        )
+        return False
+    for name, value in (("n_workers", n_workers), ("batch_size", batch_size)):
+        if value != AUTO and (not isinstance(value, int) or value < 1):
+            logger.error(
+                "Invalid %s %r (expected a positive integer or %r)", name, value, AUTO
             )
-            # Commented out cleanup to preserve partial results for debugging
-            # _cleanup_fov_folders(output_dir, fovs[0], fovs[-1])
-            return (fovs, 2, len(fovs) - 2, "Cancelled after background estimation", context)
+            return False
+    return True
 
-        logger.info("Starting Tracking for FOVs %d-%d", fovs[0], fovs[-1])
-        tracking.process_all_fovs(
-            metadata=metadata,
-            context=context,
-            output_dir=output_dir,
-            fov_start=fovs[0],
-            fov_end=fovs[-1],
-            cancel_event=cancel_event,
+
+def _resolve_worker_counts(
+    metadata: MicroscopyMetadata,
+    context: ProcessingContext,
+    n_fovs: int,
+    n_workers: int | str,
+    batch_size: int | str,
+    worker_mode: str,
+) -> tuple[int, int]:
+    """Replace ``"auto"`` worker counts by the resource plan's choice."""
+    if AUTO not in (n_workers, batch_size):
+        return n_workers, batch_size
+    plan = plan_resources(
+        metadata,
+        context.channels,
+        n_fovs,
+        params=context.params,
+        worker_mode=worker_mode,
+    )
+    logger.info("Resource plan: %s", plan.describe())
+    if plan.available_bytes is not None and plan.worker_bytes > plan.available_bytes:
+        logger.warning(
+            "A single worker is estimated to need more memory than is available"
         )
-        # Context merge happens automatically since we're using threads
-        # No need to send context through queue
+    if n_workers == AUTO:
+        n_workers = plan.n_workers
+    if batch_size == AUTO:
+        batch_size = plan.batch_size
+    return n_workers, batch_size
 
-        # Check for cancellation after tracking
-        if cancel_event and cancel_event.is_set():
+
+def _process_fovs(
+    metadata: MicroscopyMetadata,
+    context: ProcessingContext,
+    fovs: Iterable[int],
+    n_workers: int,
+    batch_size: int,
+    cancel_event: threading.Event | None,
+    worker_mode: str,
+    progress_reporter: Callable[[dict], None] | None,
+    run_metrics: RunMetrics,
+    on_fov_done: Callable[[int, bool], None] | None = None,
+) -> ScheduleResult:
+    """Run every step of ``fovs`` into ``context`` and return the schedule.
+
+    ``fovs`` is consumed lazily (see ``run_task_graph``). Orphaned partial
+    outputs of each FOV are removed when the FOV is admitted, so only FOVs
+    this call processes are touched.
+    """
+    output_dir = context.output_dir
+    services = {step: service() for step, service in _STEP_SERVICES.items()}
+    # Meters of the running thread-mode tasks, for routing progress events
+    meters: dict[tuple[int, str], StepMeter] = {}
+
+    def _on_progress(step: str, event: dict) -> None:
+        meter = meters.get((event.get("fov"), step))
+        if meter is not None:
+            meter.on_progress(event)
+        if progress_reporter is not None:
+            try:
+                progress_reporter(event)
+            except Exception as e:
+                logger.warning("Progress reporter failed: %s", e)
+
+    for step, service in services.items():
+        service.set_progress_reporter(partial(_on_progress, step))
+
+    def _record_metrics(metrics: StepMetrics) -> None:
+        run_metrics.add(metrics)
+        if metrics.status != "skipped":
             logger.info(
-                f"Worker for FOVs {fovs[0]}-{fovs[-1]} cancelled after tracking"
+                "FOV %d: %s %s in %.2fs (%.2fs CPU, %d frames)",
+                metrics.fov,
+                metrics.step,
+                metrics.status,
+                metrics.wall_time_s,
+                metrics.cpu_time_s,
+                metrics.frames,
             )
-            # Commented out cleanup to preserve partial results for debugging
-            # _cleanup_fov_folders(output_dir, fovs[0], fovs[-1])
-            return (fovs, 3, len(fovs) - 3, "Cancelled after tracking", context)
+        if progress_reporter is not None:
+            try:
+                progress_reporter(metrics.to_event())
+            except Exception as e:
+                logger.warning("Progress reporter failed: %s", e)
+
+    # Thread-scoped CPU time misses the threads of a multi-threaded extraction
+    try:
+        extraction_threads = int(context.params.get("extraction_threads", 1))
+    except (TypeError, ValueError):
+        extraction_threads = 1
+
+    def _run_task(fov: int, step: str) -> None:
+        # Cancellation between steps; running steps check the event themselves
+        if cancel_event and cancel_event.is_set():
+            raise InterruptedError(f"FOV {fov}: cancelled before {step}")
+        meter = StepMeter(
+            fov,
+            step,
+            output_dir,
+            cancel_event=cancel_event,
+            cpu_partial=step == "extraction" and extraction_threads > 1,
+        )
+        meters[(fov, step)] = meter
+        try:
+            with meter:
+                services[step].process_fov(
+                    metadata, context, output_dir, fov, cancel_event
+                )
+        finally:
+            del meters[(fov, step)]
+            _record_metrics(meter.metrics(context.results.get(fov), metadata))
 
-        logger.info("Starting Extraction for FOVs %d-%d", fovs[0], fovs[-1])
-        trace_extraction.process_all_fovs(
+    def _describe_task(fov: int, step: str) -> tuple[_FovDescriptor, str]:
+        entry = context.results.setdefault(fov, ensure_results_entry())
+        descriptor = _FovDescriptor(
             metadata=metadata,
-            context=context,
             output_dir=output_dir,
-            fov_start=fovs[0],
-            fov_end=fovs[-1],
+            channels=context.channels,
+            params=dict(context.params),
+            fov=fov,
+            results=entry,
+        )
+        return descriptor, step
+
+    def _collect_task_result(fov: int, step: str, payload: dict) -> None:
+        _record_metrics(StepMetrics(**payload["metrics"]))
+        if payload["cancelled"]:
+            raise InterruptedError(payload["error"])
+        if payload["error"] is not None:
+            raise RuntimeError(payload["error"])
+        _merge_contexts(context, deserialize_from_dict(payload["results"]))
+
+    def _admit(fovs: Iterable[int]) -> Iterator[int]:
+        for fov in fovs:
+            # Outputs of an interrupted run are only ever half-written under a
+            # temporary name; remove them so they are not mistaken for results
+            removed = cleanup_partial_outputs(output_dir / f"fov_{fov:03d}")
+            if removed:
+                logger.info(
+                    "FOV %d: Removed %d partial output(s) of a previous run",
+                    fov,
+                    len(removed),
+                )
+            yield fov
+
+    if worker_mode == "thread":
+        return run_task_graph(
+            _admit(fovs),
+            _run_task,
+            n_workers=n_workers,
+            max_in_flight=batch_size,
             cancel_event=cancel_event,
+            on_fov_done=on_fov_done,
         )
-        # Context merge happens automatically since we're using threads
-        # No need to send context through queue
-
-        successful_count = len(fovs)
-        success_msg = f"Completed processing FOVs {fovs[0]}-{fovs[-1]}"
-        logger.info("Completed processing FOVs %d-%d", fovs[0], fovs[-1])
-        return fovs, successful_count, 0, success_msg, context
-
-    except Exception as e:
-        logger.exception("Error processing FOVs %d-%d", fovs[0], fovs[-1])
-        error_msg = f"Error processing FOVs {fovs[0]}-{fovs[-1]}: {str(e)}"
-        return fovs, 0, len(fovs), error_msg, context
 
+    mp_context = multiprocessing.get_context("spawn")
+    shared_cancel = mp_context.Event()
+    stop_watching = threading.Event()
+    watcher = None
+    if cancel_event is not None:
+        watcher = threading.Thread(
+            target=_watch_cancel,
+            args=(cancel_event, shared_cancel, stop_watching),
+            daemon=True,
+        )
+        watcher.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=mp_context,
+            initializer=_init_process_worker,
+            initargs=(shared_cancel, plugin_feature_dirs()),
+        ) as executor:
+            return run_task_graph(
+                _admit(fovs),
+                _run_step_in_process,
+                n_workers=n_workers,
+                max_in_flight=batch_size,
+                cancel_event=cancel_event,
+                on_fov_done=on_fov_done,
+                executor=executor,
+                task_args=_describe_task,
+                on_task_done=_collect_task_result,
+            )
+    finally:
+        stop_watching.set()
+        if watcher is not None:
+            watcher.join()
 
-def _cleanup_fov_folders(output_dir: Path, fov_start: int, fov_end: int) -> None:
-    """Clean up FOV folders created during processing when cancelled.
 
-    Args:
-        output_dir: Output directory containing FOV folders
-        fov_start: Starting FOV index
-        fov_end: Ending FOV index
-    """
-    try:
-        if not output_dir or not output_dir.exists():
-            return
+def _save_results(context: ProcessingContext, output_dir: Path) -> ProcessingContext:
+    """Merge ``context`` into ``processing_results.yaml`` and return the merge."""
+    yaml_path = output_dir / "processing_results.yaml"
 
-        logger.info("Cleaning up FOV folders after cancellation")
+    # Read existing results if file exists
+    existing_context = ProcessingContext()
+    if yaml_path.exists():
+        try:
+            with yaml_path.open("r", encoding="utf-8") as f:
+                existing_dict = yaml.safe_load(f) or {}
+            logger.info("Loaded existing results from %s", yaml_path)
 
-        # Remove only FOV directories for the range that was being processed
-        for fov_idx in range(fov_start, fov_end + 1):
-            fov_dir = output_dir / f"fov_{fov_idx:03d}"
-            if fov_dir.exists() and fov_dir.is_dir():
-                try:
-                    import shutil
+            # Convert dict back to ProcessingContext
+            existing_context = deserialize_from_dict(existing_dict)
+        except Exception as e:
+            logger.warning("Could not read existing %s: %s", yaml_path, e)
+            existing_context = ProcessingContext()
 
-                    shutil.rmtree(fov_dir)
-                    logger.debug("Removed FOV directory: %s", fov_dir)
-                except Exception as e:
-                    logger.warning("Failed to remove FOV directory %s: %s", fov_dir, e)
+    # Merge new context into existing context
+    merged_context = ensure_context(existing_context)
+    _merge_contexts(merged_context, context)
 
-    except Exception as e:
-        logger.warning("Error during FOV folder cleanup: %s", e)
+    # Save using unified function (time_units will be set by save function)
+    save_processing_results_yaml(merged_context, output_dir, time_units="min")
+    return merged_context
 
 
 def run_complete_workflow(
@@ -287,20 +494,58 @@ def run_complete_workflow(
     context: ProcessingContext,
     fov_start: int | None = None,
     fov_end: int | None = None,
-    batch_size: int = 2,
-    n_workers: int = 2,
+    batch_size: int | str = 2,
+    n_workers: int | str = 2,
     cancel_event: threading.Event | None = None,
+    worker_mode: str = "thread",
+    progress_reporter: Callable[[dict], None] | None = None,
+    results_dir: Path | None = None,
 ) -> bool:
+    """Run copy, segmentation, background, tracking and extraction for a FOV range.
+
+    Each (FOV, step) is scheduled as soon as its inputs exist (see
+    ``scheduler.STEP_DEPENDENCIES``). ``n_workers`` bounds the number of
+    concurrently running steps and ``batch_size`` the number of FOVs in
+    flight, so a slow FOV never blocks the others.
+
+    With ``worker_mode="process"`` steps run in a pool of ``n_workers``
+    processes instead of threads, so GIL-bound Python loops scale across
+    cores. Workers receive lightweight FOV descriptors, read and write the
+    memmap files directly and send back serialized context fragments that
+    are merged into ``context``; ``cancel_event`` is mirrored into an event
+    shared with the workers.
+
+    ``n_workers`` and/or ``batch_size`` may be ``"auto"``: they are then
+    chosen from the estimated per-step memory, the available memory and the
+    CPU count (see ``tuning.plan_resources``) and the plan is logged.
+
+    Every (FOV, step) is measured (see ``metrics.StepMeter``). The metrics
+    are passed to ``progress_reporter`` as ``{"event": "metrics", ...}``
+    events and written to ``run_metrics.json`` in the output directory;
+    in thread mode the reporter also receives the steps' per-frame progress
+    events (``step``, ``fov``, ``t``, ``T``, ``message``).
+
+    ``processing_results.yaml``, ``run_metrics.json`` and the combined
+    trace table are written to ``results_dir`` (default: the output
+    directory); FOV folders always go to the output directory. Runs of
+    disjoint FOV ranges with their own ``results_dir`` can share one output
+    directory (see ``shards.combine_shard_results``).
+    """
     context = ensure_context(context)
     overall_success = False
 
-    copy_service = CopyingService()
+    if not _validate_run_options(worker_mode, n_workers, batch_size):
+        return False
+
+    run_metrics = RunMetrics()
 
     try:
         output_dir = context.output_dir
         if output_dir is None:
             raise ValueError("Processing context missing output_dir")
         output_dir.mkdir(parents=True, exist_ok=True)
+        results_dir = Path(results_dir) if results_dir is not None else output_dir
+        results_dir.mkdir(parents=True, exist_ok=True)
 
         n_fov = metadata.n_fovs
         # Handle None or -1 as "process all FOVs"
@@ -318,155 +563,88 @@ def run_complete_workflow(
         total_fovs = fov_end - fov_start + 1
         fov_indices = list(range(fov_start, fov_end + 1))
 
-        # logger.info(f"Initial context:\n{pformat(context)}")
+        n_workers, batch_size = _resolve_worker_counts(
+            metadata, context, total_fovs, n_workers, batch_size, worker_mode
+        )
 
-        completed_fovs = 0
+        finished_fovs: list[int] = []
 
-        batches = _compute_batches(fov_indices, batch_size)
-        precomputed_worker_ranges = [
-            _split_worker_ranges(batch_fovs, n_workers) for batch_fovs in batches
-        ]
+        def _on_fov_done(fov: int, success: bool) -> None:
+            if success:
+                logger.info("FOV %d: All steps completed", fov)
+            else:
+                logger.error("FOV %d: Processing failed", fov)
+            finished_fovs.append(fov)
+            logger.info("Progress: %d%%", int(len(finished_fovs) / total_fovs * 100))
 
-        for batch_id, batch_fovs in enumerate(batches):
-            # Check for cancellation before starting batch
-            if cancel_event and cancel_event.is_set():
-                logger.info("Workflow cancelled before batch processing")
-                # Commented out cleanup to preserve partial results for debugging
-                # _cleanup_fov_folders(output_dir, fov_start, fov_end)
-                return False
+        logger.info(
+            "Processing FOVs %d-%d with %d %s workers (at most %d FOVs in flight)",
+            fov_start,
+            fov_end,
+            n_workers,
+            worker_mode,
+            batch_size,
+        )
+        schedule = _process_fovs(
+            metadata,
+            context,
+            fov_indices,
+            n_workers,
+            batch_size,
+            cancel_event,
+            worker_mode,
+            progress_reporter,
+            run_metrics,
+            on_fov_done=_on_fov_done,
+        )
 
-            logger.info("Extracting batch: FOVs %d-%d", batch_fovs[0], batch_fovs[-1])
-            try:
-                copy_service.process_all_fovs(
-                    metadata=metadata,
-                    context=context,
-                    output_dir=output_dir,
-                    fov_start=batch_fovs[0],
-                    fov_end=batch_fovs[-1],
-                    cancel_event=cancel_event,
-                )
-                # logger.info(f"After Copy context:\n{pformat(context)}")
-            except Exception as e:
-                logger.error(
-                    "Failed to extract batch starting at FOV %d: %s",
-                    batch_fovs[0],
-                    e,
-                )
-                return False
+        try:
+            metrics_path = run_metrics.write(
+                results_dir,
+                fov_start=fov_start,
+                fov_end=fov_end,
+                worker_mode=worker_mode,
+                n_workers=n_workers,
+                batch_size=batch_size,
+                completed=sorted(schedule.completed),
+                failed=sorted(schedule.failed),
+                cancelled=schedule.cancelled,
+            )
+            logger.info("Wrote run metrics to %s", metrics_path)
+        except Exception as e:
+            logger.warning("Failed to write run metrics: %s", e)
 
-            # Check for cancellation after copying
-            if cancel_event and cancel_event.is_set():
-                logger.info(
-                    "Workflow cancelled after copying, before parallel processing"
-                )
-                # Commented out cleanup to preserve partial results for debugging
-                # _cleanup_fov_folders(output_dir, fov_start, fov_end)
-                return False
-
-            logger.info("Processing batch in parallel with %d workers", n_workers)
-
-            with ThreadPoolExecutor(max_workers=n_workers) as executor:
-                worker_ranges = precomputed_worker_ranges[batch_id]
-
-                futures = {
-                    executor.submit(
-                        run_single_worker,
-                        fov_range,
-                        metadata,
-                        context,
-                        cancel_event,
-                    ): fov_range
-                    for fov_range in worker_ranges
-                    if fov_range
-                }
-
-                # Process futures with cancellation support
-                # No timeout - let users cancel manually if needed
-                for future in as_completed(futures):
-                    # Check for cancellation after each future completes
-                    if cancel_event and cancel_event.is_set():
-                        logger.info("Workflow cancelled during parallel processing")
-                        # Cancel remaining futures
-                        for remaining_future in futures:
-                            if not remaining_future.done():
-                                remaining_future.cancel()
-                        # Commented out cleanup to preserve partial results for debugging
-                        # _cleanup_fov_folders(output_dir, fov_start, fov_end)
-                        return False
-
-                    fov_range = futures[future]
-                    try:
-                        fov_indices_res, successful, failed, message, worker_ctx = (
-                            future.result()
-                        )
-                        logger.debug(
-                            "Merged context from worker %d-%d",
-                            fov_indices_res[0],
-                            fov_indices_res[-1],
-                        )
-                        # Merge worker's context back into parent
-                        try:
-                            _merge_contexts(context, worker_ctx)
-                        except Exception:
-                            logger.warning(
-                                "Failed to merge context from worker %d-%d",
-                                fov_indices_res[0],
-                                fov_indices_res[-1],
-                            )
-                        completed_fovs += successful
-                        if failed > 0:
-                            logger.error(
-                                "%d FOVs failed in range %d-%d",
-                                failed,
-                                fov_indices_res[0],
-                                fov_indices_res[-1],
-                            )
-                    except Exception as e:
-                        error_msg = (
-                            f"Worker exception for FOVs {fov_range[0]}-{fov_range[-1]}: {str(e)}"
-                        )
-                        logger.error(error_msg)
-
-                    progress = int(completed_fovs / total_fovs * 100)
-                    logger.info("Progress: %d%%", progress)
-
-        # Final cancellation check after all batches
-        if cancel_event and cancel_event.is_set():
-            logger.info("Workflow cancelled after batch processing")
+        if schedule.cancelled or (cancel_event and cancel_event.is_set()):
+            logger.info("Workflow cancelled during processing")
             # Commented out cleanup to preserve partial results for debugging
             # _cleanup_fov_folders(output_dir, fov_start, fov_end)
             return False
 
+        completed_fovs = len(schedule.completed)
+        if schedule.failed:
+            logger.error(
+                "%d FOVs failed: %s",
+                len(schedule.failed),
+                ", ".join(str(fov) for fov in sorted(schedule.failed)),
+            )
+
         overall_success = completed_fovs == total_fovs
         logger.info("Completed processing %d/%d FOVs", completed_fovs, total_fovs)
 
         # Persist merged final context for downstream consumers
+        merged_context = context
         try:
-            yaml_path = output_dir / "processing_results.yaml"
-
-            # Read existing results if file exists
-            existing_context = ProcessingContext()
-            if yaml_path.exists():
-                try:
-                    with yaml_path.open("r", encoding="utf-8") as f:
-                        existing_dict = yaml.safe_load(f) or {}
-                    logger.info("Loaded existing results from %s", yaml_path)
-
-                    # Convert dict back to ProcessingContext
-                    existing_context = deserialize_from_dict(existing_dict)
-                except Exception as e:
-                    logger.warning("Could not read existing %s: %s", yaml_path, e)
-                    existing_context = ProcessingContext()
-
-            # Merge new context into existing context
-            merged_context = ensure_context(existing_context)
-            _merge_contexts(merged_context, context)
-
-            # Save using unified function (time_units will be set by save function)
-            save_processing_results_yaml(merged_context, output_dir, time_units="min")
+            merged_context = _save_results(context, results_dir)
         except Exception as e:
             logger.warning("Failed to write processing_results.yaml: %s", e)
 
+        # Optional project-level trace table with one row group per FOV
+        if context.params and context.params.get("combine_traces", False):
+            try:
+                _write_combined_traces(merged_context, results_dir, metadata.base_name)
+            except Exception as e:
+                logger.warning("Failed to write combined traces: %s", e)
+
         return overall_success
     except Exception as e:
         error_msg = f"Error in workflow pipeline: {str(e)}"
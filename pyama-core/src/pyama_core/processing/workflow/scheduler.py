@@ -0,0 +1,210 @@
+"""
+FOV-level task graph scheduler for the processing workflow.
+
+Every (FOV, step) pair is a task that becomes ready as soon as the steps it
+depends on have finished for the same FOV. Ready tasks are dispatched to a
+worker pool immediately, so one slow FOV never holds back the others; the
+number of FOVs in flight (started but not finished) is bounded instead of
+processing FOVs in fixed batches.
+"""
+
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Step -> steps of the same FOV whose outputs it reads
+STEP_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "copy": (),
+    "segmentation": ("copy",),
+    "background": ("segmentation",),
+    "tracking": ("segmentation",),
+    "extraction": ("background", "tracking"),
+}
+
+# Copying reads the raw microscopy file; keep a single reader at a time
+DEFAULT_STEP_LIMITS: dict[str, int] = {"copy": 1}
+
+
+@dataclass
+class ScheduleResult:
+    """Outcome of a scheduler run.
+
+    Attributes:
+        completed: FOVs that finished every step, in completion order.
+        failed: FOVs where a step raised; their downstream steps were skipped.
+        cancelled: True if the run stopped early because of ``cancel_event``.
+    """
+
+    completed: list[int] = field(default_factory=list)
+    failed: list[int] = field(default_factory=list)
+    cancelled: bool = False
+
+
+def run_task_graph(
+    fovs: Iterable[int],
+    run_task: Callable[..., Any],
+    n_workers: int = 2,
+    max_in_flight: int = 2,
+    dependencies: Mapping[str, tuple[str, ...]] = STEP_DEPENDENCIES,
+    step_limits: Mapping[str, int] | None = None,
+    cancel_event: threading.Event | None = None,
+    on_fov_done: Callable[[int, bool], None] | None = None,
+    executor: Executor | None = None,
+    task_args: Callable[[int, str], tuple] | None = None,
+    on_task_done: Callable[[int, str, Any], None] | None = None,
+) -> ScheduleResult:
+    """Run every step of every FOV as soon as its dependencies are satisfied.
+
+    Args:
+        fovs: FOV indices, admitted in this order. The iterable is consumed
+            lazily, one FOV whenever a slot opens, so it may claim work
+            from a shared queue.
+        run_task: Called as ``run_task(fov, step)`` (or with ``task_args``);
+            raising marks the FOV failed.
+        n_workers: Maximum number of tasks running at once.
+        max_in_flight: Maximum number of FOVs started but not yet finished.
+        dependencies: Step name -> names of the steps it depends on. Steps are
+            preferred in the mapping's order when several are ready.
+        step_limits: Optional per-step concurrency caps; defaults to
+            ``DEFAULT_STEP_LIMITS``.
+        cancel_event: When set, no further tasks are dispatched; running tasks
+            are awaited (they observe the same event) before returning.
+        on_fov_done: Called as ``on_fov_done(fov, success)`` when a FOV leaves
+            the pipeline.
+        executor: Executor to submit tasks to; a ``ThreadPoolExecutor`` with
+            ``n_workers`` threads is created (and shut down) when omitted.
+        task_args: Builds the positional arguments of ``run_task`` for a
+            task right before it is submitted, after all its dependencies
+            were reported to ``on_task_done``; defaults to ``(fov, step)``.
+        on_task_done: Called as ``on_task_done(fov, step, value)`` in the
+            scheduling thread with the return value of each successful task.
+
+    Returns:
+        ``ScheduleResult`` with completed and failed FOVs.
+    """
+    steps = list(dependencies)
+    for step, deps in dependencies.items():
+        unknown = [dep for dep in deps if dep not in dependencies]
+        if unknown:
+            raise ValueError(f"Step {step!r} depends on unknown steps {unknown}")
+    limits = DEFAULT_STEP_LIMITS if step_limits is None else step_limits
+    n_workers = max(1, int(n_workers))
+    max_in_flight = max(1, int(max_in_flight))
+
+    pending = iter(fovs)
+    exhausted = False
+    # FOV -> finished steps, in admission order (older FOVs are served first)
+    active: dict[int, set[str]] = {}
+    started: dict[int, set[str]] = {}
+    running: dict[Future, tuple[int, str]] = {}
+    running_per_step: Counter[str] = Counter()
+    running_per_fov: Counter[int] = Counter()
+    broken: set[int] = set()
+    result = ScheduleResult()
+
+    def _cancelled() -> bool:
+        return bool(cancel_event and cancel_event.is_set())
+
+    def _retire(fov: int, success: bool) -> None:
+        del active[fov]
+        del started[fov]
+        (result.completed if success else result.failed).append(fov)
+        if on_fov_done is not None:
+            on_fov_done(fov, success)
+
+    owns_executor = executor is None
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=n_workers)
+    try:
+        while not exhausted or active:
+            if _cancelled():
+                result.cancelled = True
+                break
+
+            while not exhausted and len(active) < max_in_flight:
+                fov = next(pending, None)
+                if fov is None:
+                    exhausted = True
+                    break
+                active[fov] = set()
+                started[fov] = set()
+            if not active:
+                break
+
+            for fov, done in active.items():
+                if len(running) >= n_workers:
+                    break
+                if fov in broken:
+                    continue
+                for step in steps:
+                    if len(running) >= n_workers:
+                        break
+                    if step in started[fov]:
+                        continue
+                    if not all(dep in done for dep in dependencies[step]):
+                        continue
+                    limit = limits.get(step)
+                    if limit is not None and running_per_step[step] >= limit:
+                        continue
+                    started[fov].add(step)
+                    running_per_step[step] += 1
+                    running_per_fov[fov] += 1
+                    args = (fov, step) if task_args is None else task_args(fov, step)
+                    running[executor.submit(run_task, *args)] = (fov, step)
+
+            if not running:
+                # Nothing can make progress (e.g. a dependency cycle)
+                raise RuntimeError(
+                    f"Task graph stalled with FOVs {sorted(active)} unfinished"
+                )
+
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                fov, step = running.pop(future)
+                running_per_step[step] -= 1
+                running_per_fov[fov] -= 1
+                try:
+                    value = future.result()
+                    if on_task_done is not None:
+                        on_task_done(fov, step, value)
+                except Exception:
+                    logger.exception("FOV %d: %s step failed", fov, step)
+                    broken.add(fov)
+                else:
+                    active[fov].add(step)
+
+                if fov in broken:
+                    if running_per_fov[fov] == 0:
+                        _retire(fov, False)
+                elif len(active[fov]) == len(steps):
+                    _retire(fov, True)
+
+        # Let tasks that were already running observe cancellation and finish
+        if running:
+            wait(list(running))
+            for future, (fov, step) in running.items():
+                try:
+                    value = future.result()
+                    if on_task_done is not None:
+                        on_task_done(fov, step, value)
+                except Exception:
+                    logger.exception("FOV %d: %s step failed", fov, step)
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True)
+
+    return result
+
+
+__all__ = [
+    "STEP_DEPENDENCIES",
+    "DEFAULT_STEP_LIMITS",
+    "ScheduleResult",
+    "run_task_graph",
+]
@@ -29,7 +29,11 @@ class BaseProcessingService:
         self._progress_reporter = reporter
 
     def progress_callback(self, f: int, t: int, T: int, message: str):
-        """Log coarse progress for long-running loops (every 30 steps)."""
+        """Report progress to the reporter and log it coarsely (every 30 steps)."""
+        if self._progress_reporter is not None:
+            self._progress_reporter(
+                {"step": self.name, "fov": f, "t": t, "T": T, "message": message}
+            )
         if t % 30 == 0:
             logger.info("FOV %d: %s (%d/%d)", f, message, t, T)
 
@@ -7,6 +7,14 @@ import numpy as np
 import logging
 from numpy.lib.format import open_memmap
 
+from pyama_core.io.atomic import commit_partial, discard_partial, partial_path
+from pyama_core.processing.workflow.provenance import (
+    clear_provenance,
+    describe_mismatch,
+    is_current,
+    step_provenance,
+    write_provenance,
+)
 from pyama_core.processing.workflow.services.base import BaseProcessingService
 from pyama_core.io import (
     MicroscopyMetadata,
@@ -60,10 +68,13 @@ class CopyingService(BaseProcessingService):
             token = "pc" if kind == "pc" else "fl"
             ch_path = fov_dir / f"{base_name}_fov_{fov:03d}_{token}_ch_{ch}.npy"
 
-            # If output already exists, record it and skip processing for this channel
-            if Path(ch_path).exists():
+            provenance = step_provenance(
+                "copy", [metadata.file_path], {"fov": fov, "channel": int(ch)}
+            )
+            # If output is up to date, record it and skip processing for this channel
+            if is_current(ch_path, provenance):
                 logger.info(
-                    "FOV %d: %s channel %s already exists, skipping copy",
+                    "FOV %d: %s channel %s is up to date, skipping copy",
                     fov,
                     token.upper(),
                     ch,
@@ -75,12 +86,22 @@ class CopyingService(BaseProcessingService):
                     fov_paths.pc = (int(ch), Path(ch_path))
                 continue
 
+            if Path(ch_path).exists():
+                logger.info(
+                    "FOV %d: %s channel %s is out of date (%s), copying again",
+                    fov,
+                    token.upper(),
+                    ch,
+                    describe_mismatch(ch_path, provenance),
+                )
+            clear_provenance(ch_path)
+
             # Create memory-mapped array and write data
             logger.info("FOV %d: Copying %s channel %s...", fov, kind.upper(), ch)
             ch_memmap = None
             try:
                 ch_memmap = open_memmap(
-                    ch_path, mode="w+", dtype=np.uint16, shape=(T, H, W)
+                    partial_path(ch_path), mode="w+", dtype=np.uint16, shape=(T, H, W)
                 )
                 for t in range(T):
                     # Check for cancellation before processing each frame
@@ -94,7 +115,7 @@ class CopyingService(BaseProcessingService):
                         # Clean up the memmap file since copying was interrupted
                         try:
                             del ch_memmap
-                            ch_path.unlink(missing_ok=True)  # Remove partial file
+                            discard_partial(ch_path)
                         except Exception:
                             pass
                         return
@@ -109,6 +130,7 @@ class CopyingService(BaseProcessingService):
                         del ch_memmap
                     except Exception:
                         pass
+                discard_partial(ch_path)
                 raise
             finally:
                 if ch_memmap is not None:
@@ -117,6 +139,8 @@ class CopyingService(BaseProcessingService):
                     except Exception:
                         pass
 
+            commit_partial(ch_path)
+            write_provenance(ch_path, provenance)
             fov_paths = context.results.setdefault(fov, ensure_results_entry())
             if kind == "fl":
                 fov_paths.fl.append((int(ch), Path(ch_path)))
@@ -11,6 +11,14 @@ from numpy.lib.format import open_memmap
 import logging
 from functools import partial
 
+from pyama_core.io.atomic import commit_partial, discard_partial, partial_path
+from pyama_core.processing.workflow.provenance import (
+    clear_provenance,
+    describe_mismatch,
+    is_current,
+    step_provenance,
+    write_provenance,
+)
 from pyama_core.processing.workflow.services.base import BaseProcessingService
 from pyama_core.processing.background import estimate_background
 from pyama_core.io import MicroscopyMetadata
@@ -84,10 +92,15 @@ class BackgroundEstimationService(BaseProcessingService):
             background_path = (
                 fov_dir / f"{base_name}_fov_{fov:03d}_fl_background_ch_{ch}.npy"
             )
-            # If output exists, record and skip this channel
-            if Path(background_path).exists():
+            provenance = step_provenance(
+                "background",
+                [fl_raw_path, seg_path],
+                algorithm=estimate_background,
+            )
+            # If output is up to date, record and skip this channel
+            if is_current(background_path, provenance):
                 logger.info(
-                    "FOV %d: Background interpolation for ch %s already exists, skipping",
+                    "FOV %d: Background interpolation for ch %s is up to date, skipping",
                     fov,
                     ch,
                 )
@@ -97,6 +110,15 @@ class BackgroundEstimationService(BaseProcessingService):
                     pass
                 continue
 
+            if Path(background_path).exists():
+                logger.info(
+                    "FOV %d: Background interpolation for ch %s is out of date (%s), recomputing",
+                    fov,
+                    ch,
+                    describe_mismatch(background_path, provenance),
+                )
+            clear_provenance(background_path)
+
             logger.info("FOV %d: Loading fluorescence data for channel %s...", fov, ch)
             fluor_data = open_memmap(fl_raw_path, mode="r")
 
@@ -117,7 +139,7 @@ class BackgroundEstimationService(BaseProcessingService):
                 raise ValueError(error_msg)
 
             background_memmap = open_memmap(
-                background_path,
+                partial_path(background_path),
                 mode="w+",
                 dtype=np.float32,
                 shape=(n_frames, height, width),
@@ -136,14 +158,21 @@ class BackgroundEstimationService(BaseProcessingService):
                 )
                 # Flush changes to disk
                 background_memmap.flush()
-            except InterruptedError:
+            except BaseException:
                 if background_memmap is not None:
                     del background_memmap
+                discard_partial(background_path)
                 raise
 
             logger.info("FOV %d: Cleaning up channel %s...", fov, ch)
             if background_memmap is not None:
                 del background_memmap
+            if cancel_event and cancel_event.is_set():
+                logger.info("FOV %d: Background estimation cancelled", fov)
+                discard_partial(background_path)
+                return
+            commit_partial(background_path)
+            write_provenance(background_path, provenance)
 
             # Record output tuple
             try:
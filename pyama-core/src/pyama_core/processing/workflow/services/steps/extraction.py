@@ -3,7 +3,7 @@ Trace extraction processing service.
 """
 
 import logging
-from dataclasses import fields as dataclass_fields
+from dataclasses import fields as dataclass_fields, replace
 from functools import partial
 from pathlib import Path
 
@@ -12,23 +12,70 @@ import pandas as pd
 from numpy.lib.format import open_memmap
 
 from pyama_core.io import MicroscopyMetadata
-from pyama_core.processing.extraction import extract_trace
+from pyama_core.io.processing_csv import (
+    get_dataframe,
+    read_trace_manifest,
+    trace_file_suffix,
+    write_trace_manifest,
+    write_trace_table,
+)
+from pyama_core.processing.extraction import extract_traces
+from pyama_core.processing.extraction.features import list_features
 from pyama_core.types.processing import (
+    ExtractionChannel,
     ProcessingContext,
     Result,
     ensure_context,
     ensure_results_entry,
 )
+from pyama_core.processing.workflow.provenance import (
+    clear_provenance,
+    describe_mismatch,
+    input_digest,
+    is_current,
+    step_provenance,
+    write_provenance,
+)
 from pyama_core.processing.workflow.services.base import BaseProcessingService
 
 logger = logging.getLogger(__name__)
 
+# Default trace filters: minimum frames per cell and border exclusion (pixels)
+MIN_TRACE_LENGTH = 30
+BORDER_WIDTH = 50
+
 
 class ExtractionService(BaseProcessingService):
     def __init__(self) -> None:
         super().__init__()
         self.name = "Extraction"
 
+    def _load_existing_traces(
+        self, traces_path: Path, row_params: dict, fov: int
+    ) -> tuple[pd.DataFrame | None, dict]:
+        """Load an existing traces file for incremental extraction.
+
+        Returns the traces and the recorded column specs, or ``(None, {})``
+        when the file must be recomputed (unreadable, empty, or written with
+        different trace filters, which changes the rows).
+        """
+        manifest = read_trace_manifest(traces_path)
+        if manifest is None:
+            return None, {}
+        if manifest.get("rows") != row_params:
+            logger.info(
+                "FOV %d: Trace filters changed (%s -> %s), recomputing all traces",
+                fov,
+                manifest.get("rows"),
+                row_params,
+            )
+            return None, {}
+        try:
+            existing_df = get_dataframe(traces_path)
+        except ValueError:
+            return None, {}
+        return existing_df, dict(manifest["columns"])
+
     def process_fov(
         self,
         metadata: MicroscopyMetadata,
@@ -43,6 +90,10 @@ class ExtractionService(BaseProcessingService):
         # Get background weight from params (default: 1.0)
         background_weight = 1.0
         erosion_size = 0
+        min_trace_length = MIN_TRACE_LENGTH
+        border_width = BORDER_WIDTH
+        traces_suffix = trace_file_suffix("csv")
+        extraction_threads = 1
         if context.params:
             background_weight = context.params.get("background_weight", 1.0)
             try:
@@ -79,6 +130,45 @@ class ExtractionService(BaseProcessingService):
                 )
                 erosion_size = 0
 
+            # Get trace filter thresholds from params (defaults: 30 frames, 50 pixels)
+            min_trace_length = context.params.get(
+                "min_trace_length", MIN_TRACE_LENGTH
+            )
+            try:
+                min_trace_length = max(int(min_trace_length), 0)
+            except (ValueError, TypeError):
+                logger.warning(
+                    f"Invalid min_trace_length in params: {context.params.get('min_trace_length')}, using default {MIN_TRACE_LENGTH}"
+                )
+                min_trace_length = MIN_TRACE_LENGTH
+            border_width = context.params.get("border_width", BORDER_WIDTH)
+            try:
+                border_width = max(int(border_width), 0)
+            except (ValueError, TypeError):
+                logger.warning(
+                    f"Invalid border_width in params: {context.params.get('border_width')}, using default {BORDER_WIDTH}"
+                )
+                border_width = BORDER_WIDTH
+
+            # Get per-frame extraction threads from params (default: 1, serial)
+            extraction_threads = context.params.get("extraction_threads", 1)
+            try:
+                extraction_threads = max(int(extraction_threads), 1)
+            except (ValueError, TypeError):
+                logger.warning(
+                    f"Invalid extraction_threads in params: {context.params.get('extraction_threads')}, using default 1"
+                )
+                extraction_threads = 1
+
+            # Get trace table format from params (default: csv)
+            trace_format = context.params.get("trace_format", "csv")
+            try:
+                traces_suffix = trace_file_suffix(trace_format)
+            except ValueError:
+                logger.warning(
+                    f"Invalid trace_format in params: {trace_format}, using default csv"
+                )
+
         logger.info("FOV %d: Loading input data...", fov)
         fov_dir = output_dir / f"fov_{fov:03d}"
 
@@ -98,16 +188,34 @@ class ExtractionService(BaseProcessingService):
         seg_labeled = open_memmap(seg_labeled_path, mode="r")
 
         try:
-            traces_output_path = fov_dir / f"{base_name}_fov_{fov:03d}_traces.csv"
-            if traces_output_path.exists():
+            traces_output_path = (
+                fov_dir / f"{base_name}_fov_{fov:03d}_traces{traces_suffix}"
+            )
+            # Parameters that select the rows vs. those each column depends on
+            row_params = {"min_length": min_trace_length, "border_width": border_width}
+            column_params = {
+                "background_weight": background_weight,
+                "erosion_size": erosion_size,
+            }
+            # Rows depend on the tracked labels; columns record their own inputs
+            provenance = step_provenance(
+                "extraction",
+                [seg_labeled_path],
+                row_params,
+                algorithm=extract_traces,
+            )
+            existing_df: pd.DataFrame | None = None
+            recorded_columns: dict[str, dict] = {}
+            if is_current(traces_output_path, provenance):
+                existing_df, recorded_columns = self._load_existing_traces(
+                    traces_output_path, row_params, fov
+                )
+            elif traces_output_path.exists():
                 logger.info(
-                    "FOV %d: Combined traces CSV already exists, skipping extraction",
+                    "FOV %d: Traces are out of date (%s), recomputing all traces",
                     fov,
+                    describe_mismatch(traces_output_path, provenance),
                 )
-                fov_paths.traces = traces_output_path
-                return
-
-            channel_frames: list[tuple[int, pd.DataFrame]] = []
 
             # Build mappings for raw and background fluorescence data
             fl_background_entries = fov_paths.fl_background
@@ -142,14 +250,20 @@ class ExtractionService(BaseProcessingService):
                     pass
                 return np.arange(frame_count, dtype=float)
 
-            # Check for cancellation before processing phase contrast features
+            # Check for cancellation before collecting channels
             if cancel_event and cancel_event.is_set():
                 logger.info(
                     "FOV %d: Extraction cancelled before phase contrast processing", fov
                 )
                 return
 
-            # Process phase contrast features if requested
+            # Channels to extract in one pass over the label stack; stacks stay
+            # memory-mapped and are converted one frame at a time
+            extraction_channels: list[ExtractionChannel] = []
+            # Channel -> digest of the image (and background) files its columns read
+            channel_inputs: dict[int, str] = {}
+
+            # Phase contrast features if requested
             pc_entry = fov_paths.pc
             if pc_features:
                 if not (isinstance(pc_entry, tuple) and len(pc_entry) == 2):
@@ -165,43 +279,23 @@ class ExtractionService(BaseProcessingService):
                             pc_path,
                         )
                     else:
-                        pc_data = open_memmap(pc_path, mode="r")
-                        try:
-                            pc_frames = int(pc_data.shape[0])
-                            times = _compute_times(pc_frames)
-                            unique_pc_features = sorted(dict.fromkeys(pc_features))
-                            logger.info(
-                                "FOV %d: Extracting phase features (%s) from channel %d",
-                                fov,
-                                ", ".join(unique_pc_features),
-                                pc_channel,
+                        unique_pc_features = sorted(dict.fromkeys(pc_features))
+                        logger.info(
+                            "FOV %d: Extracting phase features (%s) from channel %d",
+                            fov,
+                            ", ".join(unique_pc_features),
+                            pc_channel,
+                        )
+                        # PC features don't use background correction
+                        channel_inputs[pc_channel] = input_digest([pc_path, None])
+                        extraction_channels.append(
+                            ExtractionChannel(
+                                channel=pc_channel,
+                                image=open_memmap(pc_path, mode="r"),
+                                features=unique_pc_features,
+                                background=0.0,
                             )
-                            try:
-                                # PC features don't use background correction - pass zeros
-                                pc_background = np.zeros_like(pc_data, dtype=np.float32)
-                                traces_df = extract_trace(
-                                    image=pc_data,
-                                    seg_labeled=seg_labeled,
-                                    times=times,
-                                    background=pc_background,
-                                    features=unique_pc_features,
-                                    progress_callback=partial(
-                                        self.progress_callback, fov
-                                    ),
-                                    cancel_event=cancel_event,
-                                    background_weight=background_weight,
-                                    erosion_size=erosion_size,
-                                )
-                                channel_frames.append((pc_channel, traces_df))
-                            except InterruptedError:
-                                raise InterruptedError(
-                                    "Phase feature extraction was interrupted"
-                                )
-                        finally:
-                            try:
-                                del pc_data
-                            except Exception:
-                                pass
+                        )
 
             if not channels_to_process:
                 logger.info(
@@ -210,13 +304,6 @@ class ExtractionService(BaseProcessingService):
                 )
 
             for ch in sorted(channels_to_process):
-                # Check for cancellation before processing each fluorescence channel
-                if cancel_event and cancel_event.is_set():
-                    logger.info(
-                        "FOV %d: Extraction cancelled at fluorescence channel %s", fov, ch
-                    )
-                    return
-
                 # Load raw fluorescence data
                 fl_raw_path = fl_raw_map.get(ch)
                 if fl_raw_path is None or not fl_raw_path.exists():
@@ -226,12 +313,14 @@ class ExtractionService(BaseProcessingService):
                     continue
 
                 fl_raw_data = open_memmap(fl_raw_path, mode="r")
-                
-                # Load background data if available
+
+                # Load background data if available; no background is a scalar zero
                 fl_background_path = fl_background_map.get(ch)
-                fl_background_data = None
+                fl_background_data = 0.0
+                used_background_path = None
                 if fl_background_path is not None and fl_background_path.exists():
                     fl_background_data = open_memmap(fl_background_path, mode="r")
+                    used_background_path = fl_background_path
                     # Verify shapes match
                     if fl_raw_data.shape != fl_background_data.shape:
                         logger.warning(
@@ -239,101 +328,147 @@ class ExtractionService(BaseProcessingService):
                             fov,
                             ch,
                         )
-                        try:
-                            del fl_background_data
-                        except Exception:
-                            pass
-                        fl_background_data = None
+                        fl_background_data = 0.0
+                        used_background_path = None
+                channel_inputs[int(ch)] = input_digest(
+                    [fl_raw_path, used_background_path]
+                )
 
-                try:
-                    n_frames = int(fl_raw_data.shape[0])
-                    times = _compute_times(n_frames)
-
-                    configured_features = channel_features.get(ch, None)
-                    features_for_channel = (
-                        sorted(dict.fromkeys(configured_features))
-                        if configured_features
-                        else None
+                configured_features = channel_features.get(ch, None)
+                features_for_channel = (
+                    sorted(dict.fromkeys(configured_features))
+                    if configured_features
+                    else None
+                )
+                logger.info(
+                    "FOV %d: Extracting fluorescence features (%s) from channel %s%s",
+                    fov,
+                    ", ".join(features_for_channel)
+                    if features_for_channel
+                    else "none",
+                    ch,
+                    " (background data available for correction)"
+                    if np.ndim(fl_background_data) != 0
+                    else "",
+                )
+                extraction_channels.append(
+                    ExtractionChannel(
+                        channel=int(ch),
+                        image=fl_raw_data,
+                        features=features_for_channel,
+                        background=fl_background_data,
                     )
-                    
-                    # Always provide background (zeros if not available)
-                    if fl_background_data is not None:
-                        background_for_extraction = fl_background_data.astype(np.float32)
-                        logger.info(
-                            "FOV %d: Extracting fluorescence features (%s) from channel %s "
-                            "(background data available for correction)",
-                            fov,
-                            ", ".join(features_for_channel)
-                            if features_for_channel
-                            else "none",
-                            ch,
-                        )
-                    else:
-                        # Create zeros array matching raw data shape
-                        background_for_extraction = np.zeros_like(fl_raw_data, dtype=np.float32)
-                        logger.info(
-                            "FOV %d: Extracting fluorescence features (%s) from channel %s",
-                            fov,
-                            ", ".join(features_for_channel)
-                            if features_for_channel
-                            else "none",
-                            ch,
-                        )
-                    
-                    try:
-                        traces_df = extract_trace(
-                            image=fl_raw_data.astype(np.float32),
-                            seg_labeled=seg_labeled,
-                            times=times,
-                            background=background_for_extraction,
-                            features=features_for_channel,
-                            progress_callback=partial(self.progress_callback, fov),
-                            cancel_event=cancel_event,
-                            background_weight=background_weight,
-                            erosion_size=erosion_size,
-                        )
-                        channel_frames.append((int(ch), traces_df))
-                    except InterruptedError:
-                        raise InterruptedError("Feature extraction was interrupted")
-                finally:
-                    try:
-                        del fl_raw_data
-                    except Exception:
-                        pass
-                    if fl_background_data is not None:
-                        try:
-                            del fl_background_data
-                        except Exception:
-                            pass
+                )
 
-            base_cols = [f.name for f in dataclass_fields(Result)]
-            merged_df: pd.DataFrame | None = None
+            # (channel, feature, parameters) of every requested column
+            requested_columns: dict[str, dict] = {}
+            for channel in extraction_channels:
+                names = (
+                    channel.features
+                    if channel.features is not None
+                    else list_features()
+                )
+                for name in names:
+                    requested_columns[f"{name}_ch_{channel.channel}"] = {
+                        "channel": channel.channel,
+                        "feature": name,
+                        **column_params,
+                        "inputs": channel_inputs[channel.channel],
+                    }
 
-            for channel_id, df in channel_frames:
-                # Check for cancellation before processing each channel's DataFrame
-                if cancel_event and cancel_event.is_set():
+            extracted_columns = set(requested_columns)
+            if existing_df is not None:
+                # Only columns that are absent or were computed with other
+                # parameters are extracted; all others are left untouched
+                missing = {
+                    col
+                    for col, spec in requested_columns.items()
+                    if col not in existing_df.columns
+                    or recorded_columns.get(col, spec) != spec
+                }
+                if not missing:
                     logger.info(
-                        "FOV %d: Extraction cancelled during DataFrame merging", fov
+                        "FOV %d: Traces file already has all requested features, skipping extraction",
+                        fov,
                     )
+                    fov_paths.traces = traces_output_path
                     return
+                extracted_columns = missing
+                logger.info(
+                    "FOV %d: Extracting %d missing feature columns (%s) into existing traces",
+                    fov,
+                    len(missing),
+                    ", ".join(sorted(missing)),
+                )
+                extraction_channels = [
+                    replace(
+                        channel,
+                        features=[
+                            spec["feature"]
+                            for col, spec in requested_columns.items()
+                            if col in missing and spec["channel"] == channel.channel
+                        ],
+                    )
+                    for channel in extraction_channels
+                    if any(
+                        requested_columns[col]["channel"] == channel.channel
+                        for col in missing
+                    )
+                ]
 
-                if df.empty:
-                    continue
-                feature_cols = [col for col in df.columns if col not in base_cols]
-                rename_map = {col: f"{col}_ch_{channel_id}" for col in feature_cols}
-                prepared = df[base_cols + feature_cols].rename(columns=rename_map)
-                if merged_df is None:
-                    merged_df = prepared
-                else:
-                    merged_df = merged_df.merge(
-                        prepared,
-                        on=base_cols,
-                        how="outer",
+            merged_df: pd.DataFrame | None = None
+            if extraction_channels:
+                try:
+                    merged_df = extract_traces(
+                        seg_labeled=seg_labeled,
+                        times=_compute_times(int(seg_labeled.shape[0])),
+                        channels=extraction_channels,
+                        progress_callback=partial(self.progress_callback, fov),
+                        cancel_event=cancel_event,
+                        background_weight=background_weight,
+                        erosion_size=erosion_size,
+                        min_length=min_trace_length,
+                        border_width=border_width,
+                        n_threads=extraction_threads,
                     )
+                except InterruptedError:
+                    raise InterruptedError("Feature extraction was interrupted")
+                finally:
+                    # Release memory-mapped channel stacks
+                    extraction_channels.clear()
+
+            if cancel_event and cancel_event.is_set():
+                logger.info("FOV %d: Extraction cancelled, traces not written", fov)
+                return
 
-            if merged_df is None or merged_df.empty:
+            base_cols = [f.name for f in dataclass_fields(Result)]
+
+            if existing_df is not None:
+                # Append the new columns to the existing rows (same tracking and
+                # filters, so the same (cell, frame) keys)
+                new_cols = [
+                    col
+                    for col in (merged_df.columns if merged_df is not None else [])
+                    if col not in base_cols
+                ]
+                new_values = (
+                    merged_df.set_index(["cell", "frame"])[new_cols]
+                    if merged_df is not None
+                    else pd.DataFrame(columns=new_cols)
+                )
+                if len(new_values) != len(existing_df):
+                    logger.warning(
+                        "FOV %d: New features cover %d rows, existing traces have %d",
+                        fov,
+                        len(new_values),
+                        len(existing_df),
+                    )
+                merged_df = existing_df.drop(columns=new_cols, errors="ignore").join(
+                    new_values, on=["cell", "frame"]
+                )
+            elif merged_df is None or merged_df.empty:
                 logger.info(
-                    "FOV %d: Combined trace DataFrame is empty; creating empty CSV with headers",
+                    "FOV %d: Combined trace DataFrame is empty; creating empty table with headers",
                     fov,
                 )
                 # Build column names from base columns + expected feature columns
@@ -351,7 +486,26 @@ class ExtractionService(BaseProcessingService):
                 merged_df.sort_values(["cell", "frame", "time"], inplace=True)
                 merged_df.insert(0, "fov", fov)
             
-            merged_df.to_csv(traces_output_path, index=False, float_format="%.6f")
+            # CSV keeps 6 decimals; binary formats store typed full-precision columns
+            clear_provenance(traces_output_path)
+            write_trace_table(merged_df, traces_output_path, float_format="%.6f")
+
+            recorded_columns.update(
+                {col: requested_columns[col] for col in extracted_columns}
+            )
+            write_trace_manifest(
+                traces_output_path,
+                {
+                    "rows": row_params,
+                    "columns": {
+                        col: spec
+                        for col, spec in recorded_columns.items()
+                        if col in merged_df.columns
+                    },
+                },
+            )
+
+            write_provenance(traces_output_path, provenance)
 
             fov_paths.traces = traces_output_path
             logger.info("FOV %d: Traces written to %s", fov, traces_output_path)
@@ -7,6 +7,14 @@ import numpy as np
 from functools import partial
 import logging
 
+from pyama_core.io.atomic import commit_partial, discard_partial, partial_path
+from pyama_core.processing.workflow.provenance import (
+    clear_provenance,
+    describe_mismatch,
+    is_current,
+    step_provenance,
+    write_provenance,
+)
 from pyama_core.processing.workflow.services.base import BaseProcessingService
 from pyama_core.io import MicroscopyMetadata
 from pyama_core.processing.segmentation import segment_cell
@@ -67,9 +75,12 @@ class SegmentationService(BaseProcessingService):
             assumed_id = 0 if pc_id is None else pc_id
             seg_path = fov_dir / f"{basename}_fov_{fov:03d}_seg_ch_{assumed_id}.npy"
 
-        # If output already exists, record and skip
-        if Path(seg_path).exists():
-            logger.info("FOV %d: Segmentation already exists, skipping", fov)
+        provenance = step_provenance(
+            "segmentation", [pc_raw_path], algorithm=segment_cell
+        )
+        # If output is up to date, record and skip
+        if is_current(seg_path, provenance):
+            logger.info("FOV %d: Segmentation is up to date, skipping", fov)
             try:
                 if pc_id is None:
                     fov_paths.seg = (0, Path(seg_path))
@@ -79,6 +90,14 @@ class SegmentationService(BaseProcessingService):
                 pass
             return
 
+        if Path(seg_path).exists():
+            logger.info(
+                "FOV %d: Segmentation is out of date (%s), recomputing",
+                fov,
+                describe_mismatch(seg_path, provenance),
+            )
+        clear_provenance(seg_path)
+
         logger.info("FOV %d: Loading phase contrast data...", fov)
         phase_contrast_data = np.load(pc_raw_path, mmap_mode="r")
 
@@ -92,7 +111,10 @@ class SegmentationService(BaseProcessingService):
         seg_memmap = None
         try:
             seg_memmap = open_memmap(
-                seg_path, mode="w+", dtype=bool, shape=phase_contrast_data.shape
+                partial_path(seg_path),
+                mode="w+",
+                dtype=bool,
+                shape=phase_contrast_data.shape,
             )
             segment_cell(
                 phase_contrast_data,
@@ -102,12 +124,13 @@ class SegmentationService(BaseProcessingService):
             )
             # Flush changes to disk
             seg_memmap.flush()
-        except InterruptedError:
+        except BaseException:
             if seg_memmap is not None:
                 try:
                     del seg_memmap
                 except Exception:
                     pass
+            discard_partial(seg_path)
             raise
         finally:
             if seg_memmap is not None:
@@ -115,6 +138,13 @@ class SegmentationService(BaseProcessingService):
                     del seg_memmap
                 except Exception:
                     pass
+        if cancel_event and cancel_event.is_set():
+            logger.info("FOV %d: Segmentation cancelled", fov)
+            discard_partial(seg_path)
+            return
+        commit_partial(seg_path)
+        write_provenance(seg_path, provenance)
+
         # Record output as a tuple (pc_id, path) if id known
         try:
             if pc_id is None:
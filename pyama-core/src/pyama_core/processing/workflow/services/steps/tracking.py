@@ -7,6 +7,19 @@ import numpy as np
 import logging
 from functools import partial
 
+from pyama_core.io.atomic import (
+    commit_partial,
+    partial_path,
+    resume_checkpoint_path,
+)
+from pyama_core.processing.workflow.provenance import (
+    clear_provenance,
+    describe_mismatch,
+    is_current,
+    read_provenance,
+    step_provenance,
+    write_provenance,
+)
 from pyama_core.processing.workflow.services.base import BaseProcessingService
 from pyama_core.processing.tracking import track_cell
 from pyama_core.io import MicroscopyMetadata
@@ -20,6 +33,9 @@ from numpy.lib.format import open_memmap
 
 logger = logging.getLogger(__name__)
 
+# Frames between tracker checkpoints (state is small; output is flushed too)
+TRACKING_CHECKPOINT_EVERY = 100
+
 
 class TrackingService(BaseProcessingService):
     def __init__(self) -> None:
@@ -67,9 +83,29 @@ class TrackingService(BaseProcessingService):
                 fov_dir / f"{base_name}_fov_{fov:03d}_seg_labeled_ch_{ch}.npy"
             )
 
-        # If output already exists, record and skip
-        if Path(seg_labeled_path).exists():
-            logger.info("FOV %d: Tracked segmentation already exists, skipping", fov)
+        # Tracking writes to a temporary file that is only renamed onto the
+        # output when complete; a checkpoint next to it marks an unfinished run
+        partial_labeled_path = partial_path(seg_labeled_path)
+        checkpoint_path = resume_checkpoint_path(seg_labeled_path)
+        resume = partial_labeled_path.exists() and checkpoint_path.exists()
+
+        # Recorded when a run starts, so a resume can verify it has the same inputs
+        provenance = step_provenance(
+            "tracking", [segmentation_path], algorithm=track_cell
+        )
+        if resume:
+            stored = read_provenance(partial_labeled_path)
+            if stored is None or stored.get("hash") != provenance["hash"]:
+                logger.info(
+                    "FOV %d: Tracking checkpoint is out of date (%s), restarting",
+                    fov,
+                    describe_mismatch(partial_labeled_path, provenance),
+                )
+                resume = False
+
+        # If output is up to date, record and skip
+        if not resume and is_current(seg_labeled_path, provenance):
+            logger.info("FOV %d: Tracked segmentation is up to date, skipping", fov)
             try:
                 if "pc_id" in locals() and pc_id is not None:
                     fov_paths.seg_labeled = (int(pc_id), Path(seg_labeled_path))
@@ -79,20 +115,47 @@ class TrackingService(BaseProcessingService):
                 pass
             return
 
-        logger.info("FOV %d: Starting cell tracking...", fov)
         seg_labeled_memmap = None
+        if resume:
+            seg_labeled_memmap = open_memmap(partial_labeled_path, mode="r+")
+            if seg_labeled_memmap.shape != (n_frames, height, width):
+                # Unusable partial output, start over
+                del seg_labeled_memmap
+                seg_labeled_memmap = None
+            else:
+                logger.info(
+                    "FOV %d: Found tracking checkpoint, resuming cell tracking...",
+                    fov,
+                )
+        if seg_labeled_memmap is None:
+            if Path(seg_labeled_path).exists():
+                logger.info(
+                    "FOV %d: Tracked segmentation is out of date (%s), recomputing",
+                    fov,
+                    describe_mismatch(seg_labeled_path, provenance),
+                )
+            logger.info("FOV %d: Starting cell tracking...", fov)
+            clear_provenance(seg_labeled_path)
+            # Mark the run as in progress before the temporary file appears
+            checkpoint_path.unlink(missing_ok=True)
+            checkpoint_path.touch()
+            write_provenance(partial_labeled_path, provenance)
         try:
-            seg_labeled_memmap = open_memmap(
-                seg_labeled_path,
-                mode="w+",
-                dtype=np.uint16,
-                shape=(n_frames, height, width),
-            )
+            if seg_labeled_memmap is None:
+                seg_labeled_memmap = open_memmap(
+                    partial_labeled_path,
+                    mode="w+",
+                    dtype=np.uint16,
+                    shape=(n_frames, height, width),
+                )
             track_cell(
                 image=segmentation_data,
                 out=seg_labeled_memmap,
                 progress_callback=partial(self.progress_callback, fov),
                 cancel_event=cancel_event,
+                streaming=True,
+                checkpoint_path=checkpoint_path,
+                checkpoint_every=TRACKING_CHECKPOINT_EVERY,
             )
             # Flush changes to disk
             seg_labeled_memmap.flush()
@@ -109,6 +172,20 @@ class TrackingService(BaseProcessingService):
                     del seg_labeled_memmap
                 except Exception:
                     pass
+
+        if checkpoint_path.exists():
+            # Tracking stopped early; the checkpoint lets the next run resume
+            logger.info(
+                "FOV %d: Cell tracking interrupted, checkpoint kept at %s",
+                fov,
+                checkpoint_path,
+            )
+            return
+
+        commit_partial(seg_labeled_path)
+        write_provenance(seg_labeled_path, provenance)
+        clear_provenance(partial_labeled_path)
+
         # Record output path into context
         try:
             if "pc_id" in locals() and pc_id is not None:
@@ -0,0 +1,151 @@
+"""
+FOV sharding for running one workflow as several independent jobs.
+
+Shard ``i`` of ``n`` (0-based, e.g. a SLURM array task) processes one
+contiguous block of the FOV range; block sizes differ by at most one FOV.
+All shards write their FOV folders to the shared output directory and
+their ``processing_results.yaml`` and ``run_metrics.json`` to their own
+``shards/shard_<i>_of_<n>/`` folder, so they never write the same file.
+``combine_shard_results`` merges the shard results into the output
+directory's ``processing_results.yaml`` once the shards are done.
+"""
+
+import logging
+from pathlib import Path
+import re
+
+import yaml
+
+from pyama_core.io.results_yaml import deserialize_from_dict
+from pyama_core.processing.workflow.run import (
+    _merge_contexts,
+    _save_results,
+    _write_combined_traces,
+)
+from pyama_core.types.processing import ProcessingContext
+
+logger = logging.getLogger(__name__)
+
+SHARDS_DIRNAME = "shards"
+
+_SHARD_DIR_PATTERN = re.compile(r"shard_(\d+)_of_(\d+)$")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a ``"i/n"`` shard specification.
+
+    Raises:
+        ValueError: If the format is wrong or ``i`` is not in ``[0, n)``.
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if match is None:
+        raise ValueError(f"Invalid shard {value!r} (expected 'i/n', e.g. '0/4')")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or index >= count:
+        raise ValueError(f"Invalid shard {value!r} (need 0 <= i < n)")
+    return index, count
+
+
+def shard_fov_range(
+    fov_start: int, fov_end: int, index: int, count: int
+) -> tuple[int, int] | None:
+    """Return the FOV block of shard ``index`` of ``count`` in a FOV range.
+
+    Args:
+        fov_start: First FOV of the full range.
+        fov_end: Last FOV of the full range (inclusive).
+        index: Shard index (0-based).
+        count: Number of shards.
+
+    Returns:
+        ``(first, last)`` FOV of the shard, or None if there are more
+        shards than FOVs and this one is empty.
+    """
+    total = fov_end - fov_start + 1
+    size, extra = divmod(total, count)
+    first = fov_start + index * size + min(index, extra)
+    n_fovs = size + (1 if index < extra else 0)
+    if n_fovs == 0:
+        return None
+    return first, first + n_fovs - 1
+
+
+def shard_results_dir(output_dir: Path, index: int, count: int) -> Path:
+    """Folder holding the results files of one shard."""
+    width = max(len(str(count)), 3)
+    name = f"shard_{index:0{width}d}_of_{count:0{width}d}"
+    return Path(output_dir) / SHARDS_DIRNAME / name
+
+
+def combine_shard_results(
+    output_dir: Path, base_name: str | None = None
+) -> ProcessingContext:
+    """Merge the results of all shards into ``processing_results.yaml``.
+
+    Results already in the output directory's ``processing_results.yaml``
+    are kept. Missing shards are reported in the log; combining again after
+    they finished adds their FOVs.
+
+    Args:
+        output_dir: Shared workflow output directory.
+        base_name: Base name of the microscopy file; needed to write the
+            combined trace table when ``combine_traces`` is set.
+
+    Returns:
+        The merged processing context that was saved.
+
+    Raises:
+        FileNotFoundError: If no shard has written results yet.
+    """
+    output_dir = Path(output_dir)
+    shard_files = sorted(
+        (output_dir / SHARDS_DIRNAME).glob("*/processing_results.yaml")
+    )
+    if not shard_files:
+        raise FileNotFoundError(f"No shard results in {output_dir / SHARDS_DIRNAME}")
+
+    merged = ProcessingContext()
+    found: dict[int, set[int]] = {}
+    for path in shard_files:
+        match = _SHARD_DIR_PATTERN.match(path.parent.name)
+        if match is not None:
+            found.setdefault(int(match.group(2)), set()).add(int(match.group(1)))
+        with path.open("r", encoding="utf-8") as f:
+            _merge_contexts(merged, deserialize_from_dict(yaml.safe_load(f) or {}))
+
+    if len(found) > 1:
+        logger.warning(
+            "Shard results of different shard counts found: %s",
+            ", ".join(str(count) for count in sorted(found)),
+        )
+    for count, indices in sorted(found.items()):
+        missing = sorted(set(range(count)) - indices)
+        if missing:
+            logger.warning(
+                "Results of %d/%d shards missing: %s",
+                len(missing),
+                count,
+                ", ".join(map(str, missing)),
+            )
+
+    merged = _save_results(merged, output_dir)
+    logger.info(
+        "Combined results of %d shards (%d FOVs)",
+        len(shard_files),
+        len(merged.results or {}),
+    )
+    if merged.params and merged.params.get("combine_traces", False):
+        if base_name is None:
+            logger.warning("No base name given; combined traces are not written")
+        else:
+            _write_combined_traces(merged, output_dir, base_name)
+    return merged
+
+
+__all__ = [
+    "SHARDS_DIRNAME",
+    "parse_shard",
+    "shard_fov_range",
+    "shard_results_dir",
+    "combine_shard_results",
+]
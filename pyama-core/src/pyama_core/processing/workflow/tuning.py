@@ -0,0 +1,240 @@
+"""
+Automatic choice of worker count and FOVs in flight for the workflow.
+
+The peak memory of each step is estimated from the stack geometry in
+``MicroscopyMetadata``: segmentation and background estimation convert the
+whole stack to ``float32``, the other steps only hold a few frames at a
+time (inputs and outputs are memory-mapped). A worker runs one step at a
+time, so the worker count is the number of worst-case steps that fit into
+the available memory, capped by the CPU count.
+"""
+
+from dataclasses import dataclass, field
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from pyama_core.io import MicroscopyMetadata
+from pyama_core.types.processing import Channels
+
+logger = logging.getLogger(__name__)
+
+AUTO = "auto"
+
+# Share of the available memory the workers may use
+MEMORY_FRACTION = 0.75
+
+# Interpreter and imported libraries of one worker process (not needed for threads)
+PROCESS_WORKER_OVERHEAD = 300 * 1024**2
+
+# Per-frame temporaries (frame-sized float32 arrays) of the frame-wise filters
+_SEGMENTATION_FRAME_TEMPORARIES = 6
+_BACKGROUND_FRAME_TEMPORARIES = 6
+
+
+@dataclass(frozen=True)
+class ResourcePlan:
+    """Worker count and FOVs in flight chosen for a workflow run."""
+
+    n_workers: int
+    batch_size: int
+    step_bytes: dict[str, int] = field(default_factory=dict)
+    worker_bytes: int = 0
+    available_bytes: int | None = None
+    cpu_count: int = 1
+    limited_by: str = "cpu"
+
+    def describe(self) -> str:
+        """One-line summary for the log."""
+        available = (
+            "unknown"
+            if self.available_bytes is None
+            else _format_bytes(self.available_bytes)
+        )
+        steps = ", ".join(
+            f"{step} {_format_bytes(size)}" for step, size in self.step_bytes.items()
+        )
+        return (
+            f"workers={self.n_workers}, FOVs in flight={self.batch_size} "
+            f"(limited by {self.limited_by}; {_format_bytes(self.worker_bytes)} "
+            f"per worker, {available} available, {self.cpu_count} CPUs; "
+            f"steps: {steps})"
+        )
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _read_int(path: Path) -> int | None:
+    try:
+        text = path.read_text().strip()
+    except OSError:
+        return None
+    return int(text) if text.isdigit() else None
+
+
+def available_memory_bytes() -> int | None:
+    """Return the memory available to new allocations, or None if unknown.
+
+    Uses ``MemAvailable`` from ``/proc/meminfo`` (falling back to free
+    physical pages) and, inside a cgroup v2 container, the remaining room
+    below ``memory.max``.
+    """
+    available = None
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError):
+        pass
+    if available is None:
+        try:
+            available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, OSError, ValueError):
+            pass
+
+    cgroup = Path("/sys/fs/cgroup")
+    limit = _read_int(cgroup / "memory.max")
+    used = _read_int(cgroup / "memory.current")
+    if limit is not None and used is not None:
+        room = max(limit - used, 0)
+        available = room if available is None else min(available, room)
+    return available
+
+
+def available_cpu_count() -> int:
+    """Return the number of CPUs this process may run on."""
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:
+        return max(os.cpu_count() or 1, 1)
+
+
+def estimate_step_memory(
+    metadata: MicroscopyMetadata,
+    channels: Channels,
+    params: dict[str, Any] | None = None,
+) -> dict[str, int]:
+    """Estimate the peak memory (bytes) of one FOV task per workflow step.
+
+    Args:
+        metadata: Microscopy metadata (frames, height, width, dtype).
+        channels: Selected channels; background estimation is only
+            included with fluorescence channels.
+        params: Workflow parameters (``extraction_threads`` multiplies the
+            per-frame memory of extraction).
+
+    Returns:
+        Mapping of step name to estimated peak bytes, in workflow order.
+    """
+    params = params or {}
+    n_frames = int(metadata.n_frames)
+    frame = int(metadata.height) * int(metadata.width)
+    try:
+        raw_itemsize = np.dtype(metadata.dtype).itemsize
+    except TypeError:
+        raw_itemsize = 2
+    n_fl = len(channels.fl)
+    try:
+        extraction_threads = max(int(params.get("extraction_threads", 1)), 1)
+    except (TypeError, ValueError):
+        extraction_threads = 1
+
+    f32 = np.dtype(np.float32).itemsize
+    f64 = np.dtype(np.float64).itemsize
+    estimate = {
+        # Raw frame as read plus its uint16 copy
+        "copy": frame * (raw_itemsize + 2) * 2,
+        # Whole stack as float32 plus frame-wise filter temporaries
+        "segmentation": frame * f32 * (n_frames + _SEGMENTATION_FRAME_TEMPORARIES),
+    }
+    if n_fl:
+        estimate["background"] = frame * f32 * (
+            n_frames + _BACKGROUND_FRAME_TEMPORARIES
+        )
+    # Current and previous label images plus region masks
+    estimate["tracking"] = frame * f64 * 4
+    # Per thread: labels and one float64 image/background pair per channel
+    estimate["extraction"] = extraction_threads * frame * f64 * (1 + 2 * max(n_fl, 1))
+    return estimate
+
+
+def plan_resources(
+    metadata: MicroscopyMetadata,
+    channels: Channels,
+    n_fovs: int,
+    params: dict[str, Any] | None = None,
+    worker_mode: str = "thread",
+    available_bytes: int | None = None,
+    cpu_count: int | None = None,
+    memory_fraction: float = MEMORY_FRACTION,
+) -> ResourcePlan:
+    """Choose the worker count and the number of FOVs in flight.
+
+    Args:
+        metadata: Microscopy metadata of the input file.
+        channels: Selected channels.
+        n_fovs: Number of FOVs to process.
+        params: Workflow parameters.
+        worker_mode: ``"thread"`` or ``"process"``; process workers add
+            ``PROCESS_WORKER_OVERHEAD`` each.
+        available_bytes: Memory to plan with (measured if None).
+        cpu_count: CPUs to plan with (measured if None).
+        memory_fraction: Share of ``available_bytes`` the workers may use.
+
+    Returns:
+        The chosen ``ResourcePlan``. At least one worker is always planned,
+        even if a single step is estimated not to fit.
+    """
+    step_bytes = estimate_step_memory(metadata, channels, params)
+    worker_bytes = max(step_bytes.values())
+    if worker_mode == "process":
+        worker_bytes += PROCESS_WORKER_OVERHEAD
+    if available_bytes is None:
+        available_bytes = available_memory_bytes()
+    if cpu_count is None:
+        cpu_count = available_cpu_count()
+    n_fovs = max(int(n_fovs), 1)
+
+    # Background estimation and tracking of one FOV may run side by side
+    limits = {"cpu": cpu_count, "FOV count": 2 * n_fovs}
+    if available_bytes is not None:
+        limits["memory"] = int(available_bytes * memory_fraction) // max(
+            worker_bytes, 1
+        )
+    limited_by = min(limits, key=limits.get)
+    n_workers = max(limits[limited_by], 1)
+    # One FOV beyond the workers keeps the single copy slot feeding the pool
+    batch_size = min(n_workers + 1, n_fovs)
+
+    return ResourcePlan(
+        n_workers=n_workers,
+        batch_size=batch_size,
+        step_bytes=step_bytes,
+        worker_bytes=worker_bytes,
+        available_bytes=available_bytes,
+        cpu_count=cpu_count,
+        limited_by=limited_by,
+    )
+
+
+__all__ = [
+    "AUTO",
+    "MEMORY_FRACTION",
+    "PROCESS_WORKER_OVERHEAD",
+    "ResourcePlan",
+    "available_memory_bytes",
+    "available_cpu_count",
+    "estimate_step_memory",
+    "plan_resources",
+]
@@ -0,0 +1,537 @@
+"""
+Shared-filesystem work queue for processing FOVs on several machines.
+
+Any number of workers, on any node that sees the output directory, claim
+FOVs from a work directory without a coordinator. Every FOV is one small
+file that moves between state folders by atomic renames::
+
+    work_queue/
+      queue.yaml              base name and FOVs of the queue
+      pending/fov_003         waiting to be claimed
+      claimed/fov_003         being processed; holds the worker ID and its
+                              modification time is the worker's heartbeat
+      done/fov_003            finished; results in fragments/fov_003.yaml
+      failed/fov_003          a step failed; holds the worker ID
+      workers/<id>/run_metrics.json
+
+A rename succeeds for exactly one caller, so every FOV is claimed once.
+Claims whose heartbeat is older than ``lease_seconds`` (the worker's node
+died) are put back to pending by the next worker that runs out of work.
+Each worker only removes the orphaned partial outputs of FOVs it claimed,
+so it never touches files another worker is writing.
+
+``finalize_work_queue`` merges the per-FOV fragments into
+``processing_results.yaml``.
+"""
+
+from dataclasses import dataclass, field
+import logging
+import os
+from pathlib import Path
+import socket
+import threading
+import time
+from typing import Callable
+
+import yaml
+
+from pyama_core.io import MicroscopyMetadata
+from pyama_core.io.atomic import atomic_write_text
+from pyama_core.io.results_yaml import (
+    deserialize_from_dict,
+    serialize_processing_results,
+)
+from pyama_core.processing.workflow.metrics import RunMetrics
+from pyama_core.processing.workflow.run import (
+    _merge_contexts,
+    _process_fovs,
+    _resolve_worker_counts,
+    _save_results,
+    _validate_run_options,
+    _write_combined_traces,
+)
+from pyama_core.types.processing import ProcessingContext, ensure_context
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DIRNAME = "work_queue"
+
+# Seconds without a heartbeat after which a claim is considered abandoned
+LEASE_SECONDS = 600.0
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+_STATES = (PENDING, CLAIMED, DONE, FAILED)
+
+
+def default_worker_id() -> str:
+    """Return an ID unique to this process across nodes (``host-pid``)."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _task_name(fov: int) -> str:
+    return f"fov_{fov:03d}"
+
+
+def _task_fov(name: str) -> int | None:
+    if not name.startswith("fov_"):
+        return None
+    try:
+        return int(name[4:])
+    except ValueError:
+        return None
+
+
+@dataclass
+class QueueStatus:
+    """FOVs of a work queue by state."""
+
+    pending: list[int] = field(default_factory=list)
+    claimed: list[int] = field(default_factory=list)
+    done: list[int] = field(default_factory=list)
+    failed: list[int] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        """True if no FOV is waiting or being processed."""
+        return not self.pending and not self.claimed
+
+
+class WorkQueue:
+    """FOV tasks in a work directory shared by all workers.
+
+    Args:
+        work_dir: Queue directory (``<output_dir>/work_queue`` by default
+            in the helper functions).
+    """
+
+    def __init__(self, work_dir: Path) -> None:
+        self.work_dir = Path(work_dir)
+
+    @property
+    def info_path(self) -> Path:
+        return self.work_dir / "queue.yaml"
+
+    def exists(self) -> bool:
+        return self.info_path.exists()
+
+    def info(self) -> dict:
+        """Return the queue description written by ``create``."""
+        with self.info_path.open("r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+
+    def _path(self, state: str, fov: int) -> Path:
+        return self.work_dir / state / _task_name(fov)
+
+    def fragment_path(self, fov: int) -> Path:
+        return self.work_dir / "fragments" / f"{_task_name(fov)}.yaml"
+
+    def worker_dir(self, worker_id: str) -> Path:
+        return self.work_dir / "workers" / worker_id
+
+    def create(self, fovs: list[int], base_name: str) -> list[int]:
+        """Create the queue, or extend it, with ``fovs`` as pending tasks.
+
+        FOVs that are already queued in any state are left alone, so
+        creating a queue again after an interruption is safe.
+
+        Returns:
+            FOVs that were added.
+        """
+        for state in (*_STATES, "fragments", "workers"):
+            (self.work_dir / state).mkdir(parents=True, exist_ok=True)
+        info = self.info() if self.exists() else {}
+        queued = sorted(set(info.get("fovs", [])) | set(fovs))
+        atomic_write_text(
+            self.info_path,
+            yaml.safe_dump({"base_name": base_name, "fovs": queued}, sort_keys=False),
+        )
+        added = []
+        for fov in fovs:
+            if any(self._path(state, fov).exists() for state in _STATES):
+                continue
+            self._path(PENDING, fov).touch()
+            added.append(fov)
+        return added
+
+    def _list(self, state: str) -> list[int]:
+        try:
+            names = os.listdir(self.work_dir / state)
+        except FileNotFoundError:
+            return []
+        return sorted(fov for fov in map(_task_fov, names) if fov is not None)
+
+    def status(self) -> QueueStatus:
+        return QueueStatus(*(self._list(state) for state in _STATES))
+
+    def claim(self, worker_id: str) -> int | None:
+        """Claim the lowest pending FOV, or return None if none is left."""
+        for fov in self._list(PENDING):
+            pending = self._path(PENDING, fov)
+            claimed = self._path(CLAIMED, fov)
+            try:
+                # The rename keeps the mtime; start the lease before it so a
+                # fresh claim never looks stale to requeue_stale
+                os.utime(pending)
+                os.rename(pending, claimed)
+            except FileNotFoundError:
+                # Another worker was faster
+                continue
+            claimed.write_text(worker_id, encoding="utf-8")
+            logger.info("Worker %s claimed FOV %d", worker_id, fov)
+            return fov
+        return None
+
+    def heartbeat(self, fovs: list[int]) -> None:
+        """Mark the claims of ``fovs`` as alive."""
+        for fov in fovs:
+            try:
+                os.utime(self._path(CLAIMED, fov))
+            except FileNotFoundError:
+                logger.warning("Claim of FOV %d was taken away", fov)
+
+    def _finish(self, fov: int, state: str, worker_id: str) -> None:
+        target = self._path(state, fov)
+        try:
+            os.rename(self._path(CLAIMED, fov), target)
+        except FileNotFoundError:
+            # The claim was requeued meanwhile; record the outcome anyway
+            self._path(PENDING, fov).unlink(missing_ok=True)
+        target.write_text(worker_id, encoding="utf-8")
+
+    def complete(self, fov: int, worker_id: str, fragment: dict) -> None:
+        """Store the FOV's results fragment and mark it done."""
+        atomic_write_text(
+            self.fragment_path(fov), yaml.safe_dump(fragment, sort_keys=False)
+        )
+        self._path(FAILED, fov).unlink(missing_ok=True)
+        self._finish(fov, DONE, worker_id)
+
+    def fail(self, fov: int, worker_id: str) -> None:
+        """Mark a claimed FOV as failed."""
+        self._finish(fov, FAILED, worker_id)
+
+    def release(self, fov: int) -> None:
+        """Return a claimed FOV to pending (e.g. after cancellation)."""
+        try:
+            os.rename(self._path(CLAIMED, fov), self._path(PENDING, fov))
+        except FileNotFoundError:
+            pass
+
+    def requeue_stale(self, lease_seconds: float = LEASE_SECONDS) -> list[int]:
+        """Return claims without a heartbeat for ``lease_seconds`` to pending."""
+        now = time.time()
+        requeued = []
+        for fov in self._list(CLAIMED):
+            path = self._path(CLAIMED, fov)
+            try:
+                if now - path.stat().st_mtime < lease_seconds:
+                    continue
+                os.rename(path, self._path(PENDING, fov))
+            except FileNotFoundError:
+                continue
+            logger.warning("Requeued abandoned claim of FOV %d", fov)
+            requeued.append(fov)
+        return requeued
+
+    def retry_failed(self) -> list[int]:
+        """Return failed FOVs to pending."""
+        retried = []
+        for fov in self._list(FAILED):
+            try:
+                os.rename(self._path(FAILED, fov), self._path(PENDING, fov))
+            except FileNotFoundError:
+                continue
+            retried.append(fov)
+        return retried
+
+
+def _queue_for(output_dir: Path, work_dir: Path | None) -> WorkQueue:
+    return WorkQueue(Path(work_dir) if work_dir else Path(output_dir) / QUEUE_DIRNAME)
+
+
+def create_work_queue(
+    metadata: MicroscopyMetadata,
+    output_dir: Path,
+    fov_start: int | None = None,
+    fov_end: int | None = None,
+    work_dir: Path | None = None,
+    retry_failed: bool = False,
+) -> WorkQueue:
+    """Queue the FOVs ``fov_start``-``fov_end`` (all by default) for workers.
+
+    Args:
+        metadata: Microscopy metadata of the input file.
+        output_dir: Workflow output directory shared by all workers.
+        fov_start: First FOV (None or -1 for the first FOV of the file).
+        fov_end: Last FOV (None or -1 for the last FOV of the file).
+        work_dir: Queue directory (default ``<output_dir>/work_queue``).
+        retry_failed: Return FOVs that failed before to pending.
+
+    Returns:
+        The ``WorkQueue``.
+
+    Raises:
+        ValueError: If the FOV range is invalid.
+    """
+    n_fov = metadata.n_fovs
+    if fov_start is None or fov_start == -1:
+        fov_start = 0
+    if fov_end is None or fov_end == -1:
+        fov_end = n_fov - 1
+    if fov_start < 0 or fov_end >= n_fov or fov_start > fov_end:
+        raise ValueError(
+            f"Invalid FOV range: {fov_start}-{fov_end} (file has {n_fov} FOVs)"
+        )
+    queue = _queue_for(output_dir, work_dir)
+    added = queue.create(list(range(fov_start, fov_end + 1)), metadata.base_name)
+    if retry_failed:
+        added += queue.retry_failed()
+    logger.info("Queued %d FOVs in %s", len(added), queue.work_dir)
+    return queue
+
+
+def _fragment(context: ProcessingContext, fov: int) -> dict:
+    """Serialized results of one FOV, with the run's channels and params."""
+    return serialize_processing_results(
+        ProcessingContext(
+            output_dir=context.output_dir,
+            channels=context.channels,
+            results={fov: context.results[fov]},
+            params=dict(context.params),
+        )
+    )
+
+
+def run_queue_worker(
+    metadata: MicroscopyMetadata,
+    context: ProcessingContext,
+    work_dir: Path | None = None,
+    worker_id: str | None = None,
+    n_workers: int | str = 2,
+    batch_size: int | str = 2,
+    worker_mode: str = "thread",
+    cancel_event: threading.Event | None = None,
+    progress_reporter: Callable[[dict], None] | None = None,
+    lease_seconds: float = LEASE_SECONDS,
+    max_fovs: int | None = None,
+) -> bool:
+    """Claim and process FOVs from a work queue until none is left.
+
+    FOVs are claimed one at a time whenever this worker has room for
+    another FOV in flight, and processed like in ``run_complete_workflow``
+    (same step scheduling, ``n_workers``, ``batch_size`` and
+    ``worker_mode``). Each finished FOV's results are stored as a fragment
+    in the queue; ``processing_results.yaml`` is only written by
+    ``finalize_work_queue``. This worker's step metrics are written to
+    ``workers/<worker_id>/run_metrics.json`` in the queue directory.
+
+    Args:
+        metadata: Microscopy metadata of the input file.
+        context: Processing context (output directory, channels, params),
+            the same for all workers.
+        work_dir: Queue directory (default ``<output_dir>/work_queue``).
+        worker_id: Name of this worker (default ``host-pid``).
+        n_workers: Concurrent steps in this worker, or ``"auto"``.
+        batch_size: FOVs in flight in this worker, or ``"auto"``.
+        worker_mode: ``"thread"`` or ``"process"``.
+        cancel_event: Stops claiming and processing; FOVs in flight are
+            returned to pending.
+        progress_reporter: Receives progress and metrics events.
+        lease_seconds: Heartbeat age after which other workers' claims are
+            requeued; claims are refreshed every quarter of it.
+        max_fovs: Stop after claiming this many FOVs.
+
+    Returns:
+        True if every claimed FOV was processed successfully.
+    """
+    context = ensure_context(context)
+    if not _validate_run_options(worker_mode, n_workers, batch_size):
+        return False
+    output_dir = context.output_dir
+    if output_dir is None:
+        logger.error("Processing context missing output_dir")
+        return False
+    queue = _queue_for(output_dir, work_dir)
+    if not queue.exists():
+        logger.error("No work queue in %s", queue.work_dir)
+        return False
+    worker_id = worker_id or default_worker_id()
+
+    n_workers, batch_size = _resolve_worker_counts(
+        metadata,
+        context,
+        max(len(queue.status().pending), 1),
+        n_workers,
+        batch_size,
+        worker_mode,
+    )
+
+    claimed: set[int] = set()
+    claimed_lock = threading.Lock()
+    failed: list[int] = []
+
+    def _claims():
+        count = 0
+        while max_fovs is None or count < max_fovs:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            fov = queue.claim(worker_id)
+            if fov is None:
+                if queue.requeue_stale(lease_seconds):
+                    continue
+                return
+            with claimed_lock:
+                claimed.add(fov)
+            count += 1
+            yield fov
+
+    def _on_fov_done(fov: int, success: bool) -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            # Cancelled steps return early, so the FOV may look finished
+            # without being so; it stays claimed and is released below
+            logger.info("FOV %d: Cancelled, returning it to the queue", fov)
+            return
+        if success:
+            try:
+                queue.complete(fov, worker_id, _fragment(context, fov))
+                logger.info("FOV %d: All steps completed", fov)
+            except Exception as e:
+                logger.error("FOV %d: Failed to store results: %s", fov, e)
+                success = False
+        if not success:
+            logger.error("FOV %d: Processing failed", fov)
+            queue.fail(fov, worker_id)
+            failed.append(fov)
+        with claimed_lock:
+            claimed.discard(fov)
+
+    stop_heartbeat = threading.Event()
+
+    def _heartbeat() -> None:
+        while not stop_heartbeat.wait(lease_seconds / 4):
+            with claimed_lock:
+                fovs = sorted(claimed)
+            queue.heartbeat(fovs)
+
+    heartbeat = threading.Thread(target=_heartbeat, daemon=True)
+    heartbeat.start()
+    run_metrics = RunMetrics()
+    logger.info(
+        "Worker %s processing %s with %d %s workers (at most %d FOVs in flight)",
+        worker_id,
+        queue.work_dir,
+        n_workers,
+        worker_mode,
+        batch_size,
+    )
+    try:
+        schedule = _process_fovs(
+            metadata,
+            context,
+            _claims(),
+            n_workers,
+            batch_size,
+            cancel_event,
+            worker_mode,
+            progress_reporter,
+            run_metrics,
+            on_fov_done=_on_fov_done,
+        )
+    except Exception as e:
+        logger.exception("Worker %s failed: %s", worker_id, e)
+        return False
+    finally:
+        stop_heartbeat.set()
+        heartbeat.join()
+        # FOVs still claimed were interrupted; let another worker take them
+        with claimed_lock:
+            interrupted = sorted(claimed)
+        for fov in interrupted:
+            queue.release(fov)
+
+    try:
+        worker_dir = queue.worker_dir(worker_id)
+        worker_dir.mkdir(parents=True, exist_ok=True)
+        run_metrics.write(
+            worker_dir,
+            worker_id=worker_id,
+            worker_mode=worker_mode,
+            n_workers=n_workers,
+            batch_size=batch_size,
+            completed=sorted(schedule.completed),
+            failed=sorted(schedule.failed),
+            cancelled=schedule.cancelled,
+        )
+    except Exception as e:
+        logger.warning("Failed to write run metrics: %s", e)
+
+    logger.info(
+        "Worker %s finished: %d FOVs completed, %d failed",
+        worker_id,
+        len(schedule.completed),
+        len(failed),
+    )
+    return not failed and not schedule.cancelled
+
+
+def finalize_work_queue(
+    output_dir: Path, work_dir: Path | None = None
+) -> QueueStatus:
+    """Merge the fragments of all finished FOVs into ``processing_results.yaml``.
+
+    Can be run at any time (also repeatedly); FOVs that are not done yet
+    are reported in the log and the returned status.
+
+    Args:
+        output_dir: Workflow output directory.
+        work_dir: Queue directory (default ``<output_dir>/work_queue``).
+
+    Returns:
+        The queue status at the time of merging.
+
+    Raises:
+        FileNotFoundError: If there is no work queue.
+    """
+    output_dir = Path(output_dir)
+    queue = _queue_for(output_dir, work_dir)
+    if not queue.exists():
+        raise FileNotFoundError(f"No work queue in {queue.work_dir}")
+    status = queue.status()
+
+    merged = ProcessingContext()
+    for fov in status.done:
+        with queue.fragment_path(fov).open("r", encoding="utf-8") as f:
+            _merge_contexts(merged, deserialize_from_dict(yaml.safe_load(f) or {}))
+    if status.done:
+        merged = _save_results(merged, output_dir)
+        if merged.params and merged.params.get("combine_traces", False):
+            base_name = queue.info().get("base_name", "")
+            _write_combined_traces(merged, output_dir, base_name)
+    logger.info("Merged results of %d FOVs", len(status.done))
+
+    unfinished = {
+        "pending": status.pending,
+        "claimed": status.claimed,
+        "failed": status.failed,
+    }
+    for state, fovs in unfinished.items():
+        if fovs:
+            logger.warning(
+                "%d FOVs %s: %s", len(fovs), state, ", ".join(map(str, fovs))
+            )
+    return status
+
+
+__all__ = [
+    "QUEUE_DIRNAME",
+    "LEASE_SECONDS",
+    "QueueStatus",
+    "WorkQueue",
+    "default_worker_id",
+    "create_work_queue",
+    "run_queue_worker",
+    "finalize_work_queue",
+]
@@ -293,6 +293,30 @@ class ExtractionContext:
     erosion_size: int = 0  # Size of erosion structuring element (default: 0, no erosion)
 
 
+@dataclass
+class ExtractionChannel:
+    """One image stack and the features to extract from it."""
+
+    channel: int
+    image: np.ndarray  # 3D (T, H, W) stack; may be memory-mapped
+    features: list[str] | None = None  # None extracts all registered features
+    background: np.ndarray | float | None = None  # 3D stack, or None / scalar for no background
+
+
+@dataclass
+class BatchExtractionContext:
+    """Context for extracting one feature for all cells of a frame at once."""
+
+    image: np.ndarray
+    background: np.ndarray | float  # 2D frame, or a scalar (0.0) if no background is available
+    labeled: np.ndarray  # 2D label image of the frame (0 = background)
+    labels: np.ndarray  # Sorted cell IDs present in ``labeled``; output order
+    background_weight: float = 1.0  # Weight for background subtraction (default: 1.0)
+    erosion_size: int = 0  # Size of erosion structuring element (default: 0, no erosion)
+    index: Any = None  # Shared LabelIndex of ``labeled``, if already built
+    eroded_index: Any = None  # LabelIndex of ``labeled`` eroded by ``erosion_size`` (cached)
+
+
 # =============================================================================
 # TRACKING TYPES
 # =============================================================================
@@ -305,12 +329,13 @@ class Region:
     Attributes:
         area: Number of pixels in the region.
         bbox: Bounding box as ``(y0, x0, y1, x1)`` with exclusive end indices.
-        coords: Array of ``(y, x)`` coordinates for all pixels in the region.
+        coords: Array of ``(y, x)`` coordinates for all pixels in the region,
+            or ``None`` when only the bbox summary is kept.
     """
 
     area: int
     bbox: tuple[int, int, int, int]
-    coords: np.ndarray
+    coords: np.ndarray | None = None
 
 
 # =============================================================================
@@ -358,6 +383,8 @@ __all__ = [
     "Result",
     "ResultWithFeatures",
     "ExtractionContext",
+    "ExtractionChannel",
+    "BatchExtractionContext",
     "Region",
     "TileSupport",
     "FeatureMaps",
@@ -416,7 +416,7 @@ class DataPanel(QWidget):
             self,
             "Select CSV File",
             str(DEFAULT_DIR),  # QFileDialog needs a string path
-            "CSV Files (*.csv)",
+            "Trace Tables (*.csv *.parquet *.feather);;CSV Files (*.csv)",
             options=QFileDialog.Option.DontUseNativeDialog,
         )
         if file_path:
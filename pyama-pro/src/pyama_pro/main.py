@@ -92,8 +92,16 @@ def main() -> None:
             feature_type = plugin_data["feature_type"]
 
             try:
-                extractor = getattr(module, f"extract_{plugin_name}")
-                register_plugin_feature(plugin_name, extractor, feature_type)
+                extractor = getattr(module, f"extract_{plugin_name}", None)
+                batch_extractor = getattr(
+                    module, f"extract_{plugin_name}_batch", None
+                )
+                register_plugin_feature(
+                    plugin_name,
+                    extractor,
+                    feature_type,
+                    batch_extractor=batch_extractor,
+                )
                 logger.info(
                     "Registered plugin feature %s (type=%s) from %s",
                     plugin_name,
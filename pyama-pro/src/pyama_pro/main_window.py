@@ -351,8 +351,16 @@ class MainWindow(QMainWindow):
             feature_type = plugin_data["feature_type"]
 
             try:
-                extractor = getattr(module, f"extract_{plugin_name}")
-                register_plugin_feature(plugin_name, extractor, feature_type)
+                extractor = getattr(module, f"extract_{plugin_name}", None)
+                batch_extractor = getattr(
+                    module, f"extract_{plugin_name}_batch", None
+                )
+                register_plugin_feature(
+                    plugin_name,
+                    extractor,
+                    feature_type,
+                    batch_extractor=batch_extractor,
+                )
                 logger.info(
                     f"Reloaded plugin feature: {plugin_name} ({feature_type})"
                 )
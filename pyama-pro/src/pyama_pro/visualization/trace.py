@@ -519,14 +519,13 @@ class TracePanel(QWidget):
         updated_quality["cell"] = updated_quality["cell"].astype(int)
         updated_df = update_cell_quality(self._processing_df, updated_quality)
 
-        # If we loaded an inspected file, overwrite it; otherwise create new inspected file
-        if self._inspected_path and self._inspected_path.name.endswith(
-            "_inspected.csv"
-        ):
+        # If we loaded an inspected file, overwrite it; otherwise create new inspected
+        # file in the same format (CSV, Parquet or Feather) as the original
+        if self._inspected_path and self._inspected_path.stem.endswith("_inspected"):
             save_path = self._inspected_path
         else:
             save_path = self._traces_csv_path.with_name(
-                f"{self._traces_csv_path.stem}_inspected.csv"
+                f"{self._traces_csv_path.stem}_inspected{self._traces_csv_path.suffix}"
             )
         try:
             write_dataframe(updated_df, save_path)
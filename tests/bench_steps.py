@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the PyAMA processing and analysis steps.
+
+Renders one deterministic synthetic time-lapse (``pyama_core.io.synthetic``)
+and times each step on it:
+- segmentation (``segment_cell``) of the phase contrast stack
+- background estimation (``estimate_background``) of the fluorescence stack
+- tracking (``track_cell``) of the segmentation
+- extraction (``extract_traces``) of area and total intensity
+- merging (``run_merge``) of the traces of ``--merge-fovs`` FOVs
+- fitting (``fit_trace_data``) of the maturation model to the merged traces
+
+Steps that cannot run on the configured frames (background estimation
+needs frames larger than its tiles) are recorded as skipped. The results
+(configuration, environment and per-step timings) are written as JSON with
+``--output``; ``--compare`` prints the speedup of this run over
+a previous results file, so runs on different commits can be compared.
+
+Usage:
+    python bench_steps.py [--frames 60] [--size 1024] [--cells 40] [--repeats 3] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from pyama_core.analysis.fitting import fit_trace_data
+from pyama_core.io.analysis_csv import load_analysis_csv
+from pyama_core.io.processing_csv import write_trace_table
+from pyama_core.io.synthetic import (
+    SyntheticConfig,
+    config_dict,
+    generate_synthetic_dataset,
+)
+from pyama_core.processing.background import estimate_background
+from pyama_core.processing.extraction import extract_traces
+from pyama_core.processing.merge import run_merge
+from pyama_core.processing.segmentation import segment_cell
+from pyama_core.processing.tracking import track_cell
+from pyama_core.processing.workflow.provenance import code_version
+from pyama_core.types.processing import ExtractionChannel
+
+STEPS = ["segmentation", "background", "tracking", "extraction", "merge", "fitting"]
+
+
+def time_repeats(func, repeats):
+    """Return the wall times of ``repeats`` calls and the last result."""
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def environment():
+    """Describe the machine, interpreter and code version of this run."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "pyama_core": code_version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def step_result(times, items, unit):
+    """Summarize the timings of one step."""
+    best = min(times)
+    return {
+        "times_s": [round(t, 6) for t in times],
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(times), 6),
+        "items": int(items),
+        "unit": unit,
+        "items_per_s": round(items / best, 3) if best > 0 else None,
+    }
+
+
+def write_merge_inputs(tmp, traces, n_fovs):
+    """Write per-FOV trace tables, processing results and a sample sheet.
+
+    Every FOV gets a copy of the extracted traces.
+
+    Returns:
+        tuple: (samples_yaml, processing_results_yaml)
+    """
+    results = {}
+    for fov in range(n_fovs):
+        fov_dir = tmp / f"fov_{fov:03d}"
+        fov_dir.mkdir()
+        path = fov_dir / f"synthetic_fov_{fov:03d}_traces.csv"
+        write_trace_table(traces.assign(fov=fov), path)
+        results[str(fov)] = {"traces": str(path)}
+
+    processing_results = tmp / "processing_results.yaml"
+    processing_results.write_text(
+        yaml.safe_dump(
+            {
+                "channels": {"pc": [0, ["area"]], "fl": [[1, ["intensity_total"]]]},
+                "time_units": "min",
+                "results": results,
+            }
+        )
+    )
+    samples = tmp / "samples.yaml"
+    samples.write_text(
+        yaml.safe_dump(
+            {"samples": [{"name": "synthetic", "fovs": f"0-{n_fovs - 1}"}]}
+        )
+    )
+    return samples, processing_results
+
+
+def run_benchmark(config, steps, repeats, merge_fovs):
+    """Time the selected steps on one synthetic dataset.
+
+    Later steps use the outputs of earlier ones, so those are always
+    computed (but only timed if selected).
+    """
+    start = time.perf_counter()
+    data = generate_synthetic_dataset(config)
+    print(f"Generated {data.pc.shape} stacks in {time.perf_counter() - start:.2f} s")
+    n_frames = config.n_frames
+    results = {}
+
+    def run(name, func, items, unit):
+        times, result = time_repeats(func, repeats if name in steps else 1)
+        if name in steps:
+            results[name] = step_result(times, items, unit)
+            print(
+                f"{name:>13}: best {min(times):8.3f} s | "
+                f"median {statistics.median(times):8.3f} s | "
+                f"{results[name]['items_per_s']} {unit}/s"
+            )
+        return result
+
+    seg = np.empty(data.pc.shape, dtype=bool)
+    run("segmentation", lambda: segment_cell(data.pc, seg), n_frames, "frames")
+
+    background = np.empty(data.fl.shape, dtype=np.float32)
+    try:
+        run(
+            "background",
+            lambda: estimate_background(data.fl, seg, background),
+            n_frames,
+            "frames",
+        )
+    except Exception as exc:
+        # Frames smaller than the background tiles cannot be estimated
+        print(f"{'background':>13}: skipped ({exc})")
+        if "background" in steps:
+            results["background"] = {"skipped": str(exc)}
+        background = 0.0
+
+    labeled = np.empty(data.pc.shape, dtype=np.uint16)
+    run("tracking", lambda: track_cell(seg, labeled), n_frames, "frames")
+
+    channels = [
+        ExtractionChannel(channel=0, image=data.pc, features=["area"]),
+        ExtractionChannel(
+            channel=1,
+            image=data.fl,
+            features=["intensity_total"],
+            background=background,
+        ),
+    ]
+    traces = run(
+        "extraction",
+        lambda: extract_traces(
+            labeled, data.times, channels, min_length=max(n_frames // 2, 1)
+        ),
+        n_frames,
+        "frames",
+    )
+    n_cells = int(traces["cell"].nunique()) if not traces.empty else 0
+    print(f"{'':>13}  {n_cells} cells with traces")
+    if n_cells == 0:
+        print("No traces extracted; skipping merge and fitting")
+        return results
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        samples, processing_results = write_merge_inputs(tmp, traces, merge_fovs)
+        merge_dir = tmp / "merged"
+        run(
+            "merge",
+            lambda: run_merge(samples, processing_results, merge_dir),
+            len(traces) * merge_fovs,
+            "rows",
+        )
+        merged = load_analysis_csv(merge_dir / "synthetic_intensity_total_ch_1.csv")
+
+    cells = merged.loc[[0]]
+    run(
+        "fitting",
+        lambda: fit_trace_data(cells, "maturation"),
+        cells.index.nunique(),
+        "cells",
+    )
+    return results
+
+
+def compare(results, baseline_path):
+    """Print the speedup of ``results`` over a previous results file."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    print()
+    commit = baseline.get("environment", {}).get("git_commit")
+    print(f"Comparison with {baseline_path} (commit {commit})")
+    print("-" * 60)
+    if baseline.get("config") != results["config"]:
+        print("Warning: the baseline was run with a different configuration")
+    for name, current in results["steps"].items():
+        previous = baseline.get("steps", {}).get(name)
+        if previous is None:
+            print(f"{name:>13}: not in baseline")
+            continue
+        if "best_s" not in current or "best_s" not in previous:
+            print(f"{name:>13}: skipped in this run or the baseline")
+            continue
+        print(
+            f"{name:>13}: {previous['best_s']:8.3f} s -> {current['best_s']:8.3f} s "
+            f"(speedup {previous['best_s'] / current['best_s']:.2f}x)"
+        )
+
+
+def main():
+    """Run the step benchmark suite."""
+    defaults = SyntheticConfig()
+    parser = argparse.ArgumentParser(description="Benchmark PyAMA workflow steps")
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=defaults.n_frames,
+        help=f"Frames (default: {defaults.n_frames})",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=defaults.height,
+        help=f"Frame height and width (default: {defaults.height})",
+    )
+    parser.add_argument(
+        "--cells",
+        type=int,
+        default=defaults.n_cells,
+        help=f"Founder cells (default: {defaults.n_cells})",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=defaults.seed, help="Random seed (default: 0)"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Timing repeats (default: 3)"
+    )
+    parser.add_argument(
+        "--merge-fovs",
+        type=int,
+        default=4,
+        help="FOVs merged, each a copy of the traces (default: 4)",
+    )
+    parser.add_argument(
+        "--steps",
+        nargs="+",
+        choices=STEPS,
+        default=STEPS,
+        help="Steps to time (default: all)",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument(
+        "--compare", type=Path, help="Previous results JSON to compare with"
+    )
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        n_frames=args.frames,
+        height=args.size,
+        width=args.size,
+        n_cells=args.cells,
+        seed=args.seed,
+    )
+
+    print("=" * 60)
+    print("PyAMA Step Benchmark")
+    print("=" * 60)
+
+    steps = run_benchmark(config, args.steps, args.repeats, args.merge_fovs)
+    results = {
+        "environment": environment(),
+        "config": config_dict(config),
+        "repeats": args.repeats,
+        "merge_fovs": args.merge_fovs,
+        "steps": steps,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
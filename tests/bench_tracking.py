@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for PyAMA IoU tracking.
+
+Times frame-to-frame cost matrix construction and linking on dense
+synthetic fields, where cells sit on a jittered grid and drift slightly
+between frames. A second section compares exact mask IoU (label-pair
+histogram) with bbox IoU on rasterized frames of the same density.
+
+Usage:
+    python bench_tracking.py [--cells 500 2000 5000] [--repeats 3] [--reference] [--dense]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from pyama_core.processing.tracking.iou import (
+    _build_cost_matrix,
+    _candidate_costs,
+    _label_frame,
+    _mask_candidate_costs,
+    _solve_sparse_assignment,
+)
+from pyama_core.types.processing import Region
+
+
+def dense_field(rng, n_cells, cell_extent=16, spacing=20, drift=3):
+    """Create previous/current bbox-only regions for a dense field.
+
+    Returns:
+        tuple: (prev_regions, curr_regions)
+    """
+    side = int(np.ceil(np.sqrt(n_cells)))
+    gy, gx = np.divmod(np.arange(n_cells), side)
+    y0 = gy * spacing + rng.integers(0, spacing - cell_extent + 1, n_cells)
+    x0 = gx * spacing + rng.integers(0, spacing - cell_extent + 1, n_cells)
+    h = rng.integers(cell_extent // 2, cell_extent + 1, n_cells)
+    w = rng.integers(cell_extent // 2, cell_extent + 1, n_cells)
+
+    def _regions(oy, ox):
+        return [
+            Region(
+                area=int(hh * ww),
+                bbox=(int(yy), int(xx), int(yy + hh), int(xx + ww)),
+                coords=np.empty((0, 2), dtype=np.int64),
+            )
+            for yy, xx, hh, ww in zip(oy, ox, h, w)
+        ]
+
+    dy = rng.integers(-drift, drift + 1, n_cells)
+    dx = rng.integers(-drift, drift + 1, n_cells)
+    prev_regions = _regions(y0 + drift, x0 + drift)
+    curr_regions = _regions(y0 + drift + dy, x0 + drift + dx)
+    return prev_regions, curr_regions
+
+
+def dense_frames(rng, n_cells, radius=7, spacing=20, drift=3):
+    """Rasterize two consecutive binary frames of drifting disks.
+
+    Returns:
+        tuple: (prev_frame, curr_frame) boolean arrays
+    """
+    side = int(np.ceil(np.sqrt(n_cells)))
+    size = side * spacing + 2 * (radius + drift)
+    yy, xx = np.mgrid[-radius : radius + 1, -radius : radius + 1]
+    gy, gx = np.divmod(np.arange(n_cells), side)
+    cy = gy * spacing + radius + drift + rng.integers(0, spacing - 2 * radius, n_cells)
+    cx = gx * spacing + radius + drift + rng.integers(0, spacing - 2 * radius, n_cells)
+    r = rng.uniform(radius * 0.6, radius, n_cells)
+
+    def _rasterize(ys, xs):
+        frame = np.zeros((size, size), dtype=bool)
+        for y, x, rr in zip(ys, xs, r):
+            disk = yy**2 + xx**2 <= rr * rr
+            frame[y - radius : y + radius + 1, x - radius : x + radius + 1] |= disk
+        return frame
+
+    dy, dx = rng.integers(-drift, drift + 1, (2, n_cells))
+    return _rasterize(cy, cx), _rasterize(cy + dy, cx + dx)
+
+
+def link_frames(prev_frame, curr_frame, iou_mode, min_iou=0.1):
+    """Label two frames and link them with the sparse solver."""
+    prev_labeled, prev_props = _label_frame(prev_frame, None, None)
+    curr_labeled, curr_props = _label_frame(curr_frame, None, None)
+    prev_regions = list(prev_props.values())
+    curr_regions = list(curr_props.values())
+    if iou_mode == "mask":
+        rows, cols, iou = _mask_candidate_costs(
+            prev_labeled,
+            curr_labeled,
+            list(prev_props),
+            list(curr_props),
+            prev_regions,
+            curr_regions,
+            min_iou,
+        )
+    else:
+        rows, cols, iou = _candidate_costs(prev_regions, curr_regions, min_iou)
+    return _solve_sparse_assignment(rows, cols, 1.0 - iou)
+
+
+def reference_cost_matrix(prev_regions, curr_regions, min_iou):
+    """Pairwise Python loop over every previous x current pair."""
+    cost = np.ones((len(prev_regions), len(curr_regions)), dtype=float)
+    valid = np.zeros_like(cost, dtype=bool)
+    for i, a in enumerate(prev_regions):
+        ay0, ax0, ay1, ax1 = a.bbox
+        for j, b in enumerate(curr_regions):
+            by0, bx0, by1, bx1 = b.bbox
+            inter_h = min(ay1, by1) - max(ay0, by0)
+            inter_w = min(ax1, bx1) - max(ax0, bx0)
+            if inter_h <= 0 or inter_w <= 0:
+                continue
+            inter = inter_h * inter_w
+            union = (ay1 - ay0) * (ax1 - ax0) + (by1 - by0) * (bx1 - bx0) - inter
+            iou = inter / union
+            if iou >= min_iou:
+                cost[i, j] = 1.0 - iou
+                valid[i, j] = True
+    return cost, valid
+
+
+def sparse_link(prev_regions, curr_regions, min_iou):
+    """Link two frames with gated candidates and the sparse solver."""
+    rows, cols, iou = _candidate_costs(prev_regions, curr_regions, min_iou)
+    return _solve_sparse_assignment(rows, cols, 1.0 - iou)
+
+
+def dense_link(prev_regions, curr_regions, min_iou):
+    """Link two frames with the full cost matrix and Hungarian solver."""
+    cost, valid = _build_cost_matrix(prev_regions, curr_regions, min_iou)
+    row_ind, col_ind = linear_sum_assignment(cost)
+    keep = valid[row_ind, col_ind]
+    return row_ind[keep], col_ind[keep]
+
+
+def time_call(func, repeats):
+    """Return the best wall time over ``repeats`` calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Run the tracking benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark PyAMA IoU tracking")
+    parser.add_argument(
+        "--cells",
+        type=int,
+        nargs="+",
+        default=[500, 2000, 5000],
+        help="Cells per frame (default: 500 2000 5000)",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Timing repeats (default: 3)"
+    )
+    parser.add_argument(
+        "--reference",
+        action="store_true",
+        help="Also time the pairwise Python loop (slow for large fields)",
+    )
+    parser.add_argument(
+        "--dense",
+        action="store_true",
+        help="Also time dense Hungarian linking (cubic in cell count)",
+    )
+    args = parser.parse_args()
+
+    print("="*60)
+    print("PyAMA IoU Tracking Benchmark")
+    print("="*60)
+
+    rng = np.random.default_rng(0)
+    for n_cells in args.cells:
+        prev_regions, curr_regions = dense_field(rng, n_cells)
+        elapsed, (cost, valid) = time_call(
+            lambda: _build_cost_matrix(prev_regions, curr_regions, 0.1),
+            args.repeats,
+        )
+        print(
+            f"{n_cells:>6} cells: cost matrix {elapsed * 1000:9.2f} ms "
+            f"({int(valid.sum())} valid pairs)"
+        )
+        if args.reference:
+            ref_elapsed, _ = time_call(
+                lambda: reference_cost_matrix(prev_regions, curr_regions, 0.1), 1
+            )
+            print(
+                f"{'':>6}        reference   {ref_elapsed * 1000:9.2f} ms "
+                f"(speedup {ref_elapsed / elapsed:.1f}x)"
+            )
+
+        sparse_elapsed, (rows, _) = time_call(
+            lambda: sparse_link(prev_regions, curr_regions, 0.1), args.repeats
+        )
+        print(
+            f"{'':>6}        sparse link {sparse_elapsed * 1000:9.2f} ms "
+            f"({len(rows)} matches)"
+        )
+        if args.dense:
+            dense_elapsed, (rows, _) = time_call(
+                lambda: dense_link(prev_regions, curr_regions, 0.1), 1
+            )
+            print(
+                f"{'':>6}        dense link  {dense_elapsed * 1000:9.2f} ms "
+                f"({len(rows)} matches)"
+            )
+
+    print()
+    print("Mask IoU vs bbox IoU (label + link, rasterized frames)")
+    print("-"*60)
+    for n_cells in args.cells:
+        prev_frame, curr_frame = dense_frames(rng, n_cells)
+        bbox_elapsed, bbox_match = time_call(
+            lambda: link_frames(prev_frame, curr_frame, "bbox"), args.repeats
+        )
+        mask_elapsed, mask_match = time_call(
+            lambda: link_frames(prev_frame, curr_frame, "mask"), args.repeats
+        )
+        bbox_pairs = set(zip(*(m.tolist() for m in bbox_match)))
+        mask_pairs = set(zip(*(m.tolist() for m in mask_match)))
+        print(
+            f"{n_cells:>6} cells: bbox {bbox_elapsed * 1000:9.2f} ms | "
+            f"mask {mask_elapsed * 1000:9.2f} ms | "
+            f"{len(bbox_pairs & mask_pairs)}/{len(mask_pairs)} mask matches agree"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script for PyAMA atomic outputs and partial file cleanup.
+
+This script tests:
+- Trace tables are renamed into place and leave no temporary file behind
+- A failed write leaves neither a temporary nor a final file
+- Startup cleanup removes orphaned partial files but keeps resumable ones
+- Interrupted tracking leaves only a temporary file that the next run resumes
+
+Usage:
+    python test_atomic.py
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from pyama_core.io.atomic import (
+    cleanup_partial_outputs,
+    find_partial_outputs,
+    partial_path,
+    resume_checkpoint_path,
+)
+from pyama_core.io.processing_csv import write_trace_table
+from pyama_core.processing.workflow.provenance import provenance_path, read_provenance
+from pyama_core.processing.workflow.services import (
+    SegmentationService,
+    TrackingService,
+)
+from pyama_core.types.processing import (
+    ChannelSelection,
+    Channels,
+    ProcessingContext,
+    ensure_results_entry,
+)
+
+
+def blob_stack(rng, n_frames=12, size=160, radius=14):
+    """Phase-contrast-like stack of slowly drifting textured disks on flat noise."""
+    yy, xx = np.mgrid[:size, :size]
+    centers = np.array([[40.0, 40.0], [40.0, 110.0], [110.0, 40.0], [110.0, 110.0]])
+    stack = rng.normal(100, 1, (n_frames, size, size))
+    for t in range(n_frames):
+        for cy, cx in centers + t * 0.5:
+            disk = (yy - cy) ** 2 + (xx - cx) ** 2 <= radius**2
+            stack[t][disk] += rng.normal(60, 30, int(disk.sum()))
+    return np.clip(stack, 0, None).astype(np.uint16)
+
+
+class CancellingTrackingService(TrackingService):
+    """Tracking service that sets the cancel event after ``stop_at`` frames."""
+
+    def __init__(self, cancel_event, stop_at):
+        super().__init__()
+        self.cancel_event = cancel_event
+        self.stop_at = stop_at
+
+    def progress_callback(self, f, t, T, message):
+        if t >= self.stop_at:
+            self.cancel_event.set()
+
+
+def test_trace_table_commit():
+    """Trace tables appear only under their final name."""
+    print("\n" + "=" * 60)
+    print("Testing atomic trace table writes")
+    print("=" * 60)
+
+    df = pd.DataFrame({"fov": [0, 0], "cell": [1, 1], "frame": [0, 1]})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "traces.csv"
+        write_trace_table(df, path)
+        assert path.exists()
+        assert not partial_path(path).exists()
+        assert len(pd.read_csv(path)) == 2
+
+        bad_path = Path(tmp) / "traces_bad.csv"
+        try:
+            write_trace_table(df, bad_path, not_a_to_csv_option=True)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Invalid write should raise")
+        assert not bad_path.exists()
+        assert not partial_path(bad_path).exists()
+        print(f"   Remaining files: {sorted(p.name for p in Path(tmp).iterdir())}")
+    print("\n✓ Trace table commit test completed\n")
+
+
+def test_cleanup_partial_outputs():
+    """Orphaned partial files are removed, resumable ones are kept."""
+    print("\n" + "=" * 60)
+    print("Testing partial output cleanup")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fov_dir = Path(tmp)
+        final = fov_dir / "test_fov_000_seg_ch_0.npy"
+        np.save(final, np.zeros(3))
+        orphan = partial_path(fov_dir / "test_fov_000_fl_background_ch_1.npy")
+        orphan.write_bytes(b"half")
+        torn = fov_dir / "test_fov_000_seg_labeled_ch_0_tracking_ckpt.npz.tmp"
+        torn.write_bytes(b"half")
+        labeled = fov_dir / "test_fov_000_seg_labeled_ch_0.npy"
+        resumable = partial_path(labeled)
+        resumable.write_bytes(b"half")
+        provenance_path(resumable).write_text("{}")
+        resume_checkpoint_path(labeled).write_bytes(b"state")
+
+        assert find_partial_outputs(fov_dir) == sorted([orphan, torn])
+        removed = cleanup_partial_outputs(fov_dir)
+        assert sorted(removed) == sorted([orphan, torn])
+        assert final.exists() and resumable.exists()
+        assert provenance_path(resumable).exists()
+        assert cleanup_partial_outputs(fov_dir) == []
+        print(f"   Removed: {[p.name for p in removed]}")
+    print("\n✓ Partial output cleanup test completed\n")
+
+
+def test_interrupted_tracking_resumes():
+    """An interrupted step never leaves a file under its final name."""
+    print("\n" + "=" * 60)
+    print("Testing interrupted tracking")
+    print("=" * 60)
+
+    rng = np.random.default_rng(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        fov_dir = output_dir / "fov_000"
+        fov_dir.mkdir()
+        pc_path = fov_dir / "test_fov_000_pc_ch_0.npy"
+        np.save(pc_path, blob_stack(rng))
+        entry = ensure_results_entry()
+        entry.pc = (0, pc_path)
+        metadata = SimpleNamespace(base_name="test", timepoints=None)
+        context = ProcessingContext(
+            output_dir=output_dir,
+            channels=Channels(pc=ChannelSelection(0, ["area"])),
+            results={0: entry},
+            params={},
+        )
+        SegmentationService().process_fov(metadata, context, output_dir, 0)
+        seg_path = Path(context.results[0].seg[1])
+        assert seg_path.exists() and not partial_path(seg_path).exists()
+
+        labeled = fov_dir / "test_fov_000_seg_labeled_ch_0.npy"
+        cancel_event = threading.Event()
+        CancellingTrackingService(cancel_event, stop_at=5).process_fov(
+            metadata, context, output_dir, 0, cancel_event
+        )
+        assert not labeled.exists()
+        assert partial_path(labeled).exists()
+        assert resume_checkpoint_path(labeled).exists()
+        assert cleanup_partial_outputs(fov_dir) == []
+        print("   Interrupted: only the temporary file and checkpoint exist")
+
+        TrackingService().process_fov(metadata, context, output_dir, 0)
+        assert labeled.exists()
+        assert not partial_path(labeled).exists()
+        assert not resume_checkpoint_path(labeled).exists()
+        assert not provenance_path(partial_path(labeled)).exists()
+        assert read_provenance(labeled)["step"] == "tracking"
+        assert find_partial_outputs(fov_dir) == []
+        print(f"   Resumed: {labeled.name} committed with its provenance record")
+    print("\n✓ Interrupted tracking test completed\n")
+
+
+if __name__ == "__main__":
+    test_trace_table_commit()
+    test_cleanup_partial_outputs()
+    test_interrupted_tracking_resumes()
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""
+Test script for PyAMA trace extraction.
+
+This script tests feature extraction on small synthetic stacks:
+- Label index reductions (area, bbox, centroid) against regionprops
+- Indexed area and intensity_total against the per-cell extractors
+- Label-aware frame erosion against per-cell erosion
+- Batch feature plugins discovered and used by the extraction pipeline
+- Plugin features are available to extraction in spawned worker processes
+- Frame-wise extraction from memory-mapped stacks with a scalar background
+- Single-pass multi-channel extraction against per-channel merges
+- Length/border pre-filtering against filtering the full trace table
+- Incremental extraction of newly requested features into existing traces
+- Thread-parallel frame extraction, ordered progress and cancellation
+
+Usage:
+    python test_extraction.py
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import tempfile
+import textwrap
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from skimage.measure import label, regionprops
+
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+from pyama_core.plugin import load_plugins
+from pyama_core.processing.extraction import extract_trace, extract_traces
+from pyama_core.processing.extraction.features import (
+    get_batch_feature_extractor,
+    get_feature_extractor,
+    plugin_feature_dirs,
+)
+from pyama_core.processing.extraction.label_index import build_label_index
+from pyama_core.processing.extraction.run import _extract_all
+from pyama_core.io.processing_csv import read_trace_manifest
+from pyama_core.processing.workflow.run import (
+    _FovDescriptor,
+    _init_process_worker,
+    _run_step_in_process,
+)
+from pyama_core.processing.workflow.services.steps.extraction import ExtractionService
+from pyama_core.types.processing import (
+    ChannelSelection,
+    Channels,
+    ExtractionChannel,
+    ExtractionContext,
+    ProcessingContext,
+    ensure_results_entry,
+)
+
+
+def random_label_frame(rng, size=128, n_blobs=40, radius=7):
+    """Labeled frame of random (possibly touching) disks."""
+    yy, xx = np.mgrid[:size, :size]
+    frame = np.zeros((size, size), dtype=bool)
+    for cy, cx, r in zip(
+        rng.uniform(0, size, n_blobs),
+        rng.uniform(0, size, n_blobs),
+        rng.uniform(radius / 2, radius, n_blobs),
+    ):
+        frame |= (yy - cy) ** 2 + (xx - cx) ** 2 <= r * r
+    return label(frame, connectivity=1).astype(np.uint16)
+
+
+def extract_frame(image, labeled, background, time=0.0, **kwargs):
+    """Extract one frame through the stack path (``_extract_all``)."""
+    return _extract_all(
+        image[np.newaxis],
+        labeled[np.newaxis],
+        np.array([time]),
+        background[np.newaxis],
+        **kwargs,
+    )
+
+
+def per_cell_reference(image, labeled, background, weight, erosion_size=0):
+    """Per-cell mask extraction as done before the label index."""
+    area = get_feature_extractor("area")
+    intensity = get_feature_extractor("intensity_total")
+    rows = {}
+    for c in np.unique(labeled)[1:]:
+        ctx = ExtractionContext(
+            image=image,
+            mask=labeled == c,
+            background=background,
+            background_weight=weight,
+            erosion_size=erosion_size,
+        )
+        rows[int(c)] = (float(area(ctx)), float(intensity(ctx)))
+    return rows
+
+
+def test_label_index_matches_regionprops():
+    """Test label index area, bbox and centroid against regionprops."""
+    print("="*60)
+    print("Testing Label Index Reductions")
+    print("="*60)
+
+    rng = np.random.default_rng(0)
+    labeled = random_label_frame(rng)
+    index = build_label_index(labeled)
+    props = regionprops(labeled)
+
+    print(f"   Labels: {len(index)}")
+    assert index.labels.tolist() == [p.label for p in props]
+    for i, p in enumerate(props):
+        y0, x0, y1, x1 = p.bbox
+        assert index.areas[i] == p.area
+        assert index.bboxes[i].tolist() == [y0, x0, y1 - 1, x1 - 1]
+        assert np.allclose(index.centroids[i], p.centroid)
+        assert np.array_equal(index.mask(i), labeled == p.label)
+
+    empty = build_label_index(np.zeros((8, 8), dtype=np.uint16))
+    assert len(empty) == 0 and empty.bboxes.shape == (0, 4)
+
+    print("\n✓ Label index tests completed\n")
+
+
+def test_indexed_features_match_per_cell():
+    """Test that indexed area and intensity_total are bit-identical."""
+    print("="*60)
+    print("Testing Indexed Features vs Per-Cell Extractors")
+    print("="*60)
+
+    rng = np.random.default_rng(1)
+    labeled = random_label_frame(rng, size=160, n_blobs=60)
+    image = (rng.random(labeled.shape) * 1000).astype(np.float32)
+    background = (rng.random(labeled.shape) * 100).astype(np.float32)
+
+    columns = extract_frame(
+        image,
+        labeled,
+        background,
+        time=1.5,
+        feature_names=["area", "intensity_total"],
+        background_weight=0.7,
+    )
+    expected = per_cell_reference(image, labeled, background, 0.7)
+
+    print(f"   Cells: {len(columns['cell'])}")
+    assert columns["cell"].tolist() == sorted(expected)
+    for i, c in enumerate(columns["cell"].tolist()):
+        assert columns["area"][i] == expected[c][0]
+        assert columns["intensity_total"][i] == expected[c][1]
+    assert (columns["frame"] == 0).all() and (columns["time"] == 1.5).all()
+
+    print("\n✓ Indexed feature tests completed\n")
+
+
+def test_eroded_intensity_matches_per_cell():
+    """Test intensity_total with frame-level erosion against per-cell erosion."""
+    print("="*60)
+    print("Testing Label-Aware Erosion for intensity_total")
+    print("="*60)
+
+    rng = np.random.default_rng(3)
+    labeled = random_label_frame(rng, size=160, n_blobs=60)
+    image = (rng.random(labeled.shape) * 1000).astype(np.float32)
+    background = (rng.random(labeled.shape) * 100).astype(np.float32)
+
+    for erosion_size in (1, 2, 3, 9):
+        columns = extract_frame(
+            image,
+            labeled,
+            background,
+            feature_names=["intensity_total"],
+            background_weight=0.5,
+            erosion_size=erosion_size,
+        )
+        expected = per_cell_reference(image, labeled, background, 0.5, erosion_size)
+        vanished = sum(1 for _, v in expected.values() if v == 0.0)
+        print(f"   erosion_size={erosion_size}: {vanished} cells vanish")
+        for i, c in enumerate(columns["cell"].tolist()):
+            assert columns["intensity_total"][i] == expected[c][1]
+
+    print("\n✓ Erosion tests completed\n")
+
+
+BATCH_PLUGIN = """
+import numpy as np
+from scipy import ndimage
+
+PLUGIN_NAME = "test_intensity_max"
+PLUGIN_TYPE = "feature"
+PLUGIN_FEATURE_TYPE = "fluorescence"
+
+
+def extract_test_intensity_max_batch(ctx):
+    return ndimage.maximum(ctx.image, labels=ctx.labeled, index=ctx.labels)
+"""
+
+PER_CELL_PLUGIN = """
+PLUGIN_NAME = "test_intensity_min"
+PLUGIN_TYPE = "feature"
+PLUGIN_FEATURE_TYPE = "fluorescence"
+
+
+def extract_test_intensity_min(ctx):
+    return ctx.image[ctx.mask.astype(bool)].min()
+"""
+
+
+def test_batch_plugin_features():
+    """Test batch-only and per-cell plugins through the loader."""
+    print("="*60)
+    print("Testing Batch Feature Plugins")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plugin_dir = Path(tmp)
+        (plugin_dir / "test_intensity_max.py").write_text(
+            textwrap.dedent(BATCH_PLUGIN)
+        )
+        (plugin_dir / "test_intensity_min.py").write_text(
+            textwrap.dedent(PER_CELL_PLUGIN)
+        )
+        scanner = load_plugins(plugin_dir)
+
+    print(f"   Plugins: {sorted(scanner.plugins)} errors: {scanner.errors}")
+    assert scanner.get_plugin("test_intensity_max")["batch"] is True
+    assert scanner.get_plugin("test_intensity_min")["batch"] is False
+    assert get_batch_feature_extractor("test_intensity_max") is not None
+    assert get_batch_feature_extractor("test_intensity_min") is None
+
+    rng = np.random.default_rng(2)
+    labeled = random_label_frame(rng)
+    image = (rng.random(labeled.shape) * 1000).astype(np.float32)
+    columns = extract_frame(
+        image,
+        labeled,
+        np.zeros_like(image),
+        feature_names=["test_intensity_max", "test_intensity_min"],
+    )
+    # Per-cell form derived from the batch-only plugin
+    max_per_cell = get_feature_extractor("test_intensity_max")
+    for i, c in enumerate(columns["cell"].tolist()):
+        mask = labeled == c
+        assert columns["test_intensity_max"][i] == image[mask].max()
+        assert columns["test_intensity_min"][i] == image[mask].min()
+        ctx = ExtractionContext(image=image, mask=mask, background=image * 0)
+        assert max_per_cell(ctx) == image[mask].max()
+
+    print("\n✓ Batch plugin tests completed\n")
+
+
+MEAN_PLUGIN = """
+PLUGIN_NAME = "test_intensity_mean"
+PLUGIN_TYPE = "feature"
+PLUGIN_FEATURE_TYPE = "fluorescence"
+
+
+def extract_test_intensity_mean(ctx):
+    return float(ctx.image[ctx.mask.astype(bool)].mean())
+"""
+
+
+def test_plugin_features_in_process_workers():
+    """Spawned workers load the parent's plugin features before extracting."""
+    print("="*60)
+    print("Testing Plugin Features in Worker Processes")
+    print("="*60)
+
+    rng = np.random.default_rng(5)
+    labeled = np.repeat(random_label_frame(rng, size=200)[None], 32, axis=0)
+    fl = (rng.random(labeled.shape) * 4000).astype(np.uint16)
+    metadata = SimpleNamespace(
+        base_name="test",
+        timepoints=None,
+        n_frames=32,
+        height=200,
+        width=200,
+        dtype="uint16",
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plugin_dir = Path(tmp) / "plugins"
+        plugin_dir.mkdir()
+        (plugin_dir / "test_intensity_mean.py").write_text(
+            textwrap.dedent(MEAN_PLUGIN)
+        )
+        load_plugins(plugin_dir)
+        assert plugin_dir.resolve() in plugin_feature_dirs()
+
+        output_dir = Path(tmp) / "output"
+        fov_dir = output_dir / "fov_000"
+        fov_dir.mkdir(parents=True)
+        np.save(fov_dir / "seg_labeled.npy", labeled)
+        np.save(fov_dir / "fl.npy", fl)
+        entry = ensure_results_entry()
+        entry.seg_labeled = (0, fov_dir / "seg_labeled.npy")
+        entry.fl = [(1, fov_dir / "fl.npy")]
+        descriptor = _FovDescriptor(
+            metadata=metadata,
+            output_dir=output_dir,
+            channels=Channels(fl=[ChannelSelection(1, ["test_intensity_mean"])]),
+            params={},
+            fov=0,
+            results=entry,
+        )
+
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=mp_context,
+            initializer=_init_process_worker,
+            initargs=(None, plugin_feature_dirs()),
+        ) as executor:
+            payload = executor.submit(
+                _run_step_in_process, descriptor, "extraction"
+            ).result()
+
+        assert payload["error"] is None, payload["error"]
+        traces = pd.read_csv(next(fov_dir.glob("*_traces.csv")))
+        print(f"   Columns: {list(traces.columns)[-2:]}")
+        assert "test_intensity_mean_ch_1" in traces.columns
+        assert len(traces) > 0
+
+    print("\n✓ Process worker plugin test completed\n")
+
+
+def test_memmap_scalar_background():
+    """Test memmapped uint16 input with scalar background vs in-memory zeros."""
+    print("="*60)
+    print("Testing Extraction from Memory-Mapped Stacks")
+    print("="*60)
+
+    rng = np.random.default_rng(4)
+    n_frames = 32
+    labeled = np.repeat(random_label_frame(rng, size=200)[None], n_frames, axis=0)
+    image = (rng.random(labeled.shape) * 4000).astype(np.uint16)
+    times = np.arange(n_frames, dtype=float)
+
+    expected = extract_trace(
+        image.astype(np.float32),
+        labeled,
+        times,
+        np.zeros(image.shape, dtype=np.float32),
+        erosion_size=2,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fl.npy"
+        stack = open_memmap(path, mode="w+", dtype=np.uint16, shape=image.shape)
+        stack[:] = image
+        stack.flush()
+        del stack
+        stack = open_memmap(path, mode="r")
+        result = extract_trace(stack, labeled, times, 0.0, erosion_size=2)
+        del stack
+
+    print(f"   Rows: {len(result)}")
+    assert len(result) > 0
+    assert result.equals(expected)
+
+    print("\n✓ Memory-mapped extraction test completed\n")
+
+
+def test_multi_channel_single_pass():
+    """Test extract_traces against per-channel extract_trace and merge."""
+    print("="*60)
+    print("Testing Single-Pass Multi-Channel Extraction")
+    print("="*60)
+
+    rng = np.random.default_rng(5)
+    n_frames = 40
+    labeled = np.repeat(random_label_frame(rng, size=160)[None], n_frames, axis=0)
+    labeled[n_frames // 2 :, :20] = 0
+    times = np.arange(n_frames, dtype=float) * 0.5
+    pc = (rng.random(labeled.shape) * 100).astype(np.uint16)
+    fl = (rng.random(labeled.shape) * 4000).astype(np.uint16)
+    fl_background = (rng.random(labeled.shape) * 50).astype(np.float32)
+
+    channels = [
+        ExtractionChannel(0, pc, ["area"], 0.0),
+        ExtractionChannel(1, fl, ["intensity_total"], fl_background),
+        ExtractionChannel(2, fl, ["intensity_total", "area"], 0.0),
+    ]
+    result = extract_traces(
+        labeled, times, channels, background_weight=0.8, erosion_size=1
+    )
+
+    base = ["cell", "frame", "time", "good", "position_x", "position_y"]
+    base += ["bbox_x0", "bbox_y0", "bbox_x1", "bbox_y1"]
+    expected = None
+    for channel in channels:
+        df = extract_trace(
+            channel.image,
+            labeled,
+            times,
+            channel.background,
+            features=channel.features,
+            background_weight=0.8,
+            erosion_size=1,
+        )
+        df = df.rename(
+            columns={f: f"{f}_ch_{channel.channel}" for f in channel.features}
+        )
+        expected = df if expected is None else expected.merge(df, on=base)
+
+    print(f"   Rows: {len(result)} columns: {len(result.columns)}")
+    assert len(result) > 0
+    assert sorted(result.columns) == sorted(expected.columns)
+    result = result.sort_values(["cell", "frame"]).reset_index(drop=True)
+    expected = expected.sort_values(["cell", "frame"]).reset_index(drop=True)
+    assert result[list(expected.columns)].equals(expected)
+
+    print("\n✓ Multi-channel extraction test completed\n")
+
+
+def test_prefilter_matches_post_filter():
+    """Test that pre-filtered extraction equals filtering all traces."""
+    print("="*60)
+    print("Testing Length/Border Pre-Filtering")
+    print("="*60)
+
+    rng = np.random.default_rng(6)
+    n_frames = 24
+    labeled = np.repeat(random_label_frame(rng, size=160)[None], n_frames, axis=0)
+    # Short-lived debris and cells that only appear late
+    for t in range(n_frames):
+        debris = random_label_frame(rng, size=160, n_blobs=10, radius=3)
+        labeled[t][(labeled[t] == 0) & (debris > 0)] = 500 + t
+    labeled[: n_frames // 2][labeled[: n_frames // 2] % 3 == 0] = 0
+    image = (rng.random(labeled.shape) * 1000).astype(np.float32)
+    times = np.arange(n_frames, dtype=float)
+
+    full = _extract_all(
+        image, labeled, times, 0.0, feature_names=["area", "intensity_total"]
+    )
+    for min_length, border_width in ((10, 20), (20, 0), (1, 45)):
+        counts = full.groupby("cell").size()
+        near = full[
+            (full["bbox_x0"] < border_width)
+            | (full["bbox_x1"] > 160 - border_width)
+            | (full["bbox_y0"] < border_width)
+            | (full["bbox_y1"] > 160 - border_width)
+        ]["cell"].unique()
+        keep = set(counts.index[counts >= min_length]) - set(near)
+        expected = full[full["cell"].isin(keep)].reset_index(drop=True)
+
+        result = extract_trace(
+            image,
+            labeled,
+            times,
+            features=["area", "intensity_total"],
+            min_length=min_length,
+            border_width=border_width,
+        )
+        print(
+            f"   min_length={min_length} border_width={border_width}: "
+            f"{result['cell'].nunique()}/{full['cell'].nunique()} cells kept"
+        )
+        assert result["cell"].nunique() == len(keep)
+        result = result.sort_values(["frame", "cell"]).reset_index(drop=True)
+        assert result.equals(expected)
+
+    print("\n✓ Pre-filter tests completed\n")
+
+
+def test_incremental_extraction():
+    """Test that new features are appended without touching existing columns."""
+    print("="*60)
+    print("Testing Incremental Feature Extraction")
+    print("="*60)
+
+    rng = np.random.default_rng(7)
+    labeled = np.repeat(random_label_frame(rng, size=200)[None], 32, axis=0)
+    pc = (rng.random(labeled.shape) * 100).astype(np.uint16)
+    fl = (rng.random(labeled.shape) * 4000).astype(np.uint16)
+    metadata = SimpleNamespace(base_name="test", timepoints=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        fov_dir = output_dir / "fov_000"
+        fov_dir.mkdir()
+        for name, data in (("seg_labeled", labeled), ("pc", pc), ("fl", fl)):
+            np.save(fov_dir / f"{name}.npy", data)
+        entry = ensure_results_entry()
+        entry.seg_labeled = (0, fov_dir / "seg_labeled.npy")
+        entry.pc = (0, fov_dir / "pc.npy")
+        entry.fl = [(1, fov_dir / "fl.npy")]
+
+        def run(fl_features, params):
+            context = ProcessingContext(
+                output_dir=output_dir,
+                channels=Channels(
+                    pc=ChannelSelection(0, ["area"]),
+                    fl=[ChannelSelection(1, fl_features)],
+                ),
+                results={0: entry},
+                params=params,
+            )
+            ExtractionService().process_fov(metadata, context, output_dir, 0)
+            traces_path = context.results[0].traces
+            return traces_path, pd.read_csv(traces_path)
+
+        traces_path, first = run(["intensity_total"], {})
+        first_mtime = traces_path.stat().st_mtime_ns
+        run(["intensity_total"], {})
+        assert traces_path.stat().st_mtime_ns == first_mtime  # Nothing to do
+
+        _, added = run(["intensity_total", "area"], {})
+        print(f"   Columns after adding area_ch_1: {list(added.columns)[-3:]}")
+        assert added[first.columns].equals(first)
+        assert np.array_equal(added["area_ch_1"], added["area_ch_0"])
+
+        # Changed column parameters recompute only the affected columns
+        _, eroded = run(["intensity_total", "area"], {"erosion_size": 3})
+        assert not np.allclose(
+            eroded["intensity_total_ch_1"], added["intensity_total_ch_1"]
+        )
+        manifest = read_trace_manifest(traces_path)
+        assert manifest["columns"]["intensity_total_ch_1"]["erosion_size"] == 3
+        assert manifest["rows"] == {"min_length": 30, "border_width": 50}
+
+    print("\n✓ Incremental extraction test completed\n")
+
+
+def test_threaded_extraction():
+    """Test frame-parallel extraction against the serial path."""
+    print("="*60)
+    print("Testing Thread-Parallel Frame Extraction")
+    print("="*60)
+
+    rng = np.random.default_rng(8)
+    n_frames = 40
+    labeled = np.stack([random_label_frame(rng, size=160) for _ in range(n_frames)])
+    labeled[:, 60:100, 60:100] = 999  # One long-lived interior cell
+    image = (rng.random(labeled.shape) * 1000).astype(np.uint16)
+    background = (rng.random(labeled.shape) * 20).astype(np.float32)
+    times = np.arange(n_frames, dtype=float)
+
+    expected = extract_trace(image, labeled, times, background, erosion_size=2)
+    for n_threads in (2, 4):
+        progress = []
+        result = extract_trace(
+            image,
+            labeled,
+            times,
+            background,
+            erosion_size=2,
+            n_threads=n_threads,
+            progress_callback=lambda t, total, msg: progress.append(t),
+        )
+        print(f"   n_threads={n_threads}: {len(result)} rows")
+        assert result.equals(expected)
+        assert progress == list(range(n_frames))
+
+    cancel_event = threading.Event()
+
+    def cancel_at_frame(t, total, msg):
+        if t == 5:
+            cancel_event.set()
+
+    result = extract_trace(
+        image,
+        labeled,
+        times,
+        background,
+        n_threads=4,
+        progress_callback=cancel_at_frame,
+        cancel_event=cancel_event,
+    )
+    assert result.empty
+
+    print("\n✓ Threaded extraction test completed\n")
+
+
+if __name__ == "__main__":
+    test_label_index_matches_regionprops()
+    test_indexed_features_match_per_cell()
+    test_eroded_intensity_matches_per_cell()
+    test_batch_plugin_features()
+    test_plugin_features_in_process_workers()
+    test_memmap_scalar_background()
+    test_multi_channel_single_pass()
+    test_prefilter_matches_post_filter()
+    test_incremental_extraction()
+    test_threaded_extraction()
@@ -7,13 +7,18 @@ for analysis. It tests:
 - FOV range parsing
 - Merge execution
 - Channel-feature configuration extraction
+- CSV trace and merged tables
+- Columnar (Parquet/Feather) trace and merged tables (skipped without pyarrow)
 
 Usage:
     python test_merge.py
 """
 
+import importlib.util
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pytest
 import yaml
 from tempfile import TemporaryDirectory
 
@@ -22,6 +27,13 @@ from pyama_core.processing.merge import (
     parse_fov_range,
     run_merge,
 )
+from pyama_core.io.analysis_csv import load_analysis_csv
+from pyama_core.io.processing_csv import (
+    combine_trace_files,
+    get_dataframe,
+    trace_file_suffix,
+    write_trace_table,
+)
 from pyama_core.io.results_yaml import load_processing_results_yaml
 
 
@@ -218,6 +230,99 @@ def test_channel_feature_config():
         print("\n✓ Channel-feature configuration tests completed\n")
 
 
+def _sample_traces():
+    rng = np.random.default_rng(0)
+    return {
+        fov: pd.DataFrame({
+            "fov": fov,
+            "cell": np.repeat([1, 2], 3),
+            "frame": np.tile([0, 1, 2], 2),
+            "time": np.tile([0.0, 0.5, 1.0], 2),
+            "good": True,
+            "intensity_total_ch_1": rng.random(6) * 1e3,
+        })
+        for fov in (0, 1)
+    }
+
+
+def _check_trace_format(tmp_path, traces, trace_format):
+    """Write, reload and merge the traces in one format; return their paths."""
+    samples_yaml = tmp_path / "samples.yaml"
+    with samples_yaml.open("w", encoding="utf-8") as f:
+        yaml.safe_dump({"samples": [{"name": "s", "fovs": "0-1"}]}, f)
+
+    suffix = trace_file_suffix(trace_format)
+    paths = {}
+    for fov, df in traces.items():
+        paths[fov] = tmp_path / f"fov_{fov:03d}_traces{suffix}"
+        write_trace_table(df, paths[fov], float_format="%.6f")
+
+    loaded = get_dataframe(paths[1], fov=1)
+    assert list(loaded.columns) == list(traces[1].columns)
+    if trace_format != "csv":
+        # Binary tables keep types and full precision
+        assert loaded.equals(traces[1])
+    else:
+        assert np.allclose(
+            loaded["intensity_total_ch_1"], traces[1]["intensity_total_ch_1"]
+        )
+
+    processing_yaml = tmp_path / "processing_results.yaml"
+    with processing_yaml.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(
+            {
+                "channels": {"pc": None, "fl": [[1, ["intensity_total"]]]},
+                "time_units": "min",
+                "results": {
+                    str(fov): {"traces": str(path)} for fov, path in paths.items()
+                },
+            },
+            f,
+        )
+    output_dir = tmp_path / f"merged_{trace_format}"
+    run_merge(samples_yaml, processing_yaml, output_dir, output_format=trace_format)
+    merged = load_analysis_csv(output_dir / f"s_intensity_total_ch_1{suffix}")
+    print(f"   {trace_format}: merged {len(merged)} rows")
+    assert len(merged) == 12
+    # Minutes converted to hours on load
+    assert np.isclose(merged["time"].max(), 1.0 / 60)
+    return paths
+
+
+def test_csv_trace_format():
+    """Test trace tables written and merged as CSV."""
+    print("="*60)
+    print("Testing CSV Trace Format")
+    print("="*60)
+
+    with TemporaryDirectory() as tmp_dir:
+        _check_trace_format(Path(tmp_dir), _sample_traces(), "csv")
+
+    print("\n✓ CSV trace format tests completed\n")
+
+
+def test_columnar_trace_formats():
+    """Test trace tables written as Parquet and Feather (requires pyarrow)."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    print("="*60)
+    print("Testing Columnar Trace Formats")
+    print("="*60)
+
+    traces = _sample_traces()
+    with TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        for trace_format in ("parquet", "feather"):
+            _check_trace_format(tmp_path, traces, trace_format)
+
+        csv_paths = _check_trace_format(tmp_path, traces, "csv")
+        combined = combine_trace_files(csv_paths, tmp_path / "traces.parquet")
+        assert pq.ParquetFile(combined).num_row_groups == 2
+        assert len(get_dataframe(combined, fov=0)) == 6
+        print("   combined parquet: one row group per FOV")
+
+    print("\n✓ Columnar trace format tests completed\n")
+
+
 def main():
     """Run all merge functionality tests."""
     print("="*60)
@@ -228,6 +333,9 @@ def main():
     test_fov_range_parsing()
     test_merge_functionality()
     test_channel_feature_config()
+    test_csv_trace_format()
+    if importlib.util.find_spec("pyarrow") is not None:
+        test_columnar_trace_formats()
     
     print("="*60)
     print("✓ All merge tests completed successfully!")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Test script for PyAMA per-step performance metrics.
+
+This script tests:
+- Services send per-frame progress events to their reporter
+- A step meter records time, frames, bytes and peak RSS of a real step
+- Files written by a concurrent step of the same FOV are not attributed
+- Up-to-date steps are reported as skipped
+- The run report is written as run_metrics.json with per-step totals
+- A failing progress reporter does not fail the steps; thread-mode CPU time
+  of multi-threaded extraction is flagged as partial
+
+Usage:
+    python test_metrics.py
+"""
+
+from functools import partial
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from pyama_core.processing.workflow import run
+from pyama_core.processing.workflow.metrics import (
+    METRICS_FILENAME,
+    RunMetrics,
+    StepMeter,
+    StepMetrics,
+)
+from pyama_core.processing.workflow.services import SegmentationService
+from pyama_core.processing.workflow.services.base import BaseProcessingService
+from pyama_core.types.processing import (
+    ChannelSelection,
+    Channels,
+    ProcessingContext,
+    ensure_results_entry,
+)
+
+
+def blob_stack(rng, n_frames=8, size=160, radius=14):
+    """Phase-contrast-like stack of textured disks on flat noise."""
+    yy, xx = np.mgrid[:size, :size]
+    stack = rng.normal(100, 1, (n_frames, size, size))
+    for t in range(n_frames):
+        for cy, cx in [(40, 40), (110, 110)]:
+            disk = (yy - cy) ** 2 + (xx - cx) ** 2 <= radius**2
+            stack[t][disk] += rng.normal(60, 30, int(disk.sum()))
+    return np.clip(stack, 0, None).astype(np.uint16)
+
+
+def make_fov(tmp, n_frames=8):
+    """Output directory with one phase contrast stack for FOV 0."""
+    output_dir = Path(tmp)
+    fov_dir = output_dir / "fov_000"
+    fov_dir.mkdir()
+    pc_path = fov_dir / "test_fov_000_pc_ch_0.npy"
+    np.save(pc_path, blob_stack(np.random.default_rng(0), n_frames))
+    entry = ensure_results_entry()
+    entry.pc = (0, pc_path)
+    context = ProcessingContext(
+        output_dir=output_dir,
+        channels=Channels(pc=ChannelSelection(0, ["area"])),
+        results={0: entry},
+        params={},
+    )
+    metadata = SimpleNamespace(
+        base_name="test", n_frames=n_frames, height=160, width=160, dtype="uint16"
+    )
+    return output_dir, context, metadata
+
+
+def test_progress_reporter():
+    """Services pass every progress update to the injected reporter."""
+    print("\n" + "=" * 60)
+    print("Testing service progress events")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir, context, metadata = make_fov(tmp)
+        events = []
+        service = SegmentationService()
+        service.set_progress_reporter(events.append)
+        service.process_fov(metadata, context, output_dir, 0)
+
+        assert [event["t"] for event in events] == list(range(8))
+        assert all(event["step"] == "Segmentation" for event in events)
+        assert {event["T"] for event in events} == {8}
+        print(f"   {len(events)} events, first: {events[0]}")
+    print("\n✓ Progress reporter test completed\n")
+
+
+def test_step_meter():
+    """A measured step reports its own reads and writes only."""
+    print("\n" + "=" * 60)
+    print("Testing step meter")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir, context, metadata = make_fov(tmp)
+        service = SegmentationService()
+        meter = StepMeter(0, "segmentation", output_dir)
+        service.set_progress_reporter(meter.on_progress)
+        with meter:
+            service.process_fov(metadata, context, output_dir, 0)
+            # Written by another step of the same FOV meanwhile
+            np.save(output_dir / "fov_000" / "other_step.npy", np.zeros(1000))
+        metrics = meter.metrics(context.results[0], metadata)
+
+        seg_path = Path(context.results[0].seg[1])
+        pc_path = Path(context.results[0].pc[1])
+        assert metrics.status == "completed"
+        assert metrics.frames == 8
+        assert metrics.frames_per_s > 0
+        assert metrics.wall_time_s > 0 and metrics.cpu_time_s > 0
+        assert metrics.bytes_read == pc_path.stat().st_size
+        # Output stack plus its provenance record, without the other step's file
+        seg_size = seg_path.stat().st_size
+        assert seg_size < metrics.bytes_written < 2 * seg_size
+        assert metrics.peak_rss_bytes is None or metrics.peak_rss_bytes > 0
+        print(f"   {metrics}")
+
+        meter = StepMeter(0, "segmentation", output_dir)
+        with meter:
+            service.process_fov(metadata, context, output_dir, 0)
+        skipped = meter.metrics(context.results[0], metadata)
+        assert skipped.status == "skipped"
+        assert skipped.bytes_read == 0 and skipped.bytes_written == 0
+        print(f"   Rerun: {skipped.status}")
+
+        meter = StepMeter(0, "tracking", output_dir)
+        try:
+            with meter:
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert meter.metrics(context.results[0], metadata).status == "failed"
+    print("\n✓ Step meter test completed\n")
+
+
+def test_run_report():
+    """run_metrics.json holds run info, per-step totals and every task."""
+    print("\n" + "=" * 60)
+    print("Testing run report")
+    print("=" * 60)
+
+    run_metrics = RunMetrics()
+    for fov, status in [(0, "completed"), (1, "skipped")]:
+        run_metrics.add(
+            StepMetrics(
+                fov=fov,
+                step="tracking",
+                status=status,
+                wall_time_s=1.5,
+                cpu_time_s=1.0,
+                frames=10 if status == "completed" else 0,
+                frames_per_s=6.667 if status == "completed" else None,
+                bytes_read=100 if status == "completed" else 0,
+                bytes_written=200 if status == "completed" else 0,
+                peak_rss_bytes=1000 * (fov + 1),
+            )
+        )
+    event = run_metrics.steps[0].to_event()
+    assert event["event"] == "metrics" and event["step"] == "tracking"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = run_metrics.write(Path(tmp), worker_mode="thread", n_workers=2)
+        assert path.name == METRICS_FILENAME
+        report = json.loads(path.read_text())
+
+    assert report["run"]["worker_mode"] == "thread"
+    assert report["run"]["wall_time_s"] >= 0
+    totals = report["summary"]["tracking"]
+    assert totals["tasks"] == 2 and totals["skipped"] == 1
+    assert totals["wall_time_s"] == 3.0
+    assert totals["frames"] == 10 and totals["bytes_written"] == 200
+    assert totals["peak_rss_bytes"] == 2000
+    assert [step["fov"] for step in report["steps"]] == [0, 1]
+    print(f"   Summary: {totals}")
+    print("\n✓ Run report test completed\n")
+
+
+class ReportingService(BaseProcessingService):
+    """Stand-in step that reports one frame and writes a marker output."""
+
+    def __init__(self, step):
+        super().__init__()
+        self.name = step
+
+    def process_fov(self, metadata, context, output_dir, fov, cancel_event=None):
+        self.progress_callback(fov, 0, 1, self.name)
+        fov_dir = output_dir / f"fov_{fov:03d}"
+        fov_dir.mkdir(parents=True, exist_ok=True)
+        if self.name == "extraction":
+            traces = fov_dir / f"test_fov_{fov:03d}_traces.csv"
+            traces.write_text("fov,cell,frame\n")
+            context.results.setdefault(fov, ensure_results_entry()).traces = traces
+
+
+def test_reporter_errors_and_partial_cpu():
+    """Steps survive a raising reporter; pooled extraction CPU is flagged."""
+    print("\n" + "=" * 60)
+    print("Testing reporter errors and partial CPU time")
+    print("=" * 60)
+
+    def broken_reporter(event):
+        raise RuntimeError("reporter down")
+
+    original = dict(run._STEP_SERVICES)
+    run._STEP_SERVICES.update(
+        {step: partial(ReportingService, step) for step in run._STEP_SERVICES}
+    )
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            context = ProcessingContext(
+                output_dir=output_dir,
+                channels=Channels(pc=ChannelSelection(0, ["area"])),
+                params={"extraction_threads": 2},
+            )
+            metadata = SimpleNamespace(
+                base_name="test",
+                n_fovs=2,
+                n_frames=1,
+                height=8,
+                width=8,
+                dtype="uint16",
+            )
+            assert run.run_complete_workflow(
+                metadata,
+                context,
+                n_workers=1,
+                batch_size=1,
+                progress_reporter=broken_reporter,
+            )
+            report = json.loads((output_dir / METRICS_FILENAME).read_text())
+    finally:
+        run._STEP_SERVICES.clear()
+        run._STEP_SERVICES.update(original)
+
+    partial_steps = {
+        step["step"] for step in report["steps"] if step["cpu_time_partial"]
+    }
+    assert partial_steps == {"extraction"}
+    assert report["summary"]["extraction"]["cpu_time_partial"] is True
+    assert report["summary"]["segmentation"]["cpu_time_partial"] is False
+    assert not any(step["status"] == "failed" for step in report["steps"])
+    print(f"   Partial CPU time: {sorted(partial_steps)}")
+    print("\n✓ Reporter error and partial CPU test completed\n")
+
+
+if __name__ == "__main__":
+    test_progress_reporter()
+    test_step_meter()
+    test_run_report()
+    test_reporter_errors_and_partial_cpu()
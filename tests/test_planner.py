@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Test script for the PyAMA dry-run planner.
+
+This script tests:
+- Estimated bytes per step match the size of the stacks the services write
+- Calibration times every step on one sampled (synthetic) frame
+- Plans scale the calibration by frames, channels, FOVs and workers
+- Plans warn when the outputs exceed the free disk space
+- Trace tables are sized in the configured format; bad FOV ranges are rejected
+- A file that fails while sampling is closed and the fallback is warned about
+
+Usage:
+    python test_planner.py
+"""
+
+from dataclasses import replace
+import json
+import logging
+from pathlib import Path
+import tempfile
+
+import numpy as np
+
+from pyama_core.io.synthetic import SyntheticConfig, generate_synthetic_dataset
+from pyama_core.processing.workflow import planner
+from pyama_core.processing.workflow.planner import (
+    Calibration,
+    calibrate_steps,
+    estimate_step_bytes,
+    plan_workflow,
+)
+from pyama_core.types.processing import ChannelSelection, Channels
+
+CHANNELS = Channels(
+    pc=ChannelSelection(0, ["area"]),
+    fl=[
+        ChannelSelection(1, ["intensity_total"]),
+        ChannelSelection(2, ["intensity_total"]),
+    ],
+)
+
+
+def make_metadata(n_frames=5, size=64, n_fovs=10):
+    data = generate_synthetic_dataset(
+        SyntheticConfig(n_frames=2, height=32, width=32, n_cells=1)
+    )
+    return replace(
+        data.metadata(), n_frames=n_frames, height=size, width=size, n_fovs=n_fovs
+    )
+
+
+def test_step_bytes():
+    """Stack estimates equal the size of the .npy files of each step."""
+    print("\n" + "=" * 60)
+    print("Testing bytes written per step")
+    print("=" * 60)
+
+    metadata = make_metadata(n_frames=7, size=48)
+    shape = (7, 48, 48)
+    calibration = Calibration(
+        seconds_per_frame={}, cells_per_frame=20, trace_row_bytes=50, source="file"
+    )
+    estimate = estimate_step_bytes(metadata, CHANNELS, calibration)
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = {}
+        for dtype in (np.uint16, bool, np.float32):
+            path = Path(tmp) / f"{np.dtype(dtype).name}.npy"
+            np.save(path, np.zeros(shape, dtype=dtype))
+            sizes[np.dtype(dtype).name] = path.stat().st_size
+    assert estimate["copy"] == 3 * sizes["uint16"]
+    assert estimate["segmentation"] == sizes["bool"]
+    assert estimate["background"] == 2 * sizes["float32"]
+    assert estimate["tracking"] == sizes["uint16"]
+    assert estimate["extraction"] == 20 * 7 * 50
+
+    pc_only = estimate_step_bytes(metadata, Channels(pc=CHANNELS.pc))
+    assert "background" not in pc_only and pc_only["extraction"] == 0
+    print(f"   {estimate}")
+    print("\n✓ Step bytes test completed\n")
+
+
+def test_calibration():
+    """Every step is timed on a synthetic frame when the file is unreadable."""
+    print("\n" + "=" * 60)
+    print("Testing calibration on one frame")
+    print("=" * 60)
+
+    metadata = make_metadata(size=1024)
+    calibration = calibrate_steps(metadata, CHANNELS)
+    print(f"   {calibration}")
+    assert calibration.source == "synthetic"
+    seconds = calibration.seconds_per_frame
+    assert seconds["copy"] is None
+    for step in ("segmentation", "background", "tracking", "extraction"):
+        assert seconds[step] is not None and seconds[step] > 0, step
+    assert calibration.cells_per_frame > 0
+    assert calibration.trace_row_bytes > 0
+    print("\n✓ Calibration test completed\n")
+
+
+def test_plan_scaling():
+    """Plans scale per-frame timings and warn about a full disk."""
+    print("\n" + "=" * 60)
+    print("Testing plan scaling")
+    print("=" * 60)
+
+    metadata = make_metadata(n_frames=100, n_fovs=40)
+    calibration = Calibration(
+        seconds_per_frame={
+            "copy": 0.01,
+            "segmentation": 0.1,
+            "background": 0.2,
+            "tracking": 0.05,
+            "extraction": 0.05,
+        },
+        cells_per_frame=10,
+        trace_row_bytes=80,
+        source="file",
+    )
+    plan = plan_workflow(
+        metadata,
+        CHANNELS,
+        fov_start=0,
+        fov_end=19,
+        n_workers=4,
+        batch_size="auto",
+        calibration=calibration,
+    )
+    seconds = {step.step: step.seconds for step in plan.steps}
+    # Copying and background estimation run once per channel
+    assert np.isclose(seconds["copy"], 0.01 * 100 * 3)
+    assert np.isclose(seconds["background"], 0.2 * 100 * 2)
+    assert np.isclose(seconds["segmentation"], 0.1 * 100)
+    assert plan.n_fovs == 20 and plan.resources.n_workers == 4
+    assert plan.resources.batch_size == 5
+    per_fov = sum(seconds.values())
+    parallel = min(4, plan.resources.cpu_count)
+    assert np.isclose(plan.runtime_seconds, max(per_fov * 20 / parallel, per_fov))
+    assert plan.total_bytes == 20 * plan.bytes_per_fov
+    assert plan.peak_memory_bytes == 4 * max(s.peak_memory for s in plan.steps)
+    json.dumps(plan.to_dict())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big = replace(metadata, height=200_000, width=200_000)
+        plan = plan_workflow(
+            big, CHANNELS, output_dir=Path(tmp) / "new", calibration=calibration
+        )
+        assert plan.fits_on_disk is False
+        assert any("free disk" in warning for warning in plan.warnings)
+    print(plan.describe())
+    print("\n✓ Plan scaling test completed\n")
+
+
+def test_trace_format_and_range():
+    """Binary trace formats are sized by their typed columns."""
+    print("\n" + "=" * 60)
+    print("Testing trace formats and FOV ranges")
+    print("=" * 60)
+
+    metadata = make_metadata(size=512, n_fovs=20)
+    csv = calibrate_steps(metadata, CHANNELS)
+    parquet = calibrate_steps(metadata, CHANNELS, {"trace_format": "parquet"})
+    assert csv.trace_format == "csv" and parquet.trace_format == "parquet"
+    assert csv.cells_per_frame == parquet.cells_per_frame > 0
+    # Identifiers, positions and features take 8 bytes each, good 1 byte
+    assert parquet.trace_row_bytes % 8 == 1
+    print(f"   Bytes per row: {csv.trace_row_bytes} (csv), {parquet.trace_row_bytes}")
+
+    plan = plan_workflow(metadata, CHANNELS, calibration=parquet)
+    assert any("uncompressed" in warning for warning in plan.warnings)
+    assert not any(
+        "uncompressed" in warning
+        for warning in plan_workflow(metadata, CHANNELS, calibration=csv).warnings
+    )
+
+    for fov_start, fov_end in [(0, 50), (5, 2), (-2, 3)]:
+        try:
+            plan_workflow(
+                metadata,
+                CHANNELS,
+                fov_start=fov_start,
+                fov_end=fov_end,
+                calibration=csv,
+            )
+        except ValueError as e:
+            assert "Invalid FOV range" in str(e)
+            print(f"   Rejected: {e}")
+        else:
+            raise AssertionError(f"FOV range {fov_start}-{fov_end} accepted")
+    print("\n✓ Trace format and range test completed\n")
+
+
+class FailingImage:
+    """Stand-in microscopy file whose second channel cannot be read."""
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_sampling_failure():
+    """A file failing mid-sample is closed and the fallback logged as a warning."""
+    print("\n" + "=" * 60)
+    print("Testing sampling failures")
+    print("=" * 60)
+
+    image = FailingImage()
+
+    def read_frame(img, fov, channel, frame):
+        if channel == 1:
+            raise OSError("truncated file")
+        return np.zeros((64, 64), dtype=np.uint16)
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    original = planner.load_microscopy_file, planner.get_microscopy_frame
+    planner.load_microscopy_file = lambda path: (image, None)
+    planner.get_microscopy_frame = read_frame
+    planner.logger.addHandler(handler)
+    try:
+        frames, read_seconds, source = planner._sample_frames(
+            make_metadata(), CHANNELS, fov=0, frame=0
+        )
+    finally:
+        planner.load_microscopy_file, planner.get_microscopy_frame = original
+        planner.logger.removeHandler(handler)
+
+    assert image.closed
+    assert source == "synthetic" and read_seconds is None
+    assert sorted(frames) == [0, 1, 2]
+    assert any(r.levelno == logging.WARNING for r in records)
+    print(f"   {records[-1].getMessage()}")
+    print("\n✓ Sampling failure test completed\n")
+
+
+if __name__ == "__main__":
+    test_step_bytes()
+    test_calibration()
+    test_plan_scaling()
+    test_trace_format_and_range()
+    test_sampling_failure()
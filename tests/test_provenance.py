@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for PyAMA step provenance and cache invalidation.
+
+This script tests on a small synthetic phase contrast stack:
+- Provenance records are written next to segmentation, tracking and traces
+- Re-running the steps skips every output whose record matches
+- Changing extraction parameters recomputes only the traces
+- Changing an upstream input recomputes that step and everything downstream
+- Outputs without a provenance record are recomputed
+- Editing the source of a step's algorithm changes its code version
+
+Usage:
+    python test_provenance.py
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from pyama_core.processing.workflow import provenance
+from pyama_core.processing.workflow.provenance import (
+    algorithm_version,
+    clear_provenance,
+    provenance_path,
+    read_provenance,
+    step_provenance,
+)
+from pyama_core.processing.workflow.services import (
+    ExtractionService,
+    SegmentationService,
+    TrackingService,
+)
+from pyama_core.types.processing import (
+    ChannelSelection,
+    Channels,
+    ProcessingContext,
+    ensure_results_entry,
+)
+
+
+def blob_stack(rng, n_frames=12, size=160, radius=14):
+    """Phase-contrast-like stack of slowly drifting textured disks on flat noise."""
+    yy, xx = np.mgrid[:size, :size]
+    centers = np.array([[40.0, 40.0], [40.0, 110.0], [110.0, 40.0], [110.0, 110.0]])
+    stack = rng.normal(100, 1, (n_frames, size, size))
+    for t in range(n_frames):
+        for cy, cx in centers + t * 0.5:
+            disk = (yy - cy) ** 2 + (xx - cx) ** 2 <= radius**2
+            stack[t][disk] += rng.normal(60, 30, int(disk.sum()))
+    return np.clip(stack, 0, None).astype(np.uint16)
+
+
+def run_steps(output_dir, entry, params):
+    """Run segmentation, tracking and extraction for FOV 0."""
+    metadata = SimpleNamespace(base_name="test", timepoints=None)
+    context = ProcessingContext(
+        output_dir=output_dir,
+        channels=Channels(pc=ChannelSelection(0, ["area"])),
+        results={0: entry},
+        params=params,
+    )
+    for service in (SegmentationService(), TrackingService(), ExtractionService()):
+        service.process_fov(metadata, context, output_dir, 0)
+    return context.results[0]
+
+
+def mtimes(entry):
+    """Modification times of the segmentation, tracking and trace outputs."""
+    return {
+        "seg": Path(entry.seg[1]).stat().st_mtime_ns,
+        "tracking": Path(entry.seg_labeled[1]).stat().st_mtime_ns,
+        "traces": Path(entry.traces).stat().st_mtime_ns,
+    }
+
+
+def test_step_provenance_hash():
+    """Records hash inputs, parameters and code version."""
+    print("\n" + "=" * 60)
+    print("Testing provenance records")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "input.npy"
+        np.save(path, np.zeros(4))
+        first = step_provenance("segmentation", [path], {"a": 1})
+        assert first == step_provenance("segmentation", [path], {"a": 1})
+        assert first["hash"] != step_provenance("segmentation", [path], {"a": 2})["hash"]
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert first["hash"] != step_provenance("segmentation", [path], {"a": 1})["hash"]
+        print(f"   Hash: {first['hash'][:16]}... (code version {first['code_version']})")
+    print("\n✓ Provenance record test completed\n")
+
+
+def test_cache_invalidation():
+    """Only outputs whose inputs or parameters changed are recomputed."""
+    print("\n" + "=" * 60)
+    print("Testing step caching and invalidation")
+    print("=" * 60)
+
+    rng = np.random.default_rng(3)
+    params = {"min_trace_length": 5, "border_width": 5}
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        fov_dir = output_dir / "fov_000"
+        fov_dir.mkdir()
+        pc_path = fov_dir / "test_fov_000_pc_ch_0.npy"
+        np.save(pc_path, blob_stack(rng))
+        entry = ensure_results_entry()
+        entry.pc = (0, pc_path)
+
+        entry = run_steps(output_dir, entry, params)
+        for name in ("seg", "seg_labeled"):
+            assert read_provenance(getattr(entry, name)[1]) is not None
+        assert read_provenance(entry.traces)["step"] == "extraction"
+        assert len(pd.read_csv(entry.traces)) > 0
+        first = mtimes(entry)
+
+        entry = run_steps(output_dir, entry, params)
+        assert mtimes(entry) == first
+        print("   Unchanged inputs: all steps skipped")
+
+        entry = run_steps(output_dir, entry, {**params, "border_width": 6})
+        changed = mtimes(entry)
+        assert changed["seg"] == first["seg"]
+        assert changed["tracking"] == first["tracking"]
+        assert changed["traces"] != first["traces"]
+        print("   Changed trace filter: only traces recomputed")
+
+        np.save(pc_path, blob_stack(np.random.default_rng(4)))
+        stat = pc_path.stat()
+        os.utime(pc_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        entry = run_steps(output_dir, entry, {**params, "border_width": 6})
+        upstream = mtimes(entry)
+        assert all(upstream[step] != changed[step] for step in upstream)
+        print("   Changed phase contrast: segmentation, tracking and traces recomputed")
+
+        clear_provenance(entry.seg[1])
+        assert not provenance_path(entry.seg[1]).exists()
+        entry = run_steps(output_dir, entry, {**params, "border_width": 6})
+        assert mtimes(entry)["seg"] != upstream["seg"]
+        print("   Missing provenance record: segmentation recomputed")
+
+    print("\n✓ Cache invalidation test completed\n")
+
+
+def test_algorithm_version():
+    """The code version follows the source of the algorithm's package."""
+    print("\n" + "=" * 60)
+    print("Testing algorithm code versions")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        package = Path(tmp) / "provenance_test_algo"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "helpers.py").write_text("OFFSET = 1\n")
+        (package / "impl.py").write_text("def step(x):\n    return x\n")
+        sys.path.insert(0, tmp)
+        try:
+            step = importlib.import_module("provenance_test_algo.impl").step
+            first = algorithm_version(step)
+            record = step_provenance("segmentation", [], {"a": 1}, algorithm=step)
+            assert record["code_version"] == first
+            assert record["params"] == {
+                "algorithm": "provenance_test_algo.impl.step",
+                "a": 1,
+            }
+
+            # Helpers in the same package count as part of the algorithm
+            (package / "helpers.py").write_text("OFFSET = 2\n")
+            provenance._source_digest.cache_clear()
+            second = algorithm_version(step)
+            assert second != first
+            assert step_provenance("segmentation", [], {"a": 1}, algorithm=step)[
+                "hash"
+            ] != record["hash"]
+            print(f"   {first} -> {second}")
+        finally:
+            sys.path.remove(tmp)
+            for name in list(sys.modules):
+                if name.startswith("provenance_test_algo"):
+                    del sys.modules[name]
+            provenance._source_digest.cache_clear()
+    print("\n✓ Algorithm version test completed\n")
+
+
+if __name__ == "__main__":
+    test_step_provenance_hash()
+    test_cache_invalidation()
+    test_algorithm_version()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Test script for the PyAMA FOV task graph scheduler.
+
+This script tests:
+- Steps of each FOV run in dependency order
+- The number of FOVs in flight and running tasks stays within bounds
+- A slow FOV does not block the remaining FOVs
+- A failing step skips the downstream steps of its FOV only
+- Cancellation stops dispatching new tasks
+- Tasks run in a process pool with per-task arguments and merged results
+
+Usage:
+    python test_scheduler.py
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pyama_core.processing.workflow.scheduler import (
+    STEP_DEPENDENCIES,
+    run_task_graph,
+)
+
+
+class TaskRecorder:
+    """Fake ``run_task`` that records start/end order and concurrency."""
+
+    def __init__(self, delays=None, fail=None):
+        self.delays = delays or {}
+        self.fail = fail or set()
+        self.lock = threading.Lock()
+        self.events = []
+        self.running = 0
+        self.max_running = 0
+        self.fovs_seen = set()
+        self.fovs_finished = set()
+        self.max_in_flight = 0
+
+    def __call__(self, fov, step):
+        with self.lock:
+            self.events.append(("start", fov, step))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.fovs_seen.add(fov)
+            in_flight = len(self.fovs_seen - self.fovs_finished)
+            self.max_in_flight = max(self.max_in_flight, in_flight)
+        time.sleep(self.delays.get((fov, step), 0.005))
+        with self.lock:
+            self.running -= 1
+            self.events.append(("end", fov, step))
+            if step == "extraction":
+                self.fovs_finished.add(fov)
+        if (fov, step) in self.fail:
+            with self.lock:
+                self.fovs_finished.add(fov)
+            raise RuntimeError(f"boom {fov} {step}")
+
+    def index(self, kind, fov, step):
+        return self.events.index((kind, fov, step))
+
+
+def test_dependency_order():
+    """Every step starts only after its dependencies ended."""
+    print("\n" + "=" * 60)
+    print("Testing dependency order")
+    print("=" * 60)
+
+    recorder = TaskRecorder()
+    result = run_task_graph(range(6), recorder, n_workers=3, max_in_flight=3)
+
+    assert sorted(result.completed) == list(range(6))
+    assert result.failed == []
+    for fov in range(6):
+        for step, deps in STEP_DEPENDENCIES.items():
+            for dep in deps:
+                assert recorder.index("end", fov, dep) < recorder.index(
+                    "start", fov, step
+                ), f"FOV {fov}: {step} started before {dep} ended"
+    print(f"   {len(recorder.events) // 2} tasks ran in dependency order")
+    print("\n✓ Dependency order test completed\n")
+
+
+def test_bounds():
+    """Running tasks, in-flight FOVs and concurrent copies stay bounded."""
+    print("\n" + "=" * 60)
+    print("Testing worker and in-flight bounds")
+    print("=" * 60)
+
+    recorder = TaskRecorder()
+    copies = {"running": 0, "max": 0}
+    lock = threading.Lock()
+
+    def run_task(fov, step):
+        if step == "copy":
+            with lock:
+                copies["running"] += 1
+                copies["max"] = max(copies["max"], copies["running"])
+        try:
+            recorder(fov, step)
+        finally:
+            if step == "copy":
+                with lock:
+                    copies["running"] -= 1
+
+    result = run_task_graph(range(8), run_task, n_workers=3, max_in_flight=2)
+
+    assert len(result.completed) == 8
+    assert recorder.max_running <= 3
+    assert recorder.max_in_flight <= 2
+    assert copies["max"] == 1
+    print(f"   Max running tasks: {recorder.max_running} (limit 3)")
+    print(f"   Max FOVs in flight: {recorder.max_in_flight} (limit 2)")
+    print(f"   Max concurrent copies: {copies['max']} (limit 1)")
+    print("\n✓ Bounds test completed\n")
+
+
+def test_slow_fov_does_not_block():
+    """Other FOVs finish while one FOV is stuck in a slow step."""
+    print("\n" + "=" * 60)
+    print("Testing slow FOV isolation")
+    print("=" * 60)
+
+    recorder = TaskRecorder(delays={(0, "tracking"): 0.5})
+    result = run_task_graph(range(5), recorder, n_workers=2, max_in_flight=2)
+
+    assert len(result.completed) == 5
+    slow_end = recorder.index("end", 0, "tracking")
+    for fov in range(1, 5):
+        assert recorder.index("end", fov, "extraction") < slow_end
+    assert result.completed[-1] == 0
+    print(f"   Completion order: {result.completed}")
+    print("\n✓ Slow FOV test completed\n")
+
+
+def test_failure_skips_downstream():
+    """A failing step marks its FOV failed and skips only that FOV's later steps."""
+    print("\n" + "=" * 60)
+    print("Testing failure handling")
+    print("=" * 60)
+
+    recorder = TaskRecorder(fail={(1, "segmentation")})
+    result = run_task_graph(range(3), recorder, n_workers=2, max_in_flight=2)
+
+    assert result.failed == [1]
+    assert sorted(result.completed) == [0, 2]
+    started_fov1 = {step for kind, fov, step in recorder.events if fov == 1}
+    assert started_fov1 == {"copy", "segmentation"}
+    print(f"   Failed FOVs: {result.failed}, completed: {sorted(result.completed)}")
+    print("\n✓ Failure handling test completed\n")
+
+
+def test_cancellation():
+    """Setting the cancel event stops dispatching and reports cancellation."""
+    print("\n" + "=" * 60)
+    print("Testing cancellation")
+    print("=" * 60)
+
+    cancel_event = threading.Event()
+
+    def run_task(fov, step):
+        if fov == 1 and step == "segmentation":
+            cancel_event.set()
+        time.sleep(0.005)
+
+    result = run_task_graph(
+        range(10), run_task, n_workers=2, max_in_flight=2, cancel_event=cancel_event
+    )
+
+    assert result.cancelled
+    assert len(result.completed) < 10
+    print(f"   Completed before cancel: {result.completed}")
+    print("\n✓ Cancellation test completed\n")
+
+
+def record_step(history, fov, step):
+    """Process-pool task: return the steps seen so far plus this one."""
+    return history + [f"{fov}:{step}"]
+
+
+def test_process_pool():
+    """Arguments are built per task and results folded back in the parent."""
+    print("\n" + "=" * 60)
+    print("Testing process pool execution")
+    print("=" * 60)
+
+    histories = {fov: [] for fov in range(3)}
+
+    def task_args(fov, step):
+        return list(histories[fov]), fov, step
+
+    def on_task_done(fov, step, value):
+        # Background and tracking run concurrently from the same snapshot
+        histories[fov] += [entry for entry in value if entry not in histories[fov]]
+
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=mp_context) as executor:
+        result = run_task_graph(
+            range(3),
+            record_step,
+            n_workers=2,
+            max_in_flight=2,
+            executor=executor,
+            task_args=task_args,
+            on_task_done=on_task_done,
+        )
+
+    assert sorted(result.completed) == [0, 1, 2]
+    for fov, history in histories.items():
+        steps = [entry.split(":")[1] for entry in history]
+        assert len(steps) == len(STEP_DEPENDENCIES)
+        assert steps[0] == "copy" and steps[1] == "segmentation"
+        assert steps[-1] == "extraction"
+        print(f"   FOV {fov}: {' -> '.join(steps)}")
+    print("\n✓ Process pool test completed\n")
+
+
+if __name__ == "__main__":
+    test_dependency_order()
+    test_bounds()
+    test_slow_fov_does_not_block()
+    test_failure_skips_downstream()
+    test_cancellation()
+    test_process_pool()
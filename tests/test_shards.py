@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for non-interactive, sharded PyAMA workflow runs.
+
+This script tests:
+- Workflow configs load from YAML and JSON, with relative paths and defaults
+- Invalid configs are rejected with a clear message
+- Shard specifications parse and shards split a FOV range without gaps
+- Sharded runs write separate results that combine into one processing_results.yaml
+
+Usage:
+    python test_shards.py
+"""
+
+from functools import partial
+import json
+from pathlib import Path
+import tempfile
+from types import SimpleNamespace
+
+import yaml
+
+from pyama_core.processing.workflow import run
+from pyama_core.processing.workflow.config import load_workflow_config
+from pyama_core.processing.workflow.services.base import BaseProcessingService
+from pyama_core.processing.workflow.shards import (
+    combine_shard_results,
+    parse_shard,
+    shard_fov_range,
+    shard_results_dir,
+)
+from pyama_core.types.processing import ensure_results_entry
+
+
+class TracesService(BaseProcessingService):
+    """Stand-in step; extraction writes an empty trace table."""
+
+    def __init__(self, step):
+        super().__init__()
+        self.name = step
+
+    def process_fov(self, metadata, context, output_dir, fov, cancel_event=None):
+        fov_dir = output_dir / f"fov_{fov:03d}"
+        fov_dir.mkdir(parents=True, exist_ok=True)
+        if self.name == "extraction":
+            traces = fov_dir / f"test_fov_{fov:03d}_traces.csv"
+            traces.write_text("fov,cell,frame\n")
+            context.results.setdefault(fov, ensure_results_entry()).traces = traces
+
+
+def test_config_loading():
+    """YAML and JSON configs give the same workflow settings."""
+    print("\n" + "=" * 60)
+    print("Testing workflow config loading")
+    print("=" * 60)
+
+    data = {
+        "microscopy_file": "plate.nd2",
+        "output_dir": "out",
+        "channels": {
+            "pc": {"channel": 0, "features": ["area"]},
+            "fl": [[1, ["intensity_total"]]],
+        },
+        "fov_end": 9,
+        "n_workers": "auto",
+        "params": {"min_length": 10},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "run.yaml").write_text(yaml.safe_dump(data))
+        (tmp / "run.json").write_text(json.dumps(data))
+        from_yaml = load_workflow_config(tmp / "run.yaml")
+        from_json = load_workflow_config(tmp / "run.json")
+
+        assert from_yaml == from_json
+        assert from_yaml.microscopy_file == tmp.resolve() / "plate.nd2"
+        assert from_yaml.output_dir == tmp.resolve() / "out"
+        assert from_yaml.channels.pc.channel == 0
+        assert [fl.channel for fl in from_yaml.channels.fl] == [1]
+        assert from_yaml.fov_start is None and from_yaml.fov_end == 9
+        assert from_yaml.n_workers == "auto" and from_yaml.batch_size == 2
+        context = from_yaml.to_context()
+        assert context.params == {"min_length": 10} and context.results == {}
+
+        for broken, message in [
+            ({**data, "channels": None}, "missing 'channels'"),
+            ({**data, "n_workers": 0}, "'n_workers'"),
+            ({**data, "worker_mode": "gpu"}, "'worker_mode'"),
+            ({**data, "fov_start": "3"}, "'fov_start'"),
+            ({**data, "typo": 1}, "Unknown"),
+        ]:
+            (tmp / "bad.yaml").write_text(yaml.safe_dump(broken))
+            try:
+                load_workflow_config(tmp / "bad.yaml")
+            except ValueError as e:
+                assert message in str(e), e
+                print(f"   Rejected: {e}")
+            else:
+                raise AssertionError(f"Config accepted: {broken}")
+    print("\n✓ Config loading test completed\n")
+
+
+def test_shard_ranges():
+    """Shards cover the FOV range exactly once with balanced sizes."""
+    print("\n" + "=" * 60)
+    print("Testing shard ranges")
+    print("=" * 60)
+
+    assert parse_shard("2/8") == (2, 8)
+    assert parse_shard(" 0 / 1 ") == (0, 1)
+    for bad in ("8/8", "1/0", "-1/4", "1-4", "a/b"):
+        try:
+            parse_shard(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"Shard {bad!r} accepted")
+
+    for start, end, count in [(0, 99, 7), (5, 14, 3), (0, 2, 5), (3, 3, 1)]:
+        ranges = [shard_fov_range(start, end, i, count) for i in range(count)]
+        covered = [
+            fov for r in ranges if r is not None for fov in range(r[0], r[1] + 1)
+        ]
+        assert covered == list(range(start, end + 1))
+        sizes = [r[1] - r[0] + 1 for r in ranges if r is not None]
+        assert max(sizes) - min(sizes) <= 1
+        print(f"   FOVs {start}-{end} in {count} shards: {ranges}")
+    assert shard_fov_range(0, 2, 4, 5) is None
+    print("\n✓ Shard range test completed\n")
+
+
+def test_sharded_run_and_combine():
+    """Each shard writes its own results; combining merges all FOVs."""
+    print("\n" + "=" * 60)
+    print("Testing sharded runs and combine")
+    print("=" * 60)
+
+    metadata = SimpleNamespace(
+        base_name="test", n_fovs=5, n_frames=1, height=8, width=8, dtype="uint16"
+    )
+    original = dict(run._STEP_SERVICES)
+    run._STEP_SERVICES.update(
+        {step: partial(TracesService, step) for step in run._STEP_SERVICES}
+    )
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            config_path = output_dir / "run.yaml"
+            config_path.write_text(
+                yaml.safe_dump(
+                    {
+                        "microscopy_file": "plate.nd2",
+                        "output_dir": str(output_dir),
+                        "channels": {"pc": [0, ["area"]]},
+                        "n_workers": 1,
+                        "batch_size": 1,
+                    }
+                )
+            )
+            config = load_workflow_config(config_path)
+
+            # Shard 1 of 2 finishes first
+            for index in (1, 0):
+                fov_start, fov_end = shard_fov_range(0, 4, index, 2)
+                results_dir = shard_results_dir(output_dir, index, 2)
+                assert run.run_complete_workflow(
+                    metadata,
+                    config.to_context(),
+                    fov_start=fov_start,
+                    fov_end=fov_end,
+                    n_workers=config.n_workers,
+                    batch_size=config.batch_size,
+                    results_dir=results_dir,
+                )
+                assert (results_dir / "processing_results.yaml").exists()
+                assert (results_dir / "run_metrics.json").exists()
+                if index == 1:
+                    assert not (output_dir / "processing_results.yaml").exists()
+                    merged = combine_shard_results(output_dir)
+                    assert sorted(merged.results) == [3, 4]
+
+            merged = combine_shard_results(output_dir)
+            assert sorted(merged.results) == list(range(5))
+            with (output_dir / "processing_results.yaml").open() as f:
+                results = yaml.safe_load(f)
+            assert sorted(int(fov) for fov in results["results"]) == list(range(5))
+            assert results["channels"]["pc"] == [0, ["area"]]
+            print(f"   Shards: {[p.name for p in (output_dir / 'shards').iterdir()]}")
+    finally:
+        run._STEP_SERVICES.clear()
+        run._STEP_SERVICES.update(original)
+    print("\n✓ Sharded run test completed\n")
+
+
+if __name__ == "__main__":
+    test_config_loading()
+    test_shard_ranges()
+    test_sharded_run_and_combine()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the PyAMA synthetic dataset generator.
+
+This script tests:
+- The same configuration and seed yield identical stacks and ground truth
+- Stack shapes, dtypes and frame times follow the configuration
+- Divisions replace a mother by two daughters that link back to it
+- Ground-truth fluorescence follows the maturation reporter model
+- Segmentation finds the rendered cells
+
+Usage:
+    python test_synthetic.py
+"""
+
+from dataclasses import replace
+
+import numpy as np
+from scipy import ndimage
+
+from pyama_core.io.synthetic import (
+    SyntheticConfig,
+    generate_synthetic_dataset,
+    reporter_signal,
+)
+from pyama_core.processing.segmentation import segment_cell
+
+SMALL = SyntheticConfig(
+    n_frames=12, height=256, width=256, n_cells=9, division_probability=1.0
+)
+
+
+def test_deterministic():
+    """Equal configurations render equal data; other seeds differ."""
+    print("\n" + "=" * 60)
+    print("Testing deterministic generation")
+    print("=" * 60)
+
+    a = generate_synthetic_dataset(SMALL)
+    b = generate_synthetic_dataset(SMALL)
+    c = generate_synthetic_dataset(replace(SMALL, seed=1))
+    assert np.array_equal(a.pc, b.pc) and np.array_equal(a.fl, b.fl)
+    assert a.cells.equals(b.cells)
+    assert not np.array_equal(a.fl, c.fl)
+    print(f"   {len(a.cells)} ground-truth rows reproduced")
+    print("\n✓ Deterministic generation test completed\n")
+
+
+def test_shapes_and_metadata():
+    """Stacks and metadata describe a (T, H, W) uint16 two-channel FOV."""
+    print("\n" + "=" * 60)
+    print("Testing shapes and metadata")
+    print("=" * 60)
+
+    data = generate_synthetic_dataset(SMALL)
+    assert data.pc.shape == data.fl.shape == (12, 256, 256)
+    assert data.pc.dtype == data.fl.dtype == np.uint16
+    assert np.allclose(np.diff(data.times), SMALL.frame_interval)
+    metadata = data.metadata()
+    assert (metadata.n_frames, metadata.height, metadata.width) == (12, 256, 256)
+    assert metadata.n_fovs == 1 and metadata.n_channels == 2
+    assert metadata.timepoints == data.times.tolist()
+    # Background level plus illumination, well above zero
+    assert data.fl.min() > SMALL.fl_background * 0.5
+    print(f"   pc {data.pc.shape} {data.pc.dtype}, fl max {data.fl.max()}")
+    print("\n✓ Shapes and metadata test completed\n")
+
+
+def test_divisions():
+    """Daughters appear after their mother's last frame, smaller than it."""
+    print("\n" + "=" * 60)
+    print("Testing divisions")
+    print("=" * 60)
+
+    data = generate_synthetic_dataset(SMALL)
+    cells = data.cells
+    daughters = cells[cells["parent"] > 0].groupby("cell").first()
+    assert len(daughters) > 0
+    for cell, row in daughters.iterrows():
+        mother = cells[cells["cell"] == row["parent"]]
+        first = cells[cells["cell"] == cell]["frame"].min()
+        assert mother["frame"].max() == first - 1
+        assert row["radius"] < mother["radius"].iloc[-1]
+    # Every frame holds each cell at most once
+    assert not cells.duplicated(["frame", "cell"]).any()
+    print(f"   {len(daughters)} daughters of {daughters['parent'].nunique()} mothers")
+    print("\n✓ Division test completed\n")
+
+
+def test_reporter_ground_truth():
+    """Founder fluorescence follows the maturation model before any division."""
+    print("\n" + "=" * 60)
+    print("Testing reporter ground truth")
+    print("=" * 60)
+
+    config = SyntheticConfig(
+        n_frames=20, height=256, width=256, n_cells=4, division_probability=0.0
+    )
+    data = generate_synthetic_dataset(config)
+    t_hours = data.times / 60.0
+    for _, trace in data.cells.groupby("cell"):
+        values = trace["fluorescence"].to_numpy()
+        assert len(values) == config.n_frames
+        assert values[-1] > values[0]
+        # Rising at the start of expression, bounded by the model's scale
+        assert values.max() < config.ktl_range[1] * t_hours[-1] * 10
+    curve = reporter_signal(t_hours, 0.0, 1000.0, 0.1)
+    assert curve[0] == 0.0 and np.all(np.diff(curve) >= 0)
+
+    # Background-corrected pixel sum of a cell matches its ground truth
+    row = data.cells[data.cells["frame"] == config.n_frames - 1].iloc[0]
+    yy, xx = np.mgrid[: config.height, : config.width]
+    distance = np.hypot(yy - row["y"], xx - row["x"])
+    disk = distance <= row["radius"]
+    ring = (distance > row["radius"] + 3) & (distance <= row["radius"] + 8)
+    frame = data.fl[-1].astype(float)
+    background = np.median(frame[ring])
+    measured = (frame[disk] - background).sum()
+    assert abs(measured - row["fluorescence"]) < 0.15 * row["fluorescence"]
+    print(f"   Cell {int(row['cell'])}: {measured:.0f} vs {row['fluorescence']:.0f}")
+    print("\n✓ Reporter ground truth test completed\n")
+
+
+def test_segmentation_finds_cells():
+    """Phase contrast cells are segmented as separate objects."""
+    print("\n" + "=" * 60)
+    print("Testing segmentation of synthetic cells")
+    print("=" * 60)
+
+    config = SyntheticConfig(
+        n_frames=3, height=256, width=256, n_cells=9, division_probability=0.0
+    )
+    data = generate_synthetic_dataset(config)
+    seg = np.empty(data.pc.shape, dtype=bool)
+    segment_cell(data.pc, seg)
+    _, n_objects = ndimage.label(seg[0])
+    assert n_objects == config.n_cells
+    print(f"   {n_objects} objects for {config.n_cells} cells")
+    print("\n✓ Segmentation test completed\n")
+
+
+if __name__ == "__main__":
+    test_deterministic()
+    test_shapes_and_metadata()
+    test_divisions()
+    test_reporter_ground_truth()
+    test_segmentation_finds_cells()
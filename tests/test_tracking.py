@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Test script for PyAMA IoU tracking.
+
+This script tests the IoU tracker on small synthetic stacks:
+- Vectorized, grid-gated bbox IoU against a brute-force reference
+- Sparse per-component assignment against the dense Hungarian solver
+- Consistent cell IDs for blobs drifting across frames
+- Streaming mode producing the same labels as the batch path (also for
+  frames with more labels than the output dtype holds)
+- Cancelled batch runs leaving no raw labels in the output
+- Resuming an interrupted streaming run from its checkpoint
+- Exact mask IoU from label-pair histograms against a pixel reference
+- Lookup-table relabeling helpers of the btrack path
+
+Usage:
+    python test_tracking.py
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from skimage.measure import label, regionprops
+
+from pyama_core.processing.tracking import track_cell_iou
+from pyama_core.processing.tracking.btrack import (
+    _filter_labels_by_size,
+    _write_tracks,
+)
+from pyama_core.processing.tracking.iou import (
+    _build_cost_matrix,
+    _candidate_costs,
+    _label_frame,
+    _mask_candidate_costs,
+    _solve_sparse_assignment,
+)
+from pyama_core.types.processing import Region
+
+
+def random_regions(rng, n, size=400, max_extent=30):
+    """Create ``n`` bbox-only regions scattered over a square field."""
+    regions = []
+    for _ in range(n):
+        y0, x0 = rng.integers(0, size, 2)
+        h, w = rng.integers(1, max_extent, 2)
+        regions.append(
+            Region(
+                area=int(h * w),
+                bbox=(int(y0), int(x0), int(y0 + h), int(x0 + w)),
+                coords=np.empty((0, 2), dtype=np.int64),
+            )
+        )
+    return regions
+
+
+def bruteforce_cost_matrix(prev_regions, curr_regions, min_iou):
+    """Reference pairwise bbox IoU over every previous x current pair."""
+    cost = np.ones((len(prev_regions), len(curr_regions)), dtype=float)
+    valid = np.zeros_like(cost, dtype=bool)
+    for i, a in enumerate(prev_regions):
+        ay0, ax0, ay1, ax1 = a.bbox
+        for j, b in enumerate(curr_regions):
+            by0, bx0, by1, bx1 = b.bbox
+            inter_h = min(ay1, by1) - max(ay0, by0)
+            inter_w = min(ax1, bx1) - max(ax0, bx0)
+            if inter_h <= 0 or inter_w <= 0:
+                continue
+            inter = inter_h * inter_w
+            union = (ay1 - ay0) * (ax1 - ax0) + (by1 - by0) * (bx1 - bx0) - inter
+            iou = inter / union
+            if iou >= min_iou:
+                cost[i, j] = 1.0 - iou
+                valid[i, j] = True
+    return cost, valid
+
+
+def moving_squares(n_frames=6, grid=4, size=12, spacing=30, step=2):
+    """Binary stack of ``grid x grid`` squares drifting diagonally."""
+    H = W = grid * spacing + n_frames * step + size
+    image = np.zeros((n_frames, H, W), dtype=bool)
+    for t in range(n_frames):
+        for gy in range(grid):
+            for gx in range(grid):
+                y0 = gy * spacing + t * step
+                x0 = gx * spacing + t * step
+                image[t, y0 : y0 + size, x0 : x0 + size] = True
+    return image
+
+
+def random_blobs(rng, n_frames=8, size=160, n_blobs=40, radius=6, step=2):
+    """Binary stack of random disks performing a random walk (may touch)."""
+    yy, xx = np.mgrid[:size, :size]
+    centers = rng.uniform(radius, size - radius, (n_blobs, 2))
+    radii = rng.uniform(radius / 2, radius, n_blobs)
+    image = np.zeros((n_frames, size, size), dtype=bool)
+    for t in range(n_frames):
+        for (cy, cx), r in zip(centers, radii):
+            image[t] |= (yy - cy) ** 2 + (xx - cx) ** 2 <= r * r
+        centers = np.clip(centers + rng.normal(0, step, centers.shape), 0, size - 1)
+    return image
+
+
+def test_cost_matrix_matches_bruteforce():
+    """Test vectorized cost matrix against the pairwise reference."""
+    print("="*60)
+    print("Testing Gated Bbox IoU Cost Matrix")
+    print("="*60)
+
+    rng = np.random.default_rng(0)
+    for trial in range(5):
+        prev_regions = random_regions(rng, 250)
+        curr_regions = random_regions(rng, 230)
+        cost, valid = _build_cost_matrix(prev_regions, curr_regions, min_iou=0.1)
+        ref_cost, ref_valid = bruteforce_cost_matrix(
+            prev_regions, curr_regions, min_iou=0.1
+        )
+        print(f"   Trial {trial}: {int(valid.sum())} valid pairs")
+        assert np.array_equal(valid, ref_valid)
+        assert np.allclose(cost, ref_cost)
+
+    cost, valid = _build_cost_matrix([], random_regions(rng, 3), min_iou=0.1)
+    assert cost.shape == (0, 3) and not valid.any()
+
+    print("\n✓ Cost matrix tests completed\n")
+
+
+def test_sparse_matches_dense_assignment():
+    """Test that the sparse solver reaches the dense optimum."""
+    print("="*60)
+    print("Testing Sparse vs Dense Assignment")
+    print("="*60)
+
+    rng = np.random.default_rng(1)
+    for trial in range(5):
+        prev_regions = random_regions(rng, 300, max_extent=40)
+        curr_regions = random_regions(rng, 320, max_extent=40)
+
+        cost, valid = _build_cost_matrix(prev_regions, curr_regions, min_iou=0.05)
+        r, c = linear_sum_assignment(cost)
+        keep = valid[r, c]
+        dense_pairs = set(zip(r[keep].tolist(), c[keep].tolist()))
+        dense_total = float((1.0 - cost[r[keep], c[keep]]).sum())
+
+        rows, cols, iou = _candidate_costs(prev_regions, curr_regions, min_iou=0.05)
+        sr, sc = _solve_sparse_assignment(rows, cols, 1.0 - iou)
+        sparse_pairs = set(zip(sr.tolist(), sc.tolist()))
+        sparse_total = float((1.0 - cost[sr, sc]).sum())
+
+        print(
+            f"   Trial {trial}: {len(dense_pairs)} dense / "
+            f"{len(sparse_pairs)} sparse matches"
+        )
+        assert valid[sr, sc].all()
+        assert len(set(sr.tolist())) == len(sr) and len(set(sc.tolist())) == len(sc)
+        assert np.isclose(sparse_total, dense_total)
+        assert sparse_pairs == dense_pairs
+
+    print("\n✓ Sparse assignment tests completed\n")
+
+
+def test_track_moving_squares():
+    """Test that drifting squares keep a single ID each."""
+    print("="*60)
+    print("Testing IoU Tracking of Moving Squares")
+    print("="*60)
+
+    image = moving_squares()
+    out = np.zeros(image.shape, dtype=np.uint16)
+    track_cell_iou(image, out)
+    dense_out = np.zeros(image.shape, dtype=np.uint16)
+    track_cell_iou(image, dense_out, solver="dense")
+    assert np.array_equal(out, dense_out)
+
+    ids_per_frame = [set(np.unique(frame)) - {0} for frame in out]
+    print(f"   IDs in first frame: {sorted(ids_per_frame[0])}")
+    assert len(ids_per_frame[0]) == 16
+    for ids in ids_per_frame[1:]:
+        assert ids == ids_per_frame[0]
+    # Every tracked pixel lies on the foreground
+    assert np.array_equal(out > 0, image)
+
+    # Non-overlapping boxes are never candidates, so a zero threshold is rejected
+    try:
+        track_cell_iou(image, out, min_iou=0.0)
+    except ValueError as e:
+        assert "min_iou" in str(e)
+    else:
+        raise AssertionError("min_iou=0 accepted")
+
+    print("\n✓ Moving squares tracking test completed\n")
+
+
+def test_streaming_matches_batch():
+    """Test that streaming mode writes the same labels as the batch path."""
+    print("="*60)
+    print("Testing Streaming IoU Tracking")
+    print("="*60)
+
+    rng = np.random.default_rng(2)
+    image = random_blobs(rng)
+    batch_out = np.zeros(image.shape, dtype=np.uint16)
+    track_cell_iou(image, batch_out, min_size=20)
+    stream_out = np.zeros(image.shape, dtype=np.uint16)
+    track_cell_iou(image, stream_out, min_size=20, streaming=True)
+
+    print(f"   Cells in last frame: {len(np.unique(batch_out[-1])) - 1}")
+    assert batch_out.any()
+    assert np.array_equal(batch_out, stream_out)
+
+    print("\n✓ Streaming tracking test completed\n")
+
+
+def test_batch_cancellation():
+    """Test that a cancelled batch run leaves no raw labels in ``out``."""
+    print("="*60)
+    print("Testing Batch Tracking Cancellation")
+    print("="*60)
+
+    rng = np.random.default_rng(5)
+    image = random_blobs(rng)
+    for stage, frame in [("Labeling", 3), ("Tracking", 2), ("Writing", 1)]:
+        for iou_mode in ("bbox", "mask"):
+            cancel = threading.Event()
+
+            def _cancel_at(t, total, msg):
+                if msg == stage and t == frame:
+                    cancel.set()
+
+            out = np.zeros(image.shape, dtype=np.uint16)
+            track_cell_iou(
+                image,
+                out,
+                min_size=20,
+                iou_mode=iou_mode,
+                progress_callback=_cancel_at,
+                cancel_event=cancel,
+            )
+            assert cancel.is_set()
+            assert not out.any(), (stage, iou_mode)
+        print(f"   Cancelled while {stage.lower()}: output zeroed")
+
+    print("\n✓ Batch cancellation test completed\n")
+
+
+def test_checkpoint_resume():
+    """Test that a cancelled streaming run resumes to the full result."""
+    print("="*60)
+    print("Testing Checkpointed Tracking Resume")
+    print("="*60)
+
+    rng = np.random.default_rng(5)
+    image = random_blobs(rng, n_frames=12)
+    for iou_mode in ("bbox", "mask"):
+        expected = np.zeros(image.shape, dtype=np.uint16)
+        track_cell_iou(image, expected, min_size=20, iou_mode=iou_mode, streaming=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Path(tmp) / "tracking_ckpt.npz"
+            out = np.zeros(image.shape, dtype=np.uint16)
+            cancel = threading.Event()
+
+            def _cancel_after_7(t, total, msg):
+                if t == 6:
+                    cancel.set()
+
+            track_cell_iou(
+                image,
+                out,
+                min_size=20,
+                iou_mode=iou_mode,
+                streaming=True,
+                progress_callback=_cancel_after_7,
+                cancel_event=cancel,
+                checkpoint_path=checkpoint,
+                checkpoint_every=3,
+            )
+            assert checkpoint.exists()
+            assert not out[7:].any()
+
+            written = []
+            track_cell_iou(
+                image,
+                out,
+                min_size=20,
+                iou_mode=iou_mode,
+                streaming=True,
+                progress_callback=lambda t, total, msg: written.append(t),
+                checkpoint_path=checkpoint,
+                checkpoint_every=3,
+            )
+            print(f"   {iou_mode}: resumed at frame {written[0]}")
+            assert written[0] == 7
+            assert not checkpoint.exists()
+            assert np.array_equal(out, expected)
+
+    print("\n✓ Checkpoint resume test completed\n")
+
+
+def test_mask_iou_matches_pixel_reference():
+    """Test histogram mask IoU against per-pair pixel intersections."""
+    print("="*60)
+    print("Testing Mask IoU from Label-Pair Histograms")
+    print("="*60)
+
+    rng = np.random.default_rng(3)
+    image = random_blobs(rng, n_frames=2, n_blobs=60)
+    prev_labeled, prev_props = _label_frame(image[0], 20, None)
+    curr_labeled, curr_props = _label_frame(image[1], 20, None)
+    prev_labels, curr_labels = list(prev_props), list(curr_props)
+
+    rows, cols, iou = _mask_candidate_costs(
+        prev_labeled,
+        curr_labeled,
+        prev_labels,
+        curr_labels,
+        list(prev_props.values()),
+        list(curr_props.values()),
+        min_iou=0.0,
+    )
+    found = {
+        (prev_labels[r], curr_labels[c]): v
+        for r, c, v in zip(rows.tolist(), cols.tolist(), iou.tolist())
+    }
+
+    expected = {}
+    for p_lbl in prev_labels:
+        p_mask = prev_labeled == p_lbl
+        for c_lbl in curr_labels:
+            c_mask = curr_labeled == c_lbl
+            inter = np.logical_and(p_mask, c_mask).sum()
+            if inter:
+                expected[(p_lbl, c_lbl)] = inter / np.logical_or(p_mask, c_mask).sum()
+
+    print(f"   Overlapping label pairs: {len(expected)}")
+    assert found.keys() == expected.keys()
+    for key, value in expected.items():
+        assert np.isclose(found[key], value)
+
+    batch_out = np.zeros(image.shape, dtype=np.uint16)
+    track_cell_iou(image, batch_out, min_size=20, iou_mode="mask")
+    stream_out = np.zeros(image.shape, dtype=np.uint16)
+    track_cell_iou(image, stream_out, min_size=20, iou_mode="mask", streaming=True)
+    assert np.array_equal(batch_out, stream_out)
+
+    # Frames with more labels than the uint16 output holds are kept aside
+    dots = np.zeros((2, 520, 520), dtype=bool)
+    dots[:, ::2, ::2] = True
+    for iou_mode in ("bbox", "mask"):
+        batch_out = np.zeros(dots.shape, dtype=np.uint16)
+        track_cell_iou(dots, batch_out, iou_mode=iou_mode)
+        stream_out = np.zeros(dots.shape, dtype=np.uint16)
+        track_cell_iou(dots, stream_out, iou_mode=iou_mode, streaming=True)
+        assert np.array_equal(batch_out, stream_out)
+
+    print("\n✓ Mask IoU tests completed\n")
+
+
+def test_btrack_relabel_helpers():
+    """Test LUT size filtering and track relabeling used by the btrack path."""
+    print("="*60)
+    print("Testing btrack Relabel Helpers")
+    print("="*60)
+
+    rng = np.random.default_rng(4)
+    image = random_blobs(rng, n_frames=3, n_blobs=30)
+    labeled = np.stack([label(frame, connectivity=1) for frame in image])
+
+    # Size filter against the per-region mask loop
+    filtered = _filter_labels_by_size(labeled[0], 30, 100)
+    expected = np.zeros_like(labeled[0])
+    next_label = 1
+    for prop in regionprops(labeled[0]):
+        if 30 <= prop.area <= 100:
+            expected[labeled[0] == prop.label] = next_label
+            next_label += 1
+    assert np.array_equal(filtered, expected)
+
+    # One fake track per frame-0 region, following the same label, with a
+    # dummy observation in the middle frame
+    tracks = []
+    for lbl in range(1, int(labeled.max()) + 1):
+        if not all((labeled[t] == lbl).any() for t in range(3)):
+            continue
+        points = [np.argwhere(labeled[t] == lbl)[0] + 0.5 for t in range(3)]
+        tracks.append(
+            SimpleNamespace(
+                ID=100 + lbl,
+                t=[0, 1, 2],
+                y=[p[0] for p in points],
+                x=[p[1] for p in points],
+                dummy=[False, True, False],
+            )
+        )
+    out = np.zeros(labeled.shape, dtype=np.uint16)
+    _write_tracks(labeled, tracks, out)
+
+    print(f"   Tracks written: {len(tracks)}")
+    assert not out[1].any()
+    for track in tracks:
+        lbl = track.ID - 100
+        for t in (0, 2):
+            assert np.array_equal(out[t] == track.ID, labeled[t] == lbl)
+
+    print("\n✓ btrack relabel helper tests completed\n")
+
+
+if __name__ == "__main__":
+    test_cost_matrix_matches_bruteforce()
+    test_sparse_matches_dense_assignment()
+    test_track_moving_squares()
+    test_streaming_matches_batch()
+    test_batch_cancellation()
+    test_checkpoint_resume()
+    test_mask_iou_matches_pixel_reference()
+    test_btrack_relabel_helpers()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for automatic worker and batch sizing of the PyAMA workflow.
+
+This script tests:
+- Per-step memory estimates scale with the stack size and channel selection
+- The worker count is limited by memory, CPUs or the number of FOVs
+- Process workers account for their interpreter overhead
+- Available memory and CPUs are measured on this machine
+
+Usage:
+    python test_tuning.py
+"""
+
+from types import SimpleNamespace
+
+from pyama_core.processing.workflow.tuning import (
+    PROCESS_WORKER_OVERHEAD,
+    available_cpu_count,
+    available_memory_bytes,
+    estimate_step_memory,
+    plan_resources,
+)
+from pyama_core.types.processing import ChannelSelection, Channels
+
+GIB = 1024**3
+
+
+def make_metadata(n_frames=200, height=2048, width=2048, n_fovs=20):
+    """Minimal metadata with the fields the planner reads."""
+    return SimpleNamespace(
+        n_frames=n_frames,
+        height=height,
+        width=width,
+        n_fovs=n_fovs,
+        dtype="uint16",
+    )
+
+
+def make_channels(n_fl=1):
+    return Channels(
+        pc=ChannelSelection(0, ["area"]),
+        fl=[ChannelSelection(i + 1, ["intensity_total"]) for i in range(n_fl)],
+    )
+
+
+def test_step_estimates():
+    """Whole-stack steps dominate and scale with the frame count."""
+    print("\n" + "=" * 60)
+    print("Testing per-step memory estimates")
+    print("=" * 60)
+
+    small = estimate_step_memory(make_metadata(n_frames=100), make_channels())
+    large = estimate_step_memory(make_metadata(n_frames=200), make_channels())
+    assert list(small) == [
+        "copy",
+        "segmentation",
+        "background",
+        "tracking",
+        "extraction",
+    ]
+    assert large["segmentation"] > 1.9 * small["segmentation"]
+    assert large["tracking"] == small["tracking"]
+    assert max(large, key=large.get) in ("segmentation", "background")
+
+    no_fl = estimate_step_memory(make_metadata(), make_channels(n_fl=0))
+    assert "background" not in no_fl
+    threaded = estimate_step_memory(
+        make_metadata(), make_channels(), {"extraction_threads": 4}
+    )
+    assert threaded["extraction"] == 4 * large["extraction"]
+    for step, size in large.items():
+        print(f"   {step}: {size / 1024**2:.0f} MiB")
+    print("\n✓ Step estimate test completed\n")
+
+
+def test_plan_limits():
+    """The tightest of memory, CPU and FOV limits wins."""
+    print("\n" + "=" * 60)
+    print("Testing resource plans")
+    print("=" * 60)
+
+    metadata = make_metadata()
+    channels = make_channels()
+    per_worker = max(estimate_step_memory(metadata, channels).values())
+
+    plan = plan_resources(
+        metadata, channels, 20, available_bytes=8 * GIB, cpu_count=32
+    )
+    assert plan.limited_by == "memory"
+    assert plan.n_workers == int(8 * GIB * 0.75) // per_worker
+    assert plan.batch_size == plan.n_workers + 1
+    print(f"   Small memory: {plan.describe()}")
+
+    plan = plan_resources(
+        metadata, channels, 20, available_bytes=512 * GIB, cpu_count=8
+    )
+    assert plan.limited_by == "cpu" and plan.n_workers == 8
+    print(f"   Large memory: {plan.describe()}")
+
+    plan = plan_resources(
+        metadata, channels, 1, available_bytes=512 * GIB, cpu_count=8
+    )
+    assert plan.n_workers == 2 and plan.batch_size == 1
+    print(f"   Single FOV: {plan.describe()}")
+
+    plan = plan_resources(metadata, channels, 20, available_bytes=GIB, cpu_count=8)
+    assert plan.n_workers == 1
+    print(f"   Tiny memory: {plan.describe()}")
+    print("\n✓ Resource plan test completed\n")
+
+
+def test_process_overhead():
+    """Process workers need room for their own interpreter."""
+    print("\n" + "=" * 60)
+    print("Testing process worker overhead")
+    print("=" * 60)
+
+    metadata = make_metadata(n_frames=20, height=512, width=512)
+    channels = make_channels()
+    threads = plan_resources(
+        metadata, channels, 50, available_bytes=4 * GIB, cpu_count=64
+    )
+    processes = plan_resources(
+        metadata,
+        channels,
+        50,
+        worker_mode="process",
+        available_bytes=4 * GIB,
+        cpu_count=64,
+    )
+    assert processes.worker_bytes == threads.worker_bytes + PROCESS_WORKER_OVERHEAD
+    assert processes.n_workers < threads.n_workers
+    print(f"   Threads: {threads.n_workers}, processes: {processes.n_workers}")
+    print("\n✓ Process overhead test completed\n")
+
+
+def test_measured_resources():
+    """This machine reports its CPUs and (on Linux) available memory."""
+    print("\n" + "=" * 60)
+    print("Testing resource measurement")
+    print("=" * 60)
+
+    cpus = available_cpu_count()
+    memory = available_memory_bytes()
+    assert cpus >= 1
+    assert memory is None or memory > 0
+    plan = plan_resources(make_metadata(), make_channels(), 4)
+    assert plan.n_workers >= 1
+    print(f"   {plan.describe()}")
+    print("\n✓ Resource measurement test completed\n")
+
+
+if __name__ == "__main__":
+    test_step_estimates()
+    test_plan_limits()
+    test_process_overhead()
+    test_measured_resources()
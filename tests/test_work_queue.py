@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Test script for the PyAMA shared-filesystem work queue.
+
+This script tests:
+- Concurrent worker processes claim every FOV exactly once
+- Abandoned claims are requeued after their lease; live claims are kept
+- Several worker processes process a queue and finalize merges their results
+- Workers leave the partial outputs of FOVs claimed by others alone
+- Fresh claims of long-pending FOVs are not mistaken for abandoned ones
+- Cancelled FOVs return to pending instead of being marked done
+
+Usage:
+    python test_work_queue.py
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import yaml
+
+from pyama_core.processing.workflow import run
+from pyama_core.processing.workflow.services.base import BaseProcessingService
+from pyama_core.processing.workflow.work_queue import (
+    QUEUE_DIRNAME,
+    WorkQueue,
+    create_work_queue,
+    finalize_work_queue,
+    run_queue_worker,
+)
+from pyama_core.types.processing import (
+    ChannelSelection,
+    Channels,
+    ProcessingContext,
+    ensure_results_entry,
+)
+
+N_FOVS = 12
+
+
+def make_metadata():
+    return SimpleNamespace(
+        base_name="test",
+        n_fovs=N_FOVS,
+        n_frames=1,
+        height=8,
+        width=8,
+        dtype="uint16",
+    )
+
+
+class RecordingService(BaseProcessingService):
+    """Stand-in step that leaves a marker per run (and traces at the end)."""
+
+    def __init__(self, step):
+        super().__init__()
+        self.name = step
+
+    def process_fov(self, metadata, context, output_dir, fov, cancel_event=None):
+        if fov in context.params.get("fail_fovs", []) and self.name == "tracking":
+            raise RuntimeError(f"FOV {fov} broken")
+        time.sleep(0.02)
+        fov_dir = output_dir / f"fov_{fov:03d}"
+        fov_dir.mkdir(parents=True, exist_ok=True)
+        (fov_dir / f"{self.name}.{os.getpid()}").touch()
+        if self.name == "extraction":
+            traces = fov_dir / f"test_fov_{fov:03d}_traces.csv"
+            traces.write_text("fov,cell,frame\n")
+            context.results.setdefault(fov, ensure_results_entry()).traces = traces
+
+
+class CancellingService(RecordingService):
+    """Stand-in step; extraction of FOV 2 is cancelled and returns early."""
+
+    def process_fov(self, metadata, context, output_dir, fov, cancel_event=None):
+        if self.name == "extraction" and fov == 2:
+            cancel_event.set()
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        super().process_fov(metadata, context, output_dir, fov, cancel_event)
+
+
+def claim_all(work_dir, worker_id):
+    """Process-pool task: claim FOVs until the queue is empty."""
+    queue = WorkQueue(Path(work_dir))
+    claimed = []
+    while (fov := queue.claim(worker_id)) is not None:
+        claimed.append(fov)
+    return claimed
+
+
+def queue_worker(output_dir, worker_id, lease_seconds=600.0):
+    """Process-pool task: run a queue worker with stand-in steps."""
+    run._STEP_SERVICES.update(
+        {step: partial(RecordingService, step) for step in run._STEP_SERVICES}
+    )
+    context = ProcessingContext(
+        output_dir=Path(output_dir),
+        channels=Channels(pc=ChannelSelection(0, ["area"])),
+        params={"fail_fovs": [5]},
+    )
+    return run_queue_worker(
+        make_metadata(),
+        context,
+        worker_id=worker_id,
+        n_workers=2,
+        batch_size=2,
+        lease_seconds=lease_seconds,
+    )
+
+
+def test_exclusive_claims():
+    """Racing processes never claim the same FOV twice."""
+    print("\n" + "=" * 60)
+    print("Testing exclusive claims")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = WorkQueue(Path(tmp) / QUEUE_DIRNAME)
+        assert queue.create(list(range(60)), "test") == list(range(60))
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=4, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(claim_all, str(queue.work_dir), f"w{i}")
+                for i in range(4)
+            ]
+            claims = [future.result() for future in futures]
+
+        everything = [fov for claimed in claims for fov in claimed]
+        assert sorted(everything) == list(range(60))
+        status = queue.status()
+        assert status.claimed == list(range(60)) and not status.pending
+        owners = {
+            (queue.work_dir / "claimed" / f"fov_{fov:03d}").read_text()
+            for fov in everything
+        }
+        assert owners <= {f"w{i}" for i in range(4)}
+        print(f"   Claims per worker: {[len(claimed) for claimed in claims]}")
+    print("\n✓ Exclusive claim test completed\n")
+
+
+def test_leases():
+    """Stale claims return to pending; heartbeats and re-creation keep state."""
+    print("\n" + "=" * 60)
+    print("Testing claim leases")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = WorkQueue(Path(tmp))
+        queue.create([0, 1, 2], "test")
+        assert queue.claim("a") == 0 and queue.claim("b") == 1
+
+        old = time.time() - 120
+        for fov in (0, 1):
+            os.utime(queue.work_dir / "claimed" / f"fov_{fov:03d}", (old, old))
+        queue.heartbeat([1])
+        assert queue.requeue_stale(60) == [0]
+        assert queue.status().pending == [0, 2]
+        assert queue.status().claimed == [1]
+
+        # Claiming the requeued FOV (still dated 2 min ago) starts a new lease
+        assert queue.claim("c") == 0
+        assert queue.requeue_stale(60) == []
+        assert queue.status().claimed == [0, 1]
+        queue.release(0)
+
+        queue.fail(1, "b")
+        queue.release(5)  # Not claimed: nothing to do
+        assert queue.create([0, 1, 2, 3], "test") == [3]
+        assert queue.status().failed == [1]
+        assert queue.retry_failed() == [1]
+        assert queue.status().pending == [0, 1, 2, 3]
+        print(f"   {queue.status()}")
+    print("\n✓ Lease test completed\n")
+
+
+def test_workers_and_finalize():
+    """Worker processes drain the queue; finalize writes the merged results."""
+    print("\n" + "=" * 60)
+    print("Testing queue workers and finalize")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        queue = create_work_queue(make_metadata(), output_dir)
+        assert queue.status().pending == list(range(N_FOVS))
+
+        # FOV 11 is being processed by a worker on another node
+        busy = queue.work_dir / "claimed" / "fov_011"
+        os.rename(queue.work_dir / "pending" / "fov_011", busy)
+        partial_output = output_dir / "fov_011" / "test_fov_011_seg.partial.npy"
+        partial_output.parent.mkdir()
+        partial_output.write_bytes(b"in progress")
+
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=3, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(queue_worker, str(output_dir), f"worker-{i}")
+                for i in range(3)
+            ]
+            outcomes = [future.result() for future in futures]
+
+        status = queue.status()
+        assert status.done == [fov for fov in range(N_FOVS) if fov not in (5, 11)]
+        assert status.failed == [5] and status.claimed == [11]
+        assert outcomes.count(False) == 1
+        assert partial_output.exists()
+        # Every step of every finished FOV ran exactly once
+        for fov in status.done:
+            markers = [p.name for p in (output_dir / f"fov_{fov:03d}").iterdir()]
+            steps = [name.split(".")[0] for name in markers if "." in name]
+            assert sorted(s for s in steps if s in run._STEP_SERVICES) == sorted(
+                run._STEP_SERVICES
+            )
+        metrics = list((queue.work_dir / "workers").glob("*/run_metrics.json"))
+        assert len(metrics) == 3
+
+        status = finalize_work_queue(output_dir)
+        assert not status.finished
+        with (output_dir / "processing_results.yaml").open() as f:
+            results = yaml.safe_load(f)
+        assert sorted(int(fov) for fov in results["results"]) == status.done
+        assert results["channels"]["pc"] == [0, ["area"]]
+        print(f"   After first pass: {status}")
+
+        # The other node died: its claim expires and a new worker takes over
+        old = time.time() - 120
+        os.utime(busy, (old, old))
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            assert executor.submit(queue_worker, str(output_dir), "late", 60).result()
+        assert not partial_output.exists()
+        status = finalize_work_queue(output_dir)
+        assert status.finished and 11 in status.done
+        with (output_dir / "processing_results.yaml").open() as f:
+            results = yaml.safe_load(f)
+        assert len(results["results"]) == N_FOVS - 1
+        print(f"   After takeover: {status}")
+    print("\n✓ Worker and finalize test completed\n")
+
+
+def test_cancellation_requeues():
+    """FOVs interrupted by cancellation go back to pending, not to done."""
+    print("\n" + "=" * 60)
+    print("Testing cancellation of a queue worker")
+    print("=" * 60)
+
+    original = dict(run._STEP_SERVICES)
+    run._STEP_SERVICES.update(
+        {step: partial(CancellingService, step) for step in run._STEP_SERVICES}
+    )
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            queue = create_work_queue(make_metadata(), output_dir)
+            context = ProcessingContext(
+                output_dir=output_dir,
+                channels=Channels(pc=ChannelSelection(0, ["area"])),
+            )
+            assert not run_queue_worker(
+                make_metadata(),
+                context,
+                worker_id="w",
+                n_workers=1,
+                batch_size=1,
+                cancel_event=threading.Event(),
+            )
+            status = queue.status()
+            print(f"   {status}")
+            assert status.done == [0, 1]
+            assert not status.failed and not status.claimed
+            assert status.pending == list(range(2, N_FOVS))
+            assert not queue.fragment_path(2).exists()
+    finally:
+        run._STEP_SERVICES.clear()
+        run._STEP_SERVICES.update(original)
+    print("\n✓ Cancellation test completed\n")
+
+
+if __name__ == "__main__":
+    test_exclusive_claims()
+    test_leases()
+    test_workers_and_finalize()
+    test_cancellation_requeues()